@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+백그라운드 asyncio 런타임 모듈
+
+동기 코드(APScheduler 작업 등)에서 장기 실행 이벤트 루프에 코루틴을 던져
+실행할 수 있도록, 별도 스레드에서 계속 도는 이벤트 루프를 제공
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Coroutine, Optional
+from loguru import logger
+
+
+class BackgroundLoop:
+    """별도 데몬 스레드에서 계속 실행되는 이벤트 루프"""
+
+    def __init__(self, name: str = "background-loop"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """루프 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self.running:
+                return
+
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+        self._ready.wait()
+        logger.debug(f"백그라운드 이벤트 루프 시작: {self.name}")
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """코루틴을 루프에 등록하고 Future 반환 (블로킹하지 않음)"""
+        if not self.running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """코루틴을 루프에서 실행하고 결과를 기다림"""
+        return self.submit(coro).result(timeout=timeout)
+
+    def stop(self, timeout: float = 5):
+        """루프 중지 및 스레드 종료 대기"""
+        with self._lock:
+            if not self.running:
+                return
+
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+        logger.debug(f"백그라운드 이벤트 루프 종료: {self.name}")
@@ -0,0 +1,725 @@
+# -*- coding: utf-8 -*-
+"""
+성능 측정(벤치마크) 모듈
+
+실제 사이트에 접속하지 않고 캡처한 페이지 또는 합성 데이터로
+핫 패스의 CPU 시간과 최대 메모리 할당량을 측정한다.
+
+사용법:
+    python -m checker.bench extract [캡처한_페이지.html ...]
+    python -m checker.bench models [--dates 30 --themes 4 --slots 12]
+    python -m checker.bench classify [--themes 40 --slots 48]
+    python -m checker.bench suite [--dates 30 --themes 4 --slots 12 --scale 1 4 16]
+    python -m checker.bench telegram [--sends 50]
+"""
+
+import sys
+import json
+import asyncio
+import html
+import time
+import argparse
+import itertools
+import tempfile
+import tracemalloc
+import datetime as dt
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from .aio import BackgroundLoop
+from .extract import extract_hidden_data, extract_csrf_token
+from .config import THEME_NAME
+from .models import Slot, SlotStatus, slot_epoch, to_theme_map
+from .notifier import TelegramNotifier
+from .fetch import SlotExtractor, _filter_past_slots, merge_date_slots
+from .serialization import (
+    ORJSON_AVAILABLE, BinarySerializer, JsonSerializer, OrjsonSerializer, decode_state
+)
+from .state import StateManager, pd_timestamp_now
+from .state_sqlite import SqliteStateManager
+from .state_journal import JournalStateManager
+
+
+def measure(func: Callable[[], object], iterations: int) -> Tuple[float, float]:
+    """
+    함수 실행 비용 측정
+
+    Returns:
+        (호출당 CPU 시간 ms, 1회 호출의 최대 메모리 할당 KiB)
+    """
+    # 메모리는 tracemalloc 오버헤드가 시간 측정에 섞이지 않도록 따로 1회 측정
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.process_time()
+    for _ in range(iterations):
+        func()
+    elapsed = time.process_time() - started
+
+    return elapsed / iterations * 1000, peak / 1024
+
+
+def print_table(title: str, rows: List[Dict[str, object]]):
+    """결과를 고정폭 표로 출력"""
+    if not rows:
+        return
+
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(_fmt(r[c])) for r in rows)) for c in columns}
+
+    print(f"\n## {title}")
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row[c]).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+# --- 페이지 추출 벤치마크 ---
+
+def synthetic_reservation_page(themes: int = 12, slots: int = 10, filler_rows: int = 400,
+                               hidden: Optional[Dict] = None) -> bytes:
+    """실제 예약 페이지와 비슷한 크기/구조의 합성 HTML (hidden을 주면 그 값을 숨겨진 데이터로 사용)"""
+    if hidden is None:
+        base_ts = 1754000000
+        hidden = {
+            'other': {
+                str(pk): {str(base_ts + i * 3600): 1 for i in range(0, slots, 2)}
+                for pk in range(1, themes + 1)
+            }
+        }
+
+    rows = "\n".join(
+        f'<li class="theme-item" data-idx="{i}"><span class="title">테마 {i}</span>'
+        f'<a href="/reservation?theme={i}">예약하기</a></li>'
+        for i in range(filler_rows)
+    )
+    page = (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        '<meta name="csrf-token" content="Xq3bN0sYtJv8WkzP1dQ7aR2mLfE9hUcTgVy4oKi6">'
+        '<title>제로월드 홍대점 예약</title>'
+        '<script>window.App = {"locale": "ko"};</script></head><body>'
+        f'<div class="container"><ul class="theme-list">{rows}</ul>'
+        '<div id="reservationHiddenData" style="display:none">'
+        f'{html.escape(json.dumps(hidden))}'
+        '</div></div>'
+        '<script src="/js/reservation.js"></script></body></html>'
+    )
+    return page.encode('utf-8')
+
+
+def _legacy_extract(content: bytes) -> Tuple[Dict, str]:
+    """기존 방식: 응답 디코딩 후 html.parser로 전체 DOM을 두 번 생성"""
+    text = content.decode('utf-8')
+
+    soup = BeautifulSoup(text, 'html.parser')
+    hidden_div = soup.find('div', id='reservationHiddenData')
+    hidden_data = json.loads(hidden_div.get_text().strip()) if hidden_div else {}
+
+    soup = BeautifulSoup(text, 'html.parser')
+    csrf_meta = soup.find('meta', {'name': 'csrf-token'})
+    token = csrf_meta.get('content') if csrf_meta else None
+
+    return hidden_data, token
+
+
+def _fast_extract(content: bytes) -> Tuple[Dict, str]:
+    """checker.extract 빠른 경로"""
+    return extract_hidden_data(content), extract_csrf_token(content)
+
+
+def bench_extract(pages: List[str], iterations: int):
+    """reservationHiddenData/csrf-token 추출 비용 비교"""
+    if pages:
+        samples = [(Path(p).name, Path(p).read_bytes()) for p in pages]
+    else:
+        samples = [("synthetic", synthetic_reservation_page())]
+
+    rows = []
+    for name, content in samples:
+        legacy = _legacy_extract(content)
+        fast = _fast_extract(content)
+        if legacy != fast:
+            print(f"⚠️ {name}: 기존 방식과 추출 결과가 다릅니다")
+
+        legacy_ms, legacy_kib = measure(lambda: _legacy_extract(content), iterations)
+        fast_ms, fast_kib = measure(lambda: _fast_extract(content), iterations)
+
+        rows.append({
+            'page': name,
+            'bytes': len(content),
+            'bs4 ms': legacy_ms,
+            'fast ms': fast_ms,
+            'speedup': legacy_ms / fast_ms if fast_ms else float('inf'),
+            'bs4 peak KiB': legacy_kib,
+            'fast peak KiB': fast_kib
+        })
+
+    print_table(f"페이지 추출 (호출당, {iterations}회 평균)", rows)
+
+
+# --- 슬롯 표현 벤치마크 ---
+
+def synthetic_raw_slots(dates: int, themes: int, slots: int) -> List[Tuple[str, str, int, bool]]:
+    """API에서 읽어 낸 (날짜, 시각, 테마 번호, 예약 가능) 형태의 합성 슬롯"""
+    today = dt.date.today()
+    raw = []
+    for d in range(dates):
+        date_str = (today + dt.timedelta(days=d)).strftime("%Y-%m-%d")
+        for theme_id in range(themes):
+            for i in range(slots):
+                minutes = 10 * 60 + i * 75
+                time_str = f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+                raw.append((date_str, time_str, theme_id, (d + theme_id + i) % 7 == 0))
+    return raw
+
+
+def _string_cycle(raw, theme_names: List[str], formatter: TelegramNotifier, now: dt.datetime):
+    """기존 방식: 문자열 키/상태 딕셔너리, 과거 슬롯 필터와 알림 포맷에서 매번 strptime"""
+    theme_slots = {theme_name: {} for theme_name in theme_names}
+    for date_str, time_str, theme_id, available in raw:
+        theme_slots[theme_names[theme_id]][f"{date_str} {time_str}"] = "예약가능" if available else "매진"
+
+    filtered = {
+        theme_name: {
+            key: status for key, status in slots.items()
+            if dt.datetime.strptime(key, "%Y-%m-%d %H:%M:%S") > now
+        }
+        for theme_name, slots in theme_slots.items()
+    }
+
+    for theme_name, slots in filtered.items():
+        available_slots = [key for key, status in slots.items() if status == "예약가능"]
+        formatter._format_slots_message(available_slots, theme_name)
+
+    return filtered
+
+
+def _slot_cycle(raw, theme_names: List[str], formatter: TelegramNotifier, now: dt.datetime,
+                to_state: bool = True):
+    """Slot 방식: epoch 정수/상태 코드로 처리하고 문자열은 상태 파일 변환 시 한 번만 생성"""
+    now_epoch = now.timestamp()
+    slots = []
+    for date_str, time_str, theme_id, available in raw:
+        epoch = slot_epoch(date_str, time_str)
+        if epoch > now_epoch:
+            slots.append(Slot(epoch, theme_id, SlotStatus.AVAILABLE if available else SlotStatus.RESERVED))
+
+    slots_by_theme = [[] for _ in theme_names]
+    for slot in slots:
+        slots_by_theme[slot.theme_id].append(slot)
+
+    for theme_name, theme_slots in zip(theme_names, slots_by_theme):
+        formatter._format_slots_message([slot for slot in theme_slots if slot.available], theme_name)
+
+    return to_theme_map(slots, theme_names) if to_state else slots
+
+
+def bench_models(dates: int, themes: int, slots: int, iterations: int):
+    """한 체크 사이클의 슬롯 처리 비용 비교 (문자열 딕셔너리 vs Slot)"""
+    raw = synthetic_raw_slots(dates, themes, slots)
+    theme_names = [f"테마{i}" for i in range(themes)]
+    now = dt.datetime.now()
+    # 봇 초기화 없이 메시지 포맷 함수만 사용
+    formatter = TelegramNotifier.__new__(TelegramNotifier)
+
+    if _string_cycle(raw, theme_names, formatter, now) != _slot_cycle(raw, theme_names, formatter, now):
+        print("⚠️ 두 방식의 상태 파일 결과가 다릅니다")
+
+    cases = [
+        ('Dict[str, str]', lambda: _string_cycle(raw, theme_names, formatter, now)),
+        ('Slot', lambda: _slot_cycle(raw, theme_names, formatter, now, to_state=False)),
+        ('Slot + state map', lambda: _slot_cycle(raw, theme_names, formatter, now)),
+    ]
+
+    rows = []
+    for name, func in cases:
+        cpu_ms, peak_kib = measure(func, iterations)
+        rows.append({'pipeline': name, 'ms/cycle': cpu_ms, 'peak KiB': peak_kib})
+    for row in rows:
+        row['cpu vs dict'] = rows[0]['ms/cycle'] / row['ms/cycle'] if row['ms/cycle'] else float('inf')
+        row['mem vs dict'] = rows[0]['peak KiB'] / row['peak KiB'] if row['peak KiB'] else float('inf')
+
+    print_table(f"사이클당 슬롯 처리 ({dates}일 x {themes}테마 x {slots}슬롯 = {len(raw)}개, {iterations}회 평균)", rows)
+
+
+# --- 예약 가능 판정 벤치마크 ---
+
+def _slot_times(slots: int) -> List[str]:
+    """09:00부터 15분 간격의 시각 목록 (하루에 다 들어가지 않으면 간격을 줄임)"""
+    step = min(15, (24 * 60) // max(slots, 1))
+    start = min(9 * 60, 24 * 60 - slots * step)
+    return [f"{(start + i * step) // 60:02d}:{(start + i * step) % 60:02d}:00" for i in range(slots)]
+
+
+def synthetic_day(date_str: str, theme_titles: List[str], slots: int) -> Tuple[Dict, Dict]:
+    """하루치 API 응답과 숨겨진 데이터 (5번째마다 API 매진, 3번째마다 숨겨진 데이터 예약)"""
+    data, times, other = [], {}, {}
+    time_strs = _slot_times(slots)
+
+    for pk, title in enumerate(theme_titles, 1):
+        data.append({'PK': pk, 'title': title})
+        theme_times, reserved = [], {}
+        for i, time_str in enumerate(time_strs):
+            theme_times.append({'time': time_str, 'reservation': (i + pk) % 5 == 0})
+            if (i + pk) % 3 == 0:
+                epoch = int(dt.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S").timestamp())
+                reserved[str(epoch)] = 1
+        times[str(pk)] = theme_times
+        other[str(pk)] = reserved
+
+    return {'data': data, 'times': times}, {'other': other}
+
+
+def synthetic_large_day(themes: int, slots: int) -> Tuple[Dict, Dict, str]:
+    """테마/슬롯이 많은 하루치 API 응답과 숨겨진 데이터 (내일 날짜)"""
+    date_str = (dt.date.today() + dt.timedelta(days=1)).strftime("%Y-%m-%d")
+    api_data, hidden_data = synthetic_day(date_str, [f"테마{pk}" for pk in range(1, themes + 1)], slots)
+    return api_data, hidden_data, date_str
+
+
+def _per_slot_classify(extractor: SlotExtractor, api_data: Dict, hidden_data: Dict, date_str: str,
+                       theme_names: List[str]) -> List[Slot]:
+    """기존 방식: 슬롯마다 _is_really_available (strptime 2회, datetime.now(), 디버그 로그)"""
+    theme_pks = extractor._match_watched_themes(api_data, theme_names)
+    date_slots = []
+    for theme_id, theme_name in enumerate(theme_names):
+        theme_pk = theme_pks[theme_name]
+        for i, time_slot in enumerate(api_data['times'].get(str(theme_pk), [])):
+            time_str = time_slot.get('time', '')
+            is_available = extractor._is_really_available(
+                theme_pk, time_str, date_str, hidden_data, time_slot.get('reservation', False)
+            )
+            status = SlotStatus.AVAILABLE if is_available else SlotStatus.RESERVED
+            date_slots.append(Slot(slot_epoch(date_str, time_str), theme_id, status))
+            logger.debug(f"  슬롯 {i+1}: {time_str} = {status.label}")
+    return date_slots
+
+
+def bench_classify(themes: int, slots: int, iterations: int):
+    """하루치 슬롯 예약 가능 판정 비용 비교 (슬롯 단위 vs 날짜 단위 일괄)"""
+    api_data, hidden_data, date_str = synthetic_large_day(themes, slots)
+    theme_names = [theme['title'] for theme in api_data['data']]
+    extractor = SlotExtractor()
+
+    per_slot = _per_slot_classify(extractor, api_data, hidden_data, date_str, theme_names)
+    batched = extractor.extract_date_slots(api_data, hidden_data, date_str, theme_names)
+    if per_slot != batched:
+        print("⚠️ 슬롯 단위 판정과 일괄 판정 결과가 다릅니다")
+
+    rows = []
+    for name, func in [
+        ('per-slot', lambda: _per_slot_classify(extractor, api_data, hidden_data, date_str, theme_names)),
+        ('batched', lambda: extractor.extract_date_slots(api_data, hidden_data, date_str, theme_names)),
+    ]:
+        cpu_ms, peak_kib = measure(func, iterations)
+        rows.append({'classify': name, 'ms/day': cpu_ms, 'peak KiB': peak_kib})
+    rows[1]['speedup'] = rows[0]['ms/day'] / rows[1]['ms/day'] if rows[1]['ms/day'] else float('inf')
+    rows[0]['speedup'] = 1.0
+
+    print_table(f"하루치 예약 가능 판정 ({themes}테마 x {slots}슬롯 = {len(batched)}개, {iterations}회 평균)", rows)
+
+
+# --- 핫 패스 단계별 벤치마크 ---
+
+def synthetic_cycle(dates: int, themes: int, slots: int) -> List[Tuple[str, bytes, Dict]]:
+    """
+    한 체크 사이클에 해당하는 날짜별 (날짜, 예약 페이지, API 응답) 합성 데이터
+
+    첫 번째 테마 이름은 THEME_NAME이라 단일 테마용 extract_slots_from_data도 측정 가능
+    """
+    theme_titles = [THEME_NAME] + [f"테마{i}" for i in range(1, themes)]
+    today = dt.date.today()
+    cycle = []
+    for d in range(dates):
+        date_str = (today + dt.timedelta(days=d)).strftime("%Y-%m-%d")
+        api_data, hidden_data = synthetic_day(date_str, theme_titles, slots)
+        page = synthetic_reservation_page(themes, slots, hidden=hidden_data)
+        cycle.append((date_str, page, api_data))
+    return cycle
+
+
+def bench_suite(dates: int, themes: int, slots: int, iterations: int, scales: List[int]):
+    """
+    수집 → 추출 → 상태 비교/저장 → 알림 포맷 단계별 비용 측정
+
+    scales의 배수만큼 날짜 수를 늘려 가며 단계별 시간/최대 메모리를 출력
+    """
+    extractor = SlotExtractor()
+    # 봇 초기화 없이 메시지 포맷 함수만 사용
+    formatter = TelegramNotifier.__new__(TelegramNotifier)
+
+    for scale in scales:
+        cycle = synthetic_cycle(dates * scale, themes, slots)
+        theme_names = [THEME_NAME] + [f"테마{i}" for i in range(1, themes)]
+        pages = [(date_str, page) for date_str, page, _ in cycle]
+        hidden = {date_str: extractor._extract_hidden_data(page) for date_str, page in pages}
+        date_slots = {
+            date_str: extractor.extract_date_slots(api_data, hidden[date_str], date_str, theme_names)
+            for date_str, _, api_data in cycle
+        }
+        # 과거 필터는 미리 추출해 둔 날짜별 결과에 적용 (오늘 날짜의 지난 슬롯이 제외됨)
+        now_epoch = time.time()
+        current = to_theme_map(merge_date_slots(date_slots), theme_names)
+        # 이전 상태: 예약가능/매진을 일부 뒤집어 새로 열린 슬롯이 생기도록 함
+        previous = {
+            theme_name: {
+                key: ("매진" if status == "예약가능" else "예약가능") if i % 4 == 0 else status
+                for i, (key, status) in enumerate(theme_slots.items())
+            }
+            for theme_name, theme_slots in current.items()
+        }
+        available = {
+            theme_name: [key for key, status in theme_slots.items() if status == "예약가능"]
+            for theme_name, theme_slots in current.items()
+        }
+        total = sum(len(theme_slots) for theme_slots in current.values())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = StateManager(Path(temp_dir) / 'state.json')
+            state = {'themes': previous, 'last_updated': pd_timestamp_now()}
+            manager.save(state)
+            # SQLite 저장소: 매번 이전/현재 상태를 번갈아 저장해 슬롯 1/4이 바뀐 증분 기록을 측정
+            sqlite_manager = SqliteStateManager(Path(temp_dir) / 'state.db', json_file=None)
+            sqlite_manager.save(state)
+            sqlite_states = itertools.cycle([{'themes': current, 'last_updated': pd_timestamp_now()}, state])
+            # 저널 저장소: 같은 방식으로 바뀐 슬롯만 덧붙이는 비용 (압축은 측정 중에 일어나지 않게 기준을 크게)
+            journal_manager = JournalStateManager(Path(temp_dir) / 'journal.json', max_journal_bytes=1 << 30)
+            journal_manager.save(state)
+            journal_states = itertools.cycle([{'themes': current, 'last_updated': pd_timestamp_now()}, state])
+
+            stages = [
+                ('_extract_hidden_data', lambda: [extractor._extract_hidden_data(page) for _, page in pages]),
+                ('extract_date_slots', lambda: [
+                    extractor.extract_date_slots(api_data, hidden[date_str], date_str, theme_names)
+                    for date_str, _, api_data in cycle
+                ]),
+                ('extract_slots_from_data', lambda: [
+                    extractor.extract_slots_from_data(api_data, hidden[date_str], date_str)
+                    for date_str, _, api_data in cycle
+                ]),
+                ('past filter', lambda: [
+                    _filter_past_slots(date_str, slots_, now_epoch) for date_str, slots_ in date_slots.items()
+                ]),
+                ('state save+flush', lambda: (manager.save(state), manager.flush())),
+                ('state load', manager.load),
+                ('sqlite save+flush', lambda: (sqlite_manager.save(next(sqlite_states)), sqlite_manager.flush())),
+                ('journal save+flush', lambda: (journal_manager.save(next(journal_states)), journal_manager.flush())),
+                ('find_new_available_slots', lambda: [
+                    manager.find_new_available_slots(current[theme_name], theme_name) for theme_name in theme_names
+                ]),
+                ('state get_stats', manager.get_stats),
+                ('_format_slots_message', lambda: [
+                    formatter._format_slots_message(available[theme_name], theme_name) for theme_name in theme_names
+                ]),
+            ]
+
+            rows = []
+            for name, func in stages:
+                cpu_ms, peak_kib = measure(func, iterations)
+                rows.append({
+                    'stage': name,
+                    'ms/cycle': cpu_ms,
+                    'us/slot': cpu_ms * 1000 / total if total else 0.0,
+                    'peak KiB': peak_kib
+                })
+            state_size = manager.state_file.stat().st_size
+            sqlite_manager.close()
+
+        print_table(
+            f"단계별 비용 ({dates * scale}일 x {themes}테마 x {slots}슬롯 = {total}개, "
+            f"상태 파일 {state_size / 1024:.1f} KiB, {iterations}회 평균)",
+            rows
+        )
+
+
+def synthetic_state(total_slots: int, themes: int = 4, slots_per_day: int = 12) -> Dict:
+    """상태 파일 형식 벤치마크용 상태 (테마 themes개에 total_slots개 슬롯을 날짜별로 나눠 담음)"""
+    start = dt.datetime(2025, 1, 1, 10, 0)
+    per_theme = max(1, total_slots // themes)
+    theme_map = {}
+    for theme_id in range(themes):
+        slots_ = {}
+        for i in range(per_theme):
+            day, slot = divmod(i, slots_per_day)
+            slot_time = start + dt.timedelta(days=day, minutes=slot * 80)
+            slots_[slot_time.strftime('%Y-%m-%d %H:%M:%S')] = "예약가능" if (i * 7 + theme_id) % 5 == 0 else "매진"
+        theme_map[THEME_NAME if theme_id == 0 else f"테마{theme_id}"] = slots_
+    return {
+        'themes': theme_map,
+        'dates': {"2025-01-02": {"stale_since": "2025-01-01 09:00:00"}},
+        'last_updated': "2025-01-01 09:30:00"
+    }
+
+
+def bench_formats(sizes: List[int], iterations: int):
+    """상태 파일 형식별 인코딩/디코딩 시간과 파일 크기 (슬롯 수별)"""
+    serializers = [JsonSerializer(pretty=True), JsonSerializer(), BinarySerializer()]
+    if ORJSON_AVAILABLE:
+        serializers.insert(2, OrjsonSerializer())
+
+    rows = []
+    for size in sizes:
+        state = synthetic_state(size)
+        for serializer in serializers:
+            data = serializer.encode(state)
+            encode_ms, encode_kib = measure(lambda: serializer.encode(state), iterations)
+            decode_ms, decode_kib = measure(lambda: decode_state(data), iterations)
+            rows.append({
+                'slots': size,
+                'format': serializer.name,
+                'encode ms': encode_ms,
+                'decode ms': decode_ms,
+                'KiB': len(data) / 1024,
+                'peak KiB': max(encode_kib, decode_kib),
+                'roundtrip': 'ok' if decode_state(data) == state else 'MISMATCH'
+            })
+
+    print_table(f"상태 파일 형식 비교 ({iterations}회 평균, 디코딩은 형식 자동 판별 포함)", rows)
+
+
+def _make_state_manager(backend: str, directory: Path, process_safe: bool) -> StateManager:
+    """스트레스 테스트용 상태 관리자 (변경마다 바로 기록)"""
+    if backend == 'sqlite':
+        return SqliteStateManager(directory / 'state.db', flush_delay=0, json_file=None, process_safe=process_safe)
+    if backend == 'journal':
+        return JournalStateManager(directory / 'state.json', flush_delay=0, process_safe=process_safe)
+    return StateManager(directory / 'state.json', flush_delay=0, process_safe=process_safe)
+
+
+def _stress_date(worker_id: int) -> str:
+    """워커마다 맡는 날짜 (같은 테마 안에서 날짜만 나눠 씀)"""
+    return (dt.date(2099, 1, 1) + dt.timedelta(days=worker_id)).isoformat()
+
+
+def _stress_worker(backend: str, directory: str, worker_id: int, updates: int, process_safe: bool,
+                   ready, start, results):
+    """스트레스 테스트 워커: 자기 날짜에 슬롯을 하나씩 추가하며 매번 기록"""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    manager = _make_state_manager(backend, Path(directory), process_safe)
+    date_str = _stress_date(worker_id)
+    ready.put(worker_id)
+    start.wait()
+
+    started = time.perf_counter()
+    failed = 0
+    for i in range(updates):
+        # 메모리 상태에서 읽어 하나 더해 쓰는 읽기-수정-쓰기
+        slots = {key: status for key, status in manager.get_previous_slots().items() if key.startswith(date_str)}
+        slots[f"{date_str} {i // 60:02d}:{i % 60:02d}:00"] = "예약가능"
+        if not manager.update_theme_slots({THEME_NAME: slots}, dates=[date_str]):
+            failed += 1
+    results.put((worker_id, time.perf_counter() - started, manager.merges, failed))
+
+
+def bench_state_stress(backends: List[str], processes: int, updates: int, process_safe: bool):
+    """
+    여러 프로세스가 같은 상태 저장소에 동시에 기록할 때 잃어버리는 변경 수와 처리량
+
+    워커마다 같은 테마의 서로 다른 날짜에 updates개 슬롯을 하나씩 추가하며 매번 기록한 뒤,
+    새로 연 상태 관리자로 날짜별 슬롯 수를 세어 사라진 슬롯(lost)을 확인.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    for backend in backends:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # 저장소를 먼저 만들어 두어 워커끼리 생성이 겹치지 않게 함
+            _make_state_manager(backend, Path(temp_dir), process_safe)
+            ready = context.Queue()
+            start = context.Event()
+            results = context.Queue()
+            workers = [
+                context.Process(target=_stress_worker,
+                                args=(backend, temp_dir, worker_id, updates, process_safe, ready, start, results))
+                for worker_id in range(processes)
+            ]
+            for worker in workers:
+                worker.start()
+            # 모든 워커가 초기화를 마친 뒤 한꺼번에 시작
+            for _ in workers:
+                ready.get()
+            wall_started = time.perf_counter()
+            start.set()
+            finished = [results.get() for _ in workers]
+            wall = time.perf_counter() - wall_started
+            for worker in workers:
+                worker.join()
+
+            final = _make_state_manager(backend, Path(temp_dir), process_safe).get_previous_slots()
+            found = sum(
+                1 for worker_id in range(processes) for key in final if key.startswith(_stress_date(worker_id))
+            )
+
+        total = processes * updates
+        rows.append({
+            'backend': backend,
+            'processes': processes,
+            'writes': total,
+            'seconds': wall,
+            'writes/s': total / wall if wall else 0.0,
+            'merges': sum(merges for _, _, merges, _ in finished),
+            'failed': sum(failed for _, _, _, failed in finished),
+            'lost': total - found
+        })
+
+    print_table(
+        f"상태 저장소 다중 프로세스 스트레스 ({'잠금+병합' if process_safe else '잠금 없음'}, "
+        f"프로세스 {processes}개 x 기록 {updates}회)",
+        rows
+    )
+
+
+# --- 텔레그램 전송 지연 벤치마크 ---
+
+def _telegram_stub_app():
+    """sendMessage/getMe에 성공 응답만 돌려주는 로컬 Bot API 스텁"""
+    from aiohttp import web
+
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+        if request.match_info['method'] == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'bench', 'username': 'bench_bot'}
+        else:
+            result = {'message_id': 1, 'date': int(time.time()), 'chat': {'id': 1, 'type': 'private'}, 'text': ''}
+        return web.json_response({'ok': True, 'result': result})
+
+    app = web.Application()
+    app.router.add_post('/bot{token}/{method}', handle)
+    return app
+
+
+def bench_telegram(sends: int):
+    """
+    알림 1건 전송 시간 비교 (로컬 Bot API 스텁에 전송, 실제 텔레그램에 접속하지 않음)
+
+    - 호출마다 새 Bot + asyncio.run: 이벤트 루프, HTTPX 클라이언트, 연결을 매번 새로 만듦 (예전 방식)
+    - 공유 notifier + 알림 전용 루프: 한 번 만든 Bot과 연결을 계속 재사용
+
+    로컬 HTTP라 TLS 핸드셰이크와 왕복 지연이 빠져 있어 실제 api.telegram.org에서는 차이가 더 큼.
+    """
+    from aiohttp import web
+
+    server = BackgroundLoop(name="bench-telegram-stub")
+    runner = web.AppRunner(_telegram_stub_app())
+    server.run(runner.setup())
+    server.run(web.TCPSite(runner, '127.0.0.1', 0).start())
+    host, port = runner.addresses[0][:2]
+    base_url = f"http://{host}:{port}/bot"
+    slots = ["2099-01-30 18:30:00", "2099-01-30 20:00:00"]
+
+    def run_legacy():
+        notifier = TelegramNotifier("123:bench", 1, base_url=base_url)
+        return asyncio.run(notifier.send_notification(slots))
+
+    shared = TelegramNotifier("123:bench", 1, base_url=base_url)
+    runtime = BackgroundLoop(name="bench-telegram-notifier")
+
+    def run_shared():
+        return runtime.run(shared.send_notification(slots))
+
+    rows = []
+    try:
+        for label, send in (("새 Bot + asyncio.run", run_legacy), ("공유 notifier", run_shared)):
+            latencies = []
+            for _ in range(sends):
+                started = time.perf_counter()
+                if not send():
+                    raise RuntimeError(f"{label} 전송 실패")
+                latencies.append((time.perf_counter() - started) * 1000)
+
+            ordered = sorted(latencies)
+            rows.append({
+                'mode': label,
+                'sends': sends,
+                'first ms': latencies[0],
+                'avg ms': sum(latencies) / sends,
+                'p95 ms': ordered[min(sends - 1, int(sends * 0.95))],
+                'max ms': ordered[-1]
+            })
+    finally:
+        runtime.run(shared.close())
+        runtime.stop()
+        server.run(runner.cleanup())
+        server.stop()
+
+    print_table("텔레그램 알림 1건 전송 시간 (로컬 스텁, 호출부터 응답까지 벽시계 시간)", rows)
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='제로월드 체커 벤치마크')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extract_parser = subparsers.add_parser('extract', help='예약 페이지 값 추출 비교')
+    extract_parser.add_argument('pages', nargs='*', help='캡처한 예약 페이지 HTML 파일')
+    extract_parser.add_argument('--iterations', type=int, default=50)
+
+    models_parser = subparsers.add_parser('models', help='슬롯 표현(문자열 딕셔너리 vs Slot) 사이클 비용 비교')
+    models_parser.add_argument('--dates', type=int, default=30)
+    models_parser.add_argument('--themes', type=int, default=4)
+    models_parser.add_argument('--slots', type=int, default=12)
+    models_parser.add_argument('--iterations', type=int, default=20)
+    
+    classify_parser = subparsers.add_parser('classify', help='하루치 예약 가능 판정 비교 (슬롯 단위 vs 일괄)')
+    classify_parser.add_argument('--themes', type=int, default=40)
+    classify_parser.add_argument('--slots', type=int, default=48)
+    classify_parser.add_argument('--iterations', type=int, default=10)
+
+    suite_parser = subparsers.add_parser('suite', help='추출/과거 필터/상태/알림 포맷 단계별 비용')
+    suite_parser.add_argument('--dates', type=int, default=30)
+    suite_parser.add_argument('--themes', type=int, default=4)
+    suite_parser.add_argument('--slots', type=int, default=12)
+    suite_parser.add_argument('--iterations', type=int, default=10)
+    suite_parser.add_argument('--scale', type=int, nargs='+', default=[1], help='날짜 수 배수 (예: --scale 1 4 16)')
+    
+    formats_parser = subparsers.add_parser('formats', help='상태 파일 형식별 인코딩/디코딩 시간과 크기')
+    formats_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='슬롯 수')
+    formats_parser.add_argument('--iterations', type=int, default=5)
+    
+    stress_parser = subparsers.add_parser('state-stress', help='여러 프로세스가 동시에 상태를 기록할 때 잃는 변경 수')
+    stress_parser.add_argument('--backend', nargs='+', default=['json', 'journal', 'sqlite'],
+                               choices=['json', 'journal', 'sqlite'])
+    stress_parser.add_argument('--processes', type=int, default=4)
+    stress_parser.add_argument('--updates', type=int, default=100, help='프로세스당 기록 횟수')
+    stress_parser.add_argument('--unsafe', action='store_true', help='파일 잠금/병합 없이 실행 (비교용)')
+    
+    telegram_parser = subparsers.add_parser('telegram', help='알림 전송 시간 비교 (호출마다 새 Bot vs 공유 notifier)')
+    telegram_parser.add_argument('--sends', type=int, default=50)
+    
+    args = parser.parse_args()
+
+    # 측정 중 로그 출력 비용이 섞이지 않도록 비활성화
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    if args.command == 'extract':
+        bench_extract(args.pages, args.iterations)
+    elif args.command == 'models':
+        bench_models(args.dates, args.themes, args.slots, args.iterations)
+    elif args.command == 'classify':
+        bench_classify(args.themes, args.slots, args.iterations)
+    elif args.command == 'suite':
+        bench_suite(args.dates, args.themes, args.slots, args.iterations, args.scale)
+    elif args.command == 'formats':
+        bench_formats(args.sizes, args.iterations)
+    elif args.command == 'state-stress':
+        bench_state_stress(args.backend, args.processes, args.updates, not args.unsafe)
+    elif args.command == 'telegram':
+        bench_telegram(args.sends)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,10 @@ except ValueError:
 # main 브랜치: "층간소음", test 브랜치: "사랑하는감?"
 THEME_NAME = "층간소음"  # test 브랜치용
 
+# 동시에 감시할 테마 목록 (환경변수 THEME_NAMES에 쉼표로 구분, 기본은 THEME_NAME 하나)
+# 날짜별 API 응답 하나에 모든 테마가 들어 있으므로 테마를 늘려도 요청 수는 그대로
+THEME_NAMES = [name.strip() for name in os.getenv("THEME_NAMES", THEME_NAME).split(",") if name.strip()]
+
 # 날짜 범위 설정 (현재 날짜부터 8월 16일까지)
 today = datetime.now().date()
 DATE_START = today.strftime("%Y-%m-%d")  # 현재 날짜부터
@@ -28,6 +32,28 @@ DATE_END = "2025-08-16"    # 8월 16일까지
 TIMEZONE = "Asia/Seoul"
 RUN_HOURS = range(0, 24)  # 24시간 무제한 모니터링
 CHECK_INTERVAL_MINUTES = 1
+# 초 단위 체크 간격 (환경변수 CHECK_INTERVAL_SECONDS, 기본은 CHECK_INTERVAL_MINUTES와 같음)
+CHECK_INTERVAL_SECONDS = int(os.getenv("CHECK_INTERVAL_SECONDS", str(CHECK_INTERVAL_MINUTES * 60)))
+CHECK_INTERVAL_JITTER_SECONDS = float(os.getenv("CHECK_INTERVAL_JITTER_SECONDS", "2"))  # 매 실행에 0~N초 무작위 지연
+ADAPTIVE_INTERVAL_RATIO = 0.8  # 사이클 소요 시간이 체크 간격의 이 비율을 넘으면 간격을 늘림
+MAX_CHECK_INTERVAL_SECONDS = 300  # 자동 조정 시 체크 간격 상한
+CADENCE_WINDOW = 20  # 감지 주기 통계에 쓰는 최근 사이클 수
+
+# 폴링 방식: "sweep" (CHECK_INTERVAL_SECONDS마다 전체 날짜 확인) / "priority" (날짜별 우선순위 폴링)
+POLL_MODE = os.getenv("POLL_MODE", "sweep")
+PRIORITY_TICK_SECONDS = 5  # 우선순위 모드에서 확인할 날짜를 고르는 주기
+PRIORITY_HOT_INTERVAL_SECONDS = 20  # 오늘/내일 확인 주기
+PRIORITY_COLD_INTERVAL_SECONDS = 300  # PRIORITY_HORIZON_DAYS 이후 날짜 확인 주기
+PRIORITY_HORIZON_DAYS = 14  # 이 날짜 수에 걸쳐 주기가 HOT에서 COLD로 늘어남
+PRIORITY_RECENT_CHANGE_SECONDS = 1800  # 이 시간 안에 변화가 있었던 날짜는 주기 절반
+REQUEST_BUDGET_PER_MINUTE = int(os.getenv("REQUEST_BUDGET_PER_MINUTE", "40"))  # 분당 최대 요청 수
+
+# 버스트 모드: 슬롯이 새로 열린 날짜를 BURST_WINDOW_SECONDS 동안 BURST_INTERVAL_SECONDS 주기로 재확인
+# (이후 같은 시간에 걸쳐 평소 주기로 점차 복귀, 요청은 우선순위 모드면 REQUEST_BUDGET_PER_MINUTE,
+#  전체 확인 모드면 전체 확인 요청과 따로 세는 BURST_BUDGET_PER_MINUTE 안에서만)
+BURST_INTERVAL_SECONDS = 5
+BURST_WINDOW_SECONDS = 120
+BURST_BUDGET_PER_MINUTE = int(os.getenv("BURST_BUDGET_PER_MINUTE", "24"))  # 전체 확인 모드 버스트 재확인 분당 최대 요청 수
 
 # 파일 경로
 # 클라우드 환경 감지
@@ -38,19 +64,52 @@ if IS_CLOUD:
     LOG_FILE = None  # stdout 사용
     # 상태 파일도 메모리 기반으로 변경 (옵션)
     STATE_FILE = Path("/tmp/state.json") if os.path.exists("/tmp") else Path("state.json")
+    STATE_DB_FILE = Path("/tmp/state.db") if os.path.exists("/tmp") else Path("state.db")
 else:
     # 로컬 환경
     STATE_FILE = Path("state.json")
+    STATE_DB_FILE = Path("state.db")
     LOG_FILE = "checker.log"
 
+# 상태 저장소 (json: state.json 스냅샷, sqlite: state.db에 현재 슬롯 + 상태 변화 이력 기록,
+# journal: state.json 스냅샷 + 바뀐 슬롯만 덧붙이는 state.journal)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "json").lower()
+# 상태 스냅샷 형식 (json: 공백 없는 JSON, orjson이 있으면 사용 / json-pretty: 예전 형식 / binary: 이진 형식)
+# 읽을 때는 형식을 자동 판별하므로 바꿔도 기존 파일을 그대로 읽음
+STATE_FORMAT = os.getenv("STATE_FORMAT", "json").lower()
+# 저널 파일이 이 크기(바이트)를 넘으면 스냅샷으로 합치고 비움
+STATE_JOURNAL_MAX_BYTES = int(os.getenv("STATE_JOURNAL_MAX_BYTES", str(1024 * 1024)))
+
+# 상태 파일 지연 기록 (첫 변경 후 이 시간 안의 변경을 묶어 한 번에 기록, 0이면 변경마다 바로 기록)
+STATE_FLUSH_DELAY_SECONDS = float(os.getenv("STATE_FLUSH_DELAY_SECONDS", "5"))
+# 상태 파일을 여러 프로세스가 함께 쓸 수 있도록 기록할 때 파일 잠금 + 다른 프로세스 변경 병합 (0이면 끔)
+STATE_PROCESS_LOCK = os.getenv("STATE_PROCESS_LOCK", "1") != "0"
+
 # HTTP 요청 설정
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 REQUEST_TIMEOUT = 10
+FETCH_CONCURRENCY = 8  # 날짜별 (페이지+API) 요청 동시 실행 상한
+LAZY_HIDDEN_DATA = True  # API에 예약 가능 후보 슬롯이 있는 날짜만 HTML 페이지(숨겨진 데이터) 요청
+KEEPALIVE_TIMEOUT = 90  # 유휴 연결 유지 시간 (초) - 체크 간격보다 길어야 사이클 간 재사용됨
+# 사이트 요청 속도 제한 (토큰 버킷, 페이지/API/CSRF 재발급 요청 전체 공유, 0이면 제한 없음)
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "5"))  # 지속 요청 속도 (초당)
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "10"))  # 순간 최대 요청 수
+# 요청 재시도 (네트워크 오류, 아래 상태 코드) - 지수 백오프 + 지터, 사이클 마감 시각을 넘기지 않음
+RETRY_MAX_ATTEMPTS = 3  # 요청당 최대 시도 횟수 (첫 시도 포함)
+RETRY_BACKOFF_BASE_SECONDS = 0.5  # 첫 재시도 대기 상한 (시도마다 2배)
+RETRY_BACKOFF_MAX_SECONDS = 8  # 재시도 대기 상한
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 서킷 브레이커 (연속 실패 시 사이트 요청 중단 후 시험 요청 1회로 회복 확인)
+BREAKER_FAILURE_THRESHOLD = 5  # 열림 기준 연속 실패 횟수
+BREAKER_RESET_SECONDS = 60  # 열린 뒤 시험 요청까지 대기 시간 (초)
 
-# 제로월드 URL 설정
-BASE_URL = "https://zerohongdae.com"
+# 제로월드 URL 설정 (환경변수 ZEROWORLD_BASE_URL로 재생 서버 등 다른 주소 지정 가능)
+BASE_URL = os.getenv("ZEROWORLD_BASE_URL", "https://zerohongdae.com").rstrip("/")
 RESERVATION_URL = f"{BASE_URL}/reservation"
 
+# 응답 캡처 디렉터리 (설정하면 받은 페이지/API 응답을 압축 아카이브로 저장, checker.replay로 재생)
+CAPTURE_DIR = os.getenv("CAPTURE_DIR") or None
+
 # 로그 설정
 LOG_LEVEL = "DEBUG"  # 디버깅을 위해 DEBUG 레벨로 변경
 LOG_ROTATION = "1 MB"
@@ -58,4 +117,20 @@ LOG_RETENTION = "5 days"
 
 # 알림 설정
 MAX_NOTIFICATION_SLOTS = 10  # 한 번에 최대 알림 개수
-NOTIFICATION_COOLDOWN = 300  # 연속 알림 방지 쿨타임 (초) 
\ No newline at end of file
+# 알림은 슬롯 상태 변화(매진→예약가능, 새로 생긴 슬롯)가 있을 때만 보냄
+NOTIFICATION_COOLDOWN = 300  # 같은 슬롯을 다시 알리기까지 최소 간격 (초) - 열렸다 닫히기를 반복하는 슬롯 재알림 방지
+# 계속 예약 가능한 슬롯을 이 간격(초)마다 다시 알림 (환경변수 ALERT_REMINDER_INTERVAL_SECONDS, 0이면 끔)
+ALERT_REMINDER_INTERVAL_SECONDS = float(os.getenv("ALERT_REMINDER_INTERVAL_SECONDS", "0"))
+
+# 텔레그램 API 주소 (환경변수 TELEGRAM_API_URL로 로컬 Bot API 서버 등 다른 주소 지정 가능)
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org/bot")
+TELEGRAM_CONNECTION_POOL_SIZE = 4  # 알림 전송용 텔레그램 API 연결 풀 크기
+TELEGRAM_KEEPALIVE_SECONDS = 300  # 유휴 연결 유지 시간 (초) - 알림 사이에도 TLS 연결을 재사용
+TELEGRAM_SEND_TIMEOUT = 30  # 동기 함수에서 전송 완료를 기다리는 최대 시간 (초)
+
+# 발신 대기열 (체크 작업은 메시지를 넣고 바로 반환, 알림 전용 루프의 디스패처가 순서대로 전송)
+OUTBOUND_QUEUE_MAX_SIZE = 100  # 대기열 최대 길이 (넘으면 가장 오래된 메시지를 버림)
+OUTBOUND_MAX_ATTEMPTS = 5  # 메시지당 최대 전송 시도 횟수 (첫 시도 포함)
+OUTBOUND_BACKOFF_BASE_SECONDS = 1  # 네트워크 오류 후 첫 재시도 대기 상한 (시도마다 2배)
+OUTBOUND_BACKOFF_MAX_SECONDS = 30  # 재시도 대기 상한
+OUTBOUND_DRAIN_TIMEOUT = 10  # 종료할 때 남은 메시지 전송을 기다리는 최대 시간 (초)
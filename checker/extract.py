@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+예약 페이지 값 추출 모듈
+
+예약 페이지에서 필요한 값은 <div id="reservationHiddenData">의 JSON과
+<meta name="csrf-token"> 두 가지뿐이므로, 전체 DOM을 만들지 않고
+응답 바이트에서 해당 구간만 찾아 추출한다.
+빠른 경로가 실패하면 (마크업 변경 등) BeautifulSoup 파싱으로 대체한다.
+"""
+
+import re
+import json
+import html
+from typing import Dict, Optional, Union
+from bs4 import BeautifulSoup
+from loguru import logger
+
+
+Content = Union[str, bytes]
+
+_HIDDEN_DIV_RE = re.compile(rb'<div\b[^>]*\bid\s*=\s*["\']reservationHiddenData["\'][^>]*>', re.IGNORECASE)
+_DIV_END = b'</div>'
+_CSRF_META_RE = re.compile(rb'<meta\b[^>]*\bname\s*=\s*["\']csrf-token["\'][^>]*>', re.IGNORECASE)
+_CSRF_INPUT_RE = re.compile(rb'<input\b[^>]*\bname\s*=\s*["\']_token["\'][^>]*>', re.IGNORECASE)
+_CONTENT_ATTR_RE = re.compile(rb'\bcontent\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_VALUE_ATTR_RE = re.compile(rb'\bvalue\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+
+def _to_bytes(content: Content) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    return content.encode('utf-8')
+
+
+def _decode_text(raw: bytes) -> str:
+    return html.unescape(raw.decode('utf-8', errors='replace')).strip()
+
+
+def find_hidden_data_text(content: Content) -> Optional[str]:
+    """
+    reservationHiddenData div의 텍스트를 바이트 스캔으로 찾기 (JSON 파싱 전 원문)
+
+    Returns:
+        div 안의 텍스트, 찾지 못했거나 중첩 태그가 있으면 None
+    """
+    data = _to_bytes(content)
+    match = _HIDDEN_DIV_RE.search(data)
+    if not match:
+        return None
+
+    end = data.find(_DIV_END, match.end())
+    if end < 0:
+        return None
+
+    inner = data[match.end():end]
+    # 중첩 태그가 있으면 get_text()와 결과가 달라지므로 빠른 경로 포기
+    if b'<' in inner:
+        return None
+
+    return _decode_text(inner)
+
+
+def _find_hidden_data_text_bs(content: Content) -> Optional[str]:
+    """BeautifulSoup으로 reservationHiddenData 텍스트 찾기 (대체 경로)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    hidden_div = soup.find('div', id='reservationHiddenData')
+    if not hidden_div:
+        return None
+    return hidden_div.get_text().strip()
+
+
+def extract_hidden_data(content: Content) -> Dict:
+    """
+    HTML에서 숨겨진 예약 데이터 추출
+
+    Args:
+        content: 예약 페이지 응답 (bytes 또는 str)
+
+    Returns:
+        dict: 숨겨진 예약 데이터 (실패 시 빈 딕셔너리)
+    """
+    hidden_text = find_hidden_data_text(content)
+    if hidden_text is not None:
+        try:
+            return json.loads(hidden_text)
+        except json.JSONDecodeError as e:
+            logger.debug(f"숨겨진 데이터 빠른 추출 실패, BeautifulSoup으로 재시도: {e}")
+
+    try:
+        hidden_text = _find_hidden_data_text_bs(content)
+        if hidden_text is None:
+            logger.warning("reservationHiddenData를 찾을 수 없습니다")
+            return {}
+
+        return json.loads(hidden_text)
+
+    except json.JSONDecodeError as e:
+        logger.error(f"숨겨진 데이터 JSON 파싱 실패: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"숨겨진 데이터 추출 실패: {e}")
+        return {}
+
+
+def _attr_value(tag: bytes, attr_re: "re.Pattern") -> Optional[str]:
+    match = attr_re.search(tag)
+    if not match:
+        return None
+    raw = match.group(1) if match.group(1) is not None else match.group(2)
+    return _decode_text(raw)
+
+
+def extract_csrf_token(content: Content) -> Optional[str]:
+    """
+    HTML에서 CSRF 토큰 추출 (meta 태그 우선, 없으면 hidden input)
+
+    Args:
+        content: 예약 페이지 응답 (bytes 또는 str)
+
+    Returns:
+        CSRF 토큰 또는 None
+    """
+    data = _to_bytes(content)
+
+    meta = _CSRF_META_RE.search(data)
+    if meta:
+        token = _attr_value(meta.group(0), _CONTENT_ATTR_RE)
+        if token:
+            logger.info(f"CSRF 토큰 획득 성공 (meta): {token[:10]}...")
+            return token
+
+    token_input = _CSRF_INPUT_RE.search(data)
+    if token_input:
+        token = _attr_value(token_input.group(0), _VALUE_ATTR_RE)
+        if token:
+            logger.info(f"CSRF 토큰 획득 성공 (input): {token[:10]}...")
+            return token
+
+    # 빠른 경로 실패 시 BeautifulSoup으로 재시도
+    soup = BeautifulSoup(content, 'html.parser')
+    csrf_meta = soup.find('meta', {'name': 'csrf-token'})
+    csrf_input = soup.find('input', {'name': '_token'})
+
+    if csrf_meta and csrf_meta.get('content'):
+        token = csrf_meta.get('content')
+        logger.info(f"CSRF 토큰 획득 성공 (meta, BeautifulSoup): {token[:10]}...")
+        return token
+    elif csrf_input and csrf_input.get('value'):
+        token = csrf_input.get('value')
+        logger.info(f"CSRF 토큰 획득 성공 (input, BeautifulSoup): {token[:10]}...")
+        return token
+
+    logger.warning("CSRF 토큰을 찾을 수 없습니다")
+    return None
@@ -5,37 +5,51 @@
 HTML 전체 파싱으로 숨겨진 예약 데이터와 API 데이터를 조합하여 정확한 예약 상태 확인
 """
 
+import asyncio
 import requests
+import aiohttp
 import json
+import hashlib
 import datetime as dt
 import time
-from typing import Dict, List, Optional, Tuple
-from bs4 import BeautifulSoup
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
 from loguru import logger
 
 from .config import (
-    BASE_URL, RESERVATION_URL, THEME_NAME,
-    DATE_START, DATE_END, USER_AGENT, REQUEST_TIMEOUT
+    BASE_URL, RESERVATION_URL, THEME_NAME, THEME_NAMES,
+    DATE_START, DATE_END, USER_AGENT, REQUEST_TIMEOUT,
+    FETCH_CONCURRENCY, KEEPALIVE_TIMEOUT, LAZY_HIDDEN_DATA, CAPTURE_DIR,
+    RETRY_MAX_ATTEMPTS, RETRY_STATUSES
 )
+from .aio import BackgroundLoop
+from .replay import CaptureArchive
+from .ratelimit import TokenBucket, get_rate_limiter
+from .retry import BreakerState, CircuitBreaker, CircuitOpenError, backoff_delay, get_circuit_breaker
+from .extract import extract_hidden_data, extract_csrf_token, find_hidden_data_text
+from .models import Slot, SlotStatus, slot_epoch, to_theme_map
 
+# 테마별 슬롯 상태 {"층간소음": {"2025-01-29 18:30:00": "예약가능"}} (상태 파일 형식)
+ThemeSlots = Dict[str, Dict[str, str]]
 
-class ZeroworldFetcher:
-    """제로월드 예약 정보 가져오기 클래스"""
+
+class _SlotCacheEntry(NamedTuple):
+    """날짜별 파싱 결과 캐시 항목"""
+    api_digest: bytes
+    hidden_digest: Optional[bytes]  # HTML 페이지를 받지 않았으면 None
+    slots: List[Slot]
+
+
+def _digest(data: bytes) -> bytes:
+    """응답 원문 비교용 빠른 다이제스트"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class SlotExtractor:
+    """API 응답과 숨겨진 데이터를 조합해 슬롯 상태를 판정하는 공용 로직"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': USER_AGENT,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Origin': BASE_URL,
-            'Referer': RESERVATION_URL
-        })
-        
-        # CSRF 토큰과 초기 HTML 가져오기
-        self.csrf_token = None
-        self._initialize_session()
+    # ⚠️ 특별 제외 슬롯 (문제가 있는 슬롯): 항상 매진 처리
+    EXCLUDED_SLOTS = {("2025-08-02", "19:00:00")}
     
     def _time_to_timestamp(self, date_str: str, time_str: str) -> int:
         """날짜와 시간을 타임스탬프로 변환"""
@@ -47,31 +61,21 @@ class ZeroworldFetcher:
             logger.error(f"타임스탬프 변환 실패: {e}")
             return 0
     
-    def _extract_hidden_data(self, html_content: str) -> Dict:
-        """HTML에서 숨겨진 예약 데이터 추출"""
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            hidden_div = soup.find('div', id='reservationHiddenData')
-            
-            if hidden_div:
-                hidden_text = hidden_div.get_text().strip()
-                hidden_data = json.loads(hidden_text)
-                logger.info(f"숨겨진 예약 데이터 추출 성공: {len(str(hidden_data))} 문자")
-                return hidden_data
-            else:
-                logger.warning("reservationHiddenData를 찾을 수 없습니다")
-                return {}
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"숨겨진 데이터 JSON 파싱 실패: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"숨겨진 데이터 추출 실패: {e}")
-            return {}
+    def _extract_hidden_data(self, html_content: Union[str, bytes]) -> Dict:
+        """HTML에서 숨겨진 예약 데이터 추출 (바이트 스캔, 실패 시 BeautifulSoup)"""
+        hidden_data = extract_hidden_data(html_content)
+        if hidden_data:
+            logger.info(f"숨겨진 예약 데이터 추출 성공: {len(hidden_data)}개 항목")
+        return hidden_data
     
     def _is_really_available(self, theme_pk: int, time_str: str, date_str: str, 
                            hidden_data: Dict, api_reservation: bool) -> bool:
-        """실제 예약 가능 여부 확인 (API + 숨겨진 데이터 조합)"""
+        """
+        실제 예약 가능 여부 확인 (API + 숨겨진 데이터 조합) - 슬롯 하나 단위
+        
+        수집 경로는 _classify_theme_slots의 날짜 단위 일괄 판정을 사용하며,
+        이 함수는 판정 기준 구현으로 남겨 둠 (벤치마크에서 결과 비교)
+        """
         try:
             # 1. API에서 기본적으로 매진이라고 하면 매진
             if api_reservation:
@@ -117,30 +121,260 @@ class ZeroworldFetcher:
             # 오류 시 API 결과 사용 (보수적 접근)
             return not api_reservation
     
+    def _extract_csrf_token(self, html_content: Union[str, bytes]) -> Optional[str]:
+        """HTML에서 CSRF 토큰 추출 (meta 태그 우선, 없으면 hidden input)"""
+        return extract_csrf_token(html_content)
+    
+    def _reserved_timestamps(self, hidden_data: Dict, theme_pk: int) -> Optional[Set[int]]:
+        """
+        숨겨진 데이터에서 테마의 예약된 타임스탬프를 정수 집합으로 (날짜마다 한 번)
+        
+        Returns:
+            예약된 타임스탬프 집합, 숨겨진 데이터가 없으면 None (API 결과만 사용)
+        """
+        theme_reservations = hidden_data.get('other', {}).get(str(theme_pk), {}) if hidden_data else {}
+        if not theme_reservations:
+            return None
+        
+        # str(timestamp)와 정확히 같은 키만 인정 (앞자리 0 등은 기존 문자열 비교에서도 불일치)
+        return {
+            int(key) for key in theme_reservations
+            if isinstance(key, str) and key.isdigit() and (key == "0" or key[0] != "0")
+        }
+    
+    def _classify_theme_slots(self, theme_id: int, theme_times: List[Dict], target_date: str,
+                              reserved: Optional[Set[int]], now_epoch: float) -> Tuple[List[Slot], int]:
+        """
+        한 테마의 하루치 슬롯을 한 번에 판정 (_is_really_available과 같은 규칙)
+        
+        1. API가 매진이면 매진
+        2. 특별 제외 슬롯이거나 현재 시간보다 과거면 매진
+        3. 숨겨진 데이터가 없으면 API 결과(예약 가능) 사용
+        4. 숨겨진 데이터에 타임스탬프가 있으면 매진, 없으면 예약 가능
+        
+        Returns:
+            (슬롯 리스트, 숨겨진 데이터 없이 API 결과만 사용한 슬롯 수)
+        """
+        date_slots = []
+        api_only = 0
+        
+        for time_slot in theme_times:
+            time_str = time_slot.get('time', '')
+            if not time_str:
+                continue
+            
+            try:
+                epoch = slot_epoch(target_date, time_str)
+            except ValueError:
+                logger.warning(f"슬롯 시간 파싱 실패: {target_date} {time_str}")
+                continue
+            
+            if (time_slot.get('reservation', False) or epoch < now_epoch
+                    or (target_date, time_str) in self.EXCLUDED_SLOTS):
+                status = SlotStatus.RESERVED
+            elif reserved is None:
+                api_only += 1
+                status = SlotStatus.AVAILABLE
+            else:
+                status = SlotStatus.RESERVED if epoch in reserved else SlotStatus.AVAILABLE
+            
+            date_slots.append(Slot(epoch, theme_id, status))
+        
+        return date_slots, api_only
+    
+    def _match_watched_themes(self, api_data: Dict, theme_names: List[str]) -> Dict[str, int]:
+        """API 테마 목록을 한 번 훑어서 감시 대상 테마 이름 -> PK 매핑 생성"""
+        theme_pks = {}
+        
+        for theme in api_data.get('data', []):
+            title = theme.get('title', '')
+            for theme_name in theme_names:
+                if theme_name not in theme_pks and theme_name in title:
+                    theme_pks[theme_name] = theme.get('PK')
+                    logger.info(f"'{theme_name}' 테마 발견: PK={theme_pks[theme_name]}")
+            
+            if len(theme_pks) == len(theme_names):
+                break
+        
+        return theme_pks
+    
+    def extract_date_slots(self, api_data: Dict, hidden_data: Dict, target_date: str,
+                           theme_names: List[str] = THEME_NAMES) -> List[Slot]:
+        """
+        한 날짜의 API 응답에서 감시 대상 테마 전부의 슬롯 정보를 한 번에 추출
+        
+        /reservation/theme 응답에는 그 날짜의 모든 테마가 들어 있으므로
+        테마를 늘려도 추가 HTTP 요청이 필요 없음
+        
+        Args:
+            api_data: API 응답 데이터
+            hidden_data: HTML에서 추출한 숨겨진 예약 데이터
+            target_date: 대상 날짜
+            theme_names: 감시 대상 테마 이름 목록 (Slot.theme_id는 이 목록의 인덱스)
+            
+        Returns:
+            슬롯 리스트 [Slot(epoch, theme_id, status), ...]
+        """
+        date_slots: List[Slot] = []
+        
+        try:
+            # API 응답 구조 분석
+            if 'data' not in api_data:
+                return date_slots
+            
+            theme_pks = self._match_watched_themes(api_data, theme_names)
+            times = api_data.get('times', {})
+            # 날짜 단위로 현재 시각은 한 번만 확인
+            now_epoch = time.time()
+            
+            for theme_id, theme_name in enumerate(theme_names):
+                theme_pk = theme_pks.get(theme_name)
+                if not theme_pk or not times:
+                    logger.warning(f"'{theme_name}' 테마를 찾을 수 없습니다")
+                    continue
+                
+                # 해당 테마의 시간 슬롯 정보와 예약된 타임스탬프 집합
+                theme_times = times.get(str(theme_pk), [])
+                reserved = self._reserved_timestamps(hidden_data, theme_pk)
+                
+                # **핵심 로직**: API 데이터와 숨겨진 데이터 조합 (하루치 일괄 판정)
+                theme_slots, api_only = self._classify_theme_slots(
+                    theme_id, theme_times, target_date, reserved, now_epoch
+                )
+                date_slots.extend(theme_slots)
+                
+                # ⚠️ 거짓 양성 방지: 숨겨진 데이터가 없으면 API 결과만 사용
+                if api_only:
+                    logger.warning(f"숨겨진 데이터 없음 - API 결과만 사용: {target_date} '{theme_name}' {api_only}개 슬롯")
+                
+                available_count = sum(1 for slot in theme_slots if slot.available)
+                logger.info(
+                    f"'{theme_name}' 슬롯 {len(theme_slots)}개 추출 완료 "
+                    f"(예약가능 {available_count}개, 매진 {len(theme_slots) - available_count}개)"
+                )
+            
+        except Exception as e:
+            logger.error(f"슬롯 추출 중 오류: {e}")
+        
+        return date_slots
+    
+    def extract_theme_slots(self, api_data: Dict, hidden_data: Dict, target_date: str,
+                            theme_names: List[str] = THEME_NAMES) -> ThemeSlots:
+        """
+        한 날짜의 감시 대상 테마별 슬롯 정보를 상태 파일 형식으로 추출
+        
+        Returns:
+            테마별 슬롯 딕셔너리 {"층간소음": {"2025-01-29 18:30:00": "예약가능"}}
+        """
+        return to_theme_map(self.extract_date_slots(api_data, hidden_data, target_date, theme_names), theme_names)
+    
+    def extract_slots_from_data(self, api_data: Dict, hidden_data: Dict, 
+                               target_date: str) -> Dict[str, str]:
+        """
+        API 응답과 숨겨진 데이터를 조합하여 THEME_NAME 테마의 슬롯 정보 추출
+        
+        Args:
+            api_data: API 응답 데이터
+            hidden_data: HTML에서 추출한 숨겨진 예약 데이터
+            target_date: 대상 날짜
+            
+        Returns:
+            슬롯 정보 딕셔너리 {"2025-01-29 18:30": "예약가능"}
+        """
+        return self.extract_theme_slots(api_data, hidden_data, target_date, [THEME_NAME])[THEME_NAME]
+
+
+class ZeroworldFetcher(SlotExtractor):
+    """제로월드 예약 정보 가져오기 클래스 (requests 기반 동기 버전)"""
+    
+    def __init__(self, capture_dir: Optional[str] = CAPTURE_DIR, rate_limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.session = requests.Session()
+        # 모든 사이트 요청이 거치는 공유 속도 제한기와 서킷 브레이커
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.breaker = breaker or get_circuit_breaker()
+        # 응답 캡처 아카이브 (CAPTURE_DIR 설정 시)
+        self._capture = CaptureArchive(Path(capture_dir)) if capture_dir else None
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Origin': BASE_URL,
+            'Referer': RESERVATION_URL
+        })
+        
+        # CSRF 토큰과 초기 HTML 가져오기
+        self.csrf_token = None
+        self._initialize_session()
+    
     def _initialize_session(self):
         """세션 초기화 및 CSRF 토큰 획득"""
         try:
-            response = self.session.get(RESERVATION_URL, timeout=REQUEST_TIMEOUT)
+            response = self._send('GET', RESERVATION_URL)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            csrf_meta = soup.find('meta', {'name': 'csrf-token'})
-            csrf_input = soup.find('input', {'name': '_token'})
-            
-            if csrf_meta:
-                self.csrf_token = csrf_meta.get('content')
-                logger.info(f"CSRF 토큰 획득 성공 (meta): {self.csrf_token[:10]}...")
-            elif csrf_input:
-                self.csrf_token = csrf_input.get('value')
-                logger.info(f"CSRF 토큰 획득 성공 (input): {self.csrf_token[:10]}...")
-            else:
-                logger.warning("CSRF 토큰을 찾을 수 없습니다")
-                self.csrf_token = None
+            self.csrf_token = self._extract_csrf_token(response.content)
                 
         except Exception as e:
             logger.error(f"세션 초기화 실패: {e}")
             self.csrf_token = None
     
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        속도 제한, 서킷 브레이커, 재시도를 거쳐 요청 전송
+        
+        네트워크 오류와 RETRY_STATUSES 응답은 지수 백오프(+지터)로 RETRY_MAX_ATTEMPTS까지 다시 시도
+        
+        Raises:
+            CircuitOpenError: 서킷 브레이커가 열려 있음
+            requests.exceptions.RequestException: 마지막 시도까지 네트워크 오류
+        """
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f"서킷 브레이커 열림 ({self.breaker.retry_in():.0f}초 후 시험 요청)")
+            
+            self.rate_limiter.acquire()
+            error = None
+            try:
+                response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.breaker.record_failure()
+                error = e
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self._capture_response(response, kwargs.get('data'))
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+            
+            if attempt + 1 >= RETRY_MAX_ATTEMPTS or self.breaker.state is not BreakerState.CLOSED:
+                if error is not None:
+                    raise error
+                return response
+            
+            delay = backoff_delay(attempt)
+            reason = f"{type(error).__name__}: {error}" if error is not None else f"HTTP {response.status_code}"
+            logger.warning(f"{method} {url} 실패 ({reason}) - {delay:.1f}초 후 재시도 ({attempt + 1}/{RETRY_MAX_ATTEMPTS - 1})")
+            time.sleep(delay)
+        
+        return response
+    
+    def _capture_response(self, response: requests.Response, form: Optional[Dict] = None):
+        """응답을 캡처 아카이브에 기록 (캡처 실패는 수집에 영향 없음)"""
+        if self._capture is None:
+            return
+        try:
+            self._capture.record(
+                response.request.method, response.url, form, response.status_code,
+                response.headers, response.content, response.elapsed.total_seconds()
+            )
+        except Exception as e:
+            logger.warning(f"응답 캡처 실패: {e}")
+    
     def get_theme_data(self, date: str) -> Optional[Tuple[Dict, Dict]]:
         """
         특정 날짜의 테마 정보와 숨겨진 예약 데이터 가져오기
@@ -164,14 +398,14 @@ class ZeroworldFetcher:
             
             # 예약 페이지에 날짜 파라미터 추가해서 접근
             page_url = f"{RESERVATION_URL}?date={date}"
-            page_response = self.session.get(page_url, timeout=REQUEST_TIMEOUT)
+            page_response = self._send('GET', page_url)
             
             if page_response.status_code != 200:
                 logger.error(f"HTML 페이지 가져오기 실패: {page_response.status_code}")
                 return None
             
             # 2. 숨겨진 데이터 추출
-            hidden_data = self._extract_hidden_data(page_response.text)
+            hidden_data = self._extract_hidden_data(page_response.content)
             
             # 3. API 데이터 가져오기
             logger.info(f"날짜 {date}의 API 데이터 가져오는 중...")
@@ -193,12 +427,7 @@ class ZeroworldFetcher:
                 'paymentType': '1'
             }
             
-            api_response = self.session.post(
-                api_url, 
-                data=data, 
-                headers=ajax_headers,
-                timeout=REQUEST_TIMEOUT
-            )
+            api_response = self._send('POST', api_url, data=data, headers=ajax_headers)
             
             logger.info(f"API 요청: {api_url}, 날짜: {date}")
             logger.info(f"API 응답 상태: {api_response.status_code}")
@@ -220,152 +449,669 @@ class ZeroworldFetcher:
                 logger.debug(f"API 응답 내용: {api_response.text[:500]}")
                 return None
                 
+        except CircuitOpenError as e:
+            logger.warning(f"날짜 {date} 요청 생략: {e}")
+            return None
         except requests.exceptions.RequestException as e:
             logger.error(f"네트워크 오류: {e}")
             return None
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}")
             return None
+
+
+class AsyncZeroworldFetcher(SlotExtractor):
+    """
+    aiohttp 기반 비동기 fetcher
     
-    def extract_slots_from_data(self, api_data: Dict, hidden_data: Dict, 
-                               target_date: str) -> Dict[str, str]:
+    날짜별 (HTML 페이지 + API) 요청 쌍을 동시에 실행하여
+    한 사이클의 소요 시간이 날짜 수의 합이 아니라 가장 느린 날짜에 맞춰지도록 함.
+    start()로 백그라운드 루프를 띄우면 세션(연결 풀, 쿠키, CSRF 토큰)을
+    체크 사이클 사이에 계속 재사용하는 장기 실행 fetcher로 동작함
+    """
+    
+    # 서버가 CSRF 토큰을 거부할 때 돌려주는 상태 코드 (Laravel: 419)
+    CSRF_REJECT_STATUSES = (419, 403)
+    
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY, theme_names: List[str] = THEME_NAMES,
+                 lazy_hidden_data: bool = LAZY_HIDDEN_DATA, capture_dir: Optional[str] = CAPTURE_DIR,
+                 rate_limiter: Optional[TokenBucket] = None, breaker: Optional[CircuitBreaker] = None):
+        self.concurrency = max(1, concurrency)
+        self.theme_names = list(theme_names)
+        self.lazy_hidden_data = lazy_hidden_data
+        # 응답 캡처 아카이브 (CAPTURE_DIR 설정 시)
+        self._capture = CaptureArchive(Path(capture_dir)) if capture_dir else None
+        # 모든 사이트 요청이 거치는 공유 속도 제한기
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # 연속 실패 시 요청을 끊는 공유 서킷 브레이커
+        self.breaker = breaker or get_circuit_breaker()
+        # 이번 사이클 마감 시각 (time.monotonic 기준, 재시도 대기가 넘지 않도록)
+        self._deadline: Optional[float] = None
+        self.csrf_token = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._csrf_lock: Optional[asyncio.Lock] = None
+        self._runtime: Optional[BackgroundLoop] = None
+        
+        # 연결/세션 재사용 및 요청량 통계 (누적)
+        self.stats = {
+            'connections_new': 0,
+            'connections_reused': 0,
+            'csrf_refreshes': 0,
+            'requests': 0,
+            'bytes': 0,
+            'pages_skipped': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'not_modified': 0,
+            'rate_limited': 0,
+            'rate_wait_ms': 0,
+            'retries': 0,
+            'breaker_rejected': 0,
+            'cycles': 0
+        }
+        
+        # 날짜별 {API 다이제스트, 숨겨진 데이터 다이제스트, 추출된 슬롯} 캐시
+        self._slot_cache: Dict[str, _SlotCacheEntry] = {}
+        # 조건부 요청용 {캐시 키: (검증 헤더, 응답 본문)}
+        self._conditional_cache: Dict[str, Tuple[Dict[str, str], bytes]] = {}
+    
+    async def __aenter__(self) -> "AsyncZeroworldFetcher":
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """연결 생성/재사용 횟수를 세는 aiohttp 트레이스 설정"""
+        async def on_create(session, ctx, params):
+            self.stats['connections_new'] += 1
+        
+        async def on_reuse(session, ctx, params):
+            self.stats['connections_reused'] += 1
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+    
+    async def open(self):
+        """aiohttp 세션 생성"""
+        if self.session and not self.session.closed:
+            return
+        
+        self._csrf_lock = asyncio.Lock()
+        self.session = aiohttp.ClientSession(
+            headers={
+                'User-Agent': USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+                # aiohttp는 brotli 패키지가 없으면 br 디코딩을 못하므로 제외
+                'Accept-Encoding': 'gzip, deflate',
+                'Origin': BASE_URL,
+                'Referer': RESERVATION_URL
+            },
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            # 날짜당 페이지+API 두 요청이 순차로 나가므로 동시 실행 수만큼 연결이면 충분.
+            # 체크 간격보다 길게 유지해야 다음 사이클에서 연결을 재사용할 수 있음
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            ),
+            trace_configs=[self._build_trace_config()]
+        )
+    
+    async def close(self):
+        """aiohttp 세션 종료"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.csrf_token = None
+    
+    async def _send(self, method: str, url: str, **kwargs) -> Tuple[int, bytes, Mapping[str, str]]:
+        """요청 1회 전송 (속도 제한, 요청 수/수신 바이트 집계, 응답 캡처)"""
+        waited = await self.rate_limiter.acquire_async()
+        if waited > 0:
+            self.stats['rate_limited'] += 1
+            self.stats['rate_wait_ms'] += int(waited * 1000)
+        
+        started = time.perf_counter()
+        async with self.session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            status = response.status
+            # 헤더 이름은 대소문자 구분 없이 조회하도록 CIMultiDict 그대로 복사
+            response_headers = response.headers.copy()
+        elapsed = time.perf_counter() - started
+        
+        self.stats['requests'] += 1
+        self.stats['bytes'] += len(body)
+        
+        if self._capture is not None and status != 304:
+            try:
+                # 압축/디스크 기록은 이벤트 루프를 막지 않도록 스레드에서
+                await asyncio.to_thread(
+                    self._capture.record, method, url, kwargs.get('data'),
+                    status, response_headers, body, elapsed
+                )
+            except Exception as e:
+                logger.warning(f"응답 캡처 실패: {e}")
+        
+        return status, body, response_headers
+    
+    async def _request(self, method: str, url: str, cache_key: Optional[str] = None,
+                       **kwargs) -> Tuple[int, bytes]:
         """
-        API 응답과 숨겨진 데이터를 조합하여 실제 슬롯 정보 추출
+        사이트로 나가는 모든 요청의 공통 경로 (서킷 브레이커, 재시도, 조건부 요청)
+        
+        네트워크 오류와 RETRY_STATUSES 응답은 지수 백오프(+지터)로 RETRY_MAX_ATTEMPTS까지
+        다시 시도하되, 대기 후 사이클 마감 시각을 넘기게 되면 더 시도하지 않음.
+        서킷 브레이커가 열려 있으면 요청을 보내지 않고 CircuitOpenError 발생.
+        
+        cache_key를 주면, 서버가 ETag/Last-Modified를 보낸 응답에 한해
+        다음 요청을 조건부 요청으로 보내고 304 응답이면 저장해 둔 본문을 돌려줌
         
-        Args:
-            api_data: API 응답 데이터
-            hidden_data: HTML에서 추출한 숨겨진 예약 데이터
-            target_date: 대상 날짜
-            
         Returns:
-            슬롯 정보 딕셔너리 {"2025-01-29 18:30": "예약가능"}
+            (HTTP 상태 코드, 응답 본문 바이트)
         """
-        slots = {}
+        conditional = self._conditional_cache.get(cache_key) if cache_key else None
+        if conditional:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(conditional[0])
+            kwargs['headers'] = headers
         
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            if not self.breaker.allow_request():
+                self.stats['breaker_rejected'] += 1
+                raise CircuitOpenError(f"서킷 브레이커 열림 ({self.breaker.retry_in():.0f}초 후 시험 요청)")
+            
+            error = None
+            try:
+                status, body, response_headers = await self._send(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.breaker.record_failure()
+                error = e
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                if status not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    break
+                self.breaker.record_failure()
+            
+            delay = backoff_delay(attempt)
+            if error is None:
+                # 429/503의 Retry-After(초)는 지켜서 재시도
+                retry_after = response_headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            
+            out_of_time = self._deadline is not None and time.monotonic() + delay >= self._deadline
+            if attempt + 1 >= RETRY_MAX_ATTEMPTS or out_of_time or self.breaker.state is not BreakerState.CLOSED:
+                if error is not None:
+                    raise error
+                break
+            
+            self.stats['retries'] += 1
+            reason = f"{type(error).__name__}: {error}" if error is not None else f"HTTP {status}"
+            logger.warning(
+                f"{method} {url} 실패 ({reason}) - "
+                f"{delay:.1f}초 후 재시도 ({attempt + 1}/{RETRY_MAX_ATTEMPTS - 1})"
+            )
+            await asyncio.sleep(delay)
+        
+        if cache_key:
+            if status == 304 and conditional:
+                self.stats['not_modified'] += 1
+                return 200, conditional[1]
+            
+            etag = response_headers.get('ETag')
+            last_modified = response_headers.get('Last-Modified')
+            if status == 200 and (etag or last_modified):
+                validators = {}
+                if etag:
+                    validators['If-None-Match'] = etag
+                if last_modified:
+                    validators['If-Modified-Since'] = last_modified
+                self._conditional_cache[cache_key] = (validators, body)
+            else:
+                self._conditional_cache.pop(cache_key, None)
+        
+        return status, body
+    
+    async def _initialize_session(self):
+        """CSRF 토큰 획득"""
         try:
-            # API 응답 구조 분석
-            if 'data' in api_data:
-                # 테마 목록에서 지정된 테마 찾기
-                theme_pk = None
-                for theme in api_data.get('data', []):
-                    if THEME_NAME in theme.get('title', ''):
-                        theme_pk = theme.get('PK')
-                        logger.info(f"'{THEME_NAME}' 테마 발견: PK={theme_pk}")
-                        break
+            status, html = await self._request('GET', RESERVATION_URL)
+            if status != 200:
+                logger.error(f"세션 초기화 실패: HTTP {status}")
+                self.csrf_token = None
+                return
+            
+            self.csrf_token = self._extract_csrf_token(html)
+            
+        except CircuitOpenError as e:
+            logger.debug(f"세션 초기화 생략: {e}")
+            self.csrf_token = None
+        except Exception as e:
+            logger.error(f"세션 초기화 실패: {e}")
+            self.csrf_token = None
+    
+    async def _refresh_csrf_token(self, rejected_token: Optional[str]):
+        """
+        거부된 CSRF 토큰 재발급
+        
+        여러 날짜가 동시에 거부당해도 한 번만 재발급하도록,
+        이미 다른 요청이 토큰을 갱신했으면 건너뜀
+        """
+        async with self._csrf_lock:
+            if self.csrf_token and self.csrf_token != rejected_token:
+                return
+            
+            logger.warning("CSRF 토큰이 거부되어 재발급합니다")
+            self.stats['csrf_refreshes'] += 1
+            await self._initialize_session()
+    
+    async def _post_theme_api(self, date: str) -> Tuple[int, bytes]:
+        """/reservation/theme API 호출 (CSRF 거부 시 토큰 재발급 후 1회 재시도)"""
+        api_url = f"{BASE_URL}/reservation/theme"
+        data = {
+            'reservationDate': date,
+            'name': '',
+            'phone': '',
+            'paymentType': '1'
+        }
+        
+        for attempt in range(2):
+            token = self.csrf_token
+            ajax_headers = {
+                'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+                'X-Requested-With': 'XMLHttpRequest',
+                'X-CSRF-TOKEN': token or '',
+                'Accept': 'application/json, text/javascript, */*; q=0.01'
+            }
+            
+            status, body = await self._request('POST', api_url, cache_key=f"api:{date}",
+                                               data=data, headers=ajax_headers)
+            
+            if status not in self.CSRF_REJECT_STATUSES or attempt > 0:
+                return status, body
+            
+            await self._refresh_csrf_token(token)
+        
+        return status, body
+    
+    async def _fetch_page(self, date: str) -> Optional[bytes]:
+        """날짜별 예약 페이지 원문 가져오기 (실패 시 None)"""
+        page_url = f"{RESERVATION_URL}?date={date}"
+        status, html = await self._request('GET', page_url, cache_key=f"page:{date}")
+        
+        if status != 200:
+            logger.error(f"[{date}] HTML 페이지 가져오기 실패: {status}")
+            return None
+        
+        return html
+    
+    def _has_open_candidate(self, api_data: Dict, date: str) -> bool:
+        """
+        감시 대상 테마 중 API가 예약 가능(reservation: false)이라고 한 미래 슬롯이 있는지 확인
+        
+        API가 매진이라고 하면 숨겨진 데이터와 상관없이 매진이므로,
+        후보가 없으면 HTML 페이지를 받을 필요가 없음
+        """
+        now_str = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        times = api_data.get('times', {})
+        
+        for theme in api_data.get('data', []):
+            title = theme.get('title', '')
+            if not any(theme_name in title for theme_name in self.theme_names):
+                continue
+            
+            for time_slot in times.get(str(theme.get('PK')), []):
+                time_str = time_slot.get('time', '')
+                # 같은 형식의 날짜/시간 문자열은 사전순 비교가 시간순 비교와 같음
+                if time_str and not time_slot.get('reservation', False) and f"{date} {time_str}" > now_str:
+                    return True
+        
+        return False
+    
+    def _parse_api_body(self, date: str, body: bytes) -> Optional[Dict]:
+        """API 응답 JSON 디코딩 (실패 시 None)"""
+        try:
+            api_data = json.loads(body)
+        except json.JSONDecodeError as e:
+            logger.error(f"[{date}] API JSON 파싱 오류: {e}")
+            logger.debug(f"API 응답 내용: {body[:500]!r}")
+            return None
+        
+        logger.info(f"[{date}] API 응답 성공: {len(body)} 바이트")
+        return api_data
+    
+    async def fetch_date_slots(self, date: str) -> Optional[List[Slot]]:
+        """
+        한 날짜의 감시 대상 테마 슬롯 목록 (실패 시 None)
+        
+        LAZY_HIDDEN_DATA가 켜져 있으면 API를 먼저 호출하고,
+        예약 가능 후보 슬롯이 있는 날짜만 HTML 페이지를 받아 숨겨진 데이터를 확인함.
+        API 본문과 숨겨진 데이터 텍스트의 다이제스트가 직전 사이클과 같으면
+        JSON 디코딩과 슬롯 추출을 건너뛰고 이전 결과를 재사용함
+        """
+        try:
+            cached = self._slot_cache.get(date)
+            html = None
+            api_data = None
+            
+            if not self.lazy_hidden_data:
+                # 1. HTML 페이지 (숨겨진 데이터 포함)
+                html = await self._fetch_page(date)
+                if html is None:
+                    return None
+            
+            # 2. API 데이터
+            status, api_body = await self._post_theme_api(date)
+            if status != 200:
+                logger.error(f"[{date}] API 호출 실패: {status}")
+                logger.debug(f"API 응답 내용: {api_body[:500]!r}")
+                return None
+            
+            api_digest = _digest(api_body)
+            
+            # 3. 지연 모드: 예약 가능 후보가 있을 때만 HTML 페이지 요청
+            if self.lazy_hidden_data:
+                if cached and cached.api_digest == api_digest:
+                    # API 응답이 같으면 페이지 필요 여부도 직전과 같음
+                    needs_page = cached.hidden_digest is not None
+                else:
+                    api_data = self._parse_api_body(date, api_body)
+                    if api_data is None:
+                        return None
+                    needs_page = self._has_open_candidate(api_data, date)
                 
-                if theme_pk and 'times' in api_data:
-                    # 해당 테마의 시간 슬롯 정보 가져오기
-                    theme_times = api_data['times'].get(str(theme_pk), [])
-                    
-                    logger.debug(f"=== {target_date} {THEME_NAME} 테마 슬롯 처리 ===")
-                    logger.debug(f"총 슬롯 수: {len(theme_times)}")
-                    logger.debug(f"숨겨진 데이터 키: {list(hidden_data.keys())}")
-                    
-                    for i, time_slot in enumerate(theme_times):
-                        time_str = time_slot.get('time', '')
-                        api_reservation = time_slot.get('reservation', False)
-                        
-                        if time_str:
-                            slot_key = f"{target_date} {time_str}"
-                            
-                            # **핵심 로직**: API 데이터와 숨겨진 데이터 조합
-                            is_available = self._is_really_available(
-                                theme_pk, time_str, target_date, 
-                                hidden_data, api_reservation
-                            )
-                            
-                            slot_status = "예약가능" if is_available else "매진"
-                            slots[slot_key] = slot_status
-                            
-                            logger.debug(f"  슬롯 {i+1}: {time_str} = {slot_status}")
-                            
-                    logger.info(f"'{THEME_NAME}' 슬롯 {len(slots)}개 추출 완료")
+                if needs_page:
+                    html = await self._fetch_page(date)
+                    if html is None:
+                        return None
                 else:
-                    logger.warning(f"'{THEME_NAME}' 테마를 찾을 수 없습니다")
+                    logger.debug(f"[{date}] 예약 가능 후보 없음 - HTML 페이지 생략")
+                    self.stats['pages_skipped'] += 1
+            
+            # 4. 다이제스트 비교 - 둘 다 같으면 파싱 없이 캐시 사용
+            hidden_digest = None
+            if html is not None:
+                hidden_text = find_hidden_data_text(html)
+                hidden_digest = _digest(hidden_text.encode('utf-8') if hidden_text is not None else html)
+            
+            if cached and cached.api_digest == api_digest and cached.hidden_digest == hidden_digest:
+                self.stats['cache_hits'] += 1
+                return cached.slots
+            
+            self.stats['cache_misses'] += 1
             
+            if api_data is None:
+                api_data = self._parse_api_body(date, api_body)
+                if api_data is None:
+                    return None
+            
+            hidden_data = self._extract_hidden_data(html) if html is not None else {}
+            slots = self.extract_date_slots(api_data, hidden_data, date, self.theme_names)
+            
+            self._slot_cache[date] = _SlotCacheEntry(api_digest, hidden_digest, slots)
+            return slots
+            
+        except CircuitOpenError:
+            logger.debug(f"[{date}] 서킷 브레이커 열림 - 요청 생략")
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"[{date}] 네트워크 오류: {e!r}")
+            return None
         except Exception as e:
-            logger.error(f"슬롯 추출 중 오류: {e}")
+            logger.error(f"[{date}] 예상치 못한 오류: {e}")
+            return None
+    
+    async def fetch_dates(self, dates: List[str],
+                          deadline: Optional[float] = None) -> Dict[str, Optional[List[Slot]]]:
+        """
+        여러 날짜를 동시 실행 수 상한 내에서 한꺼번에 가져오기
+        
+        Args:
+            dates: YYYY-MM-DD 형식의 날짜 리스트
+            deadline: 이번 사이클에 쓸 수 있는 시간 (초, 재시도 대기가 이 시간을 넘지 않음)
             
-        return slots
+        Returns:
+            dict: {날짜: 슬롯 리스트 또는 None(실패)}
+        """
+        await self.open()
+        before = dict(self.stats)
+        self._prune_caches()
+        self._deadline = time.monotonic() + deadline if deadline else None
+        
+        # CSRF 토큰은 세션 최초 1회만 획득하고, 이후에는 서버가 거부할 때만 재발급
+        if not self.csrf_token:
+            async with self._csrf_lock:
+                if not self.csrf_token:
+                    await self._initialize_session()
+            if not self.csrf_token:
+                if self.breaker.state is BreakerState.OPEN:
+                    logger.warning(f"🧯 서킷 브레이커 열림 - 이번 사이클 생략 ({self.breaker.retry_in():.0f}초 후 시험 요청)")
+                else:
+                    logger.error("CSRF 토큰을 가져올 수 없습니다")
+                return {date: None for date in dates}
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch_one(date: str) -> Optional[List[Slot]]:
+            async with semaphore:
+                return await self.fetch_date_slots(date)
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch_one(date) for date in dates))
+        elapsed = time.perf_counter() - started
+        self.stats['cycles'] += 1
+        
+        failed = sum(1 for r in results if r is None)
+        logger.info(f"{len(dates)}개 날짜 동시 수집 완료: {elapsed:.2f}초 (실패 {failed}개, 동시 실행 {self.concurrency})")
+        logger.info(
+            f"🔌 연결 재사용 {self.stats['connections_reused'] - before['connections_reused']}회, "
+            f"신규 연결 {self.stats['connections_new'] - before['connections_new']}회, "
+            f"CSRF 재발급 {self.stats['csrf_refreshes'] - before['csrf_refreshes']}회"
+        )
+        logger.info(
+            f"📦 요청 {self.stats['requests'] - before['requests']}회, "
+            f"수신 {(self.stats['bytes'] - before['bytes']) / 1024:.1f} KB, "
+            f"HTML 페이지 생략 {self.stats['pages_skipped'] - before['pages_skipped']}개"
+        )
+        logger.info(
+            f"🗂️ 파싱 캐시 적중 {self.stats['cache_hits'] - before['cache_hits']}회, "
+            f"미스 {self.stats['cache_misses'] - before['cache_misses']}회, "
+            f"304 응답 {self.stats['not_modified'] - before['not_modified']}회"
+        )
+        retries = self.stats['retries'] - before['retries']
+        if retries:
+            logger.warning(f"🔁 재시도 {retries}회 (서킷 브레이커: {self.breaker.state.label})")
+        rejected = self.stats['breaker_rejected'] - before['breaker_rejected']
+        if rejected:
+            logger.warning(
+                f"🧯 서킷 브레이커 열림 - 요청 {rejected}회 생략 "
+                f"({self.breaker.retry_in():.0f}초 후 시험 요청)"
+            )
+        rate_limited = self.stats['rate_limited'] - before['rate_limited']
+        if rate_limited:
+            logger.info(
+                f"🚦 속도 제한 대기 {rate_limited}회, "
+                f"합계 {(self.stats['rate_wait_ms'] - before['rate_wait_ms']) / 1000:.2f}초"
+            )
+        
+        return dict(zip(dates, results))
+    
+    def _prune_caches(self):
+        """지난 날짜의 캐시 항목 정리"""
+        today = dt.date.today().strftime("%Y-%m-%d")
+        for date in [d for d in self._slot_cache if d < today]:
+            del self._slot_cache[date]
+        for key in [k for k in self._conditional_cache if k.split(':', 1)[1] < today]:
+            del self._conditional_cache[key]
+    
+    # --- 장기 실행 모드 (동기 코드에서 사용) ---
+    
+    def start(self):
+        """전용 백그라운드 이벤트 루프 시작 (세션은 첫 수집 때 생성되어 계속 유지)"""
+        if self._runtime is None:
+            self._runtime = BackgroundLoop(name="zeroworld-fetcher")
+        self._runtime.start()
+    
+    def fetch_dates_blocking(self, dates: List[str],
+                             deadline: Optional[float] = None) -> Dict[str, Optional[List[Slot]]]:
+        """동기 코드에서 백그라운드 루프의 fetch_dates 실행"""
+        self.start()
+        return self._runtime.run(self.fetch_dates(dates, deadline))
+    
+    def get_stats(self) -> Dict[str, int]:
+        """누적 연결/세션 통계"""
+        return dict(self.stats)
+    
+    def shutdown(self):
+        """세션 종료 후 백그라운드 루프 중지"""
+        if self._runtime is None or not self._runtime.running:
+            return
+        
+        try:
+            self._runtime.run(self.close(), timeout=5)
+        except Exception as e:
+            logger.error(f"fetcher 세션 종료 실패: {e}")
+        
+        self._runtime.stop()
+        logger.info(f"🔌 fetcher 종료 - 누적 통계: {self.get_stats()}")
+
+
+def get_date_range() -> List[str]:
+    """DATE_START ~ DATE_END 범위의 날짜 문자열 리스트"""
+    start_date = dt.datetime.strptime(DATE_START, "%Y-%m-%d").date()
+    end_date = dt.datetime.strptime(DATE_END, "%Y-%m-%d").date()
+    
+    dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        dates.append(current_date.strftime("%Y-%m-%d"))
+        current_date += dt.timedelta(days=1)
+    return dates
+
+
+def _filter_past_slots(date_str: str, date_slots: List[Slot], now_epoch: float) -> List[Slot]:
+    """현재 시간보다 미래인 슬롯만 남기기"""
+    filtered_slots = [slot for slot in date_slots if slot.epoch > now_epoch]
+    
+    filtered_count = len(date_slots) - len(filtered_slots)
+    if filtered_count > 0:
+        logger.info(f"날짜 {date_str}: {filtered_count}개 과거 슬롯 제외됨")
+    
+    return filtered_slots
+
+
+async def _fetch_all_dates(dates: List[str], deadline: Optional[float] = None) -> Dict[str, Optional[List[Slot]]]:
+    """일회용 비동기 fetcher로 전체 날짜 수집"""
+    async with AsyncZeroworldFetcher() as fetcher:
+        return await fetcher.fetch_dates(dates, deadline)
 
 
-def get_slots(exclude_past_slots: bool = True) -> Dict[str, str]:
+def get_slots_by_date(dates: Optional[List[str]] = None,
+                      exclude_past_slots: bool = True,
+                      fetcher: Optional[AsyncZeroworldFetcher] = None,
+                      deadline: Optional[float] = None) -> Dict[str, Optional[List[Slot]]]:
     """
-    날짜 범위 내 지정된 테마의 모든 슬롯 상태 반환 (숨겨진 데이터 포함)
+    지정한 날짜들의 감시 대상 테마 슬롯 목록을 날짜별로 반환
     
     Args:
+        dates: 확인할 날짜 목록 (없으면 DATE_START ~ DATE_END 전체)
         exclude_past_slots: True면 현재 시간보다 과거인 슬롯 제외
+        fetcher: 재사용할 장기 실행 fetcher (없으면 일회용 세션 사용)
+        deadline: 수집에 쓸 수 있는 시간 (초, 재시도 대기가 이 시간을 넘지 않음)
     
     Returns:
-        dict: {"2025-01-29 18:30": "예약가능", ...}
+        dict: {"2025-01-29": [Slot, ...], ...} (수집 실패한 날짜는 None,
+              Slot.theme_id는 fetcher.theme_names 또는 THEME_NAMES의 인덱스)
     """
-    fetcher = ZeroworldFetcher()
-    all_slots = {}
-    
     # 현재 시간 (시간 필터링용)
     now = dt.datetime.now()
+    now_epoch = now.timestamp()
     logger.info(f"현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # 날짜 범위 생성
-    start_date = dt.datetime.strptime(DATE_START, "%Y-%m-%d").date()
-    end_date = dt.datetime.strptime(DATE_END, "%Y-%m-%d").date()
+    if dates is None:
+        dates = get_date_range()
+    if fetcher is not None:
+        results = fetcher.fetch_dates_blocking(dates, deadline)
+    else:
+        results = asyncio.run(_fetch_all_dates(dates, deadline))
     
-    current_date = start_date
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y-%m-%d")
-        logger.info(f"날짜 {date_str} 처리 중...")
+    date_results = {}
+    for date_str in dates:
+        date_slots = results.get(date_str)
         
-        # 해당 날짜의 테마 데이터와 숨겨진 데이터 가져오기
-        result = fetcher.get_theme_data(date_str)
-        
-        if result:
-            api_data, hidden_data = result
-            # 슬롯 정보 추출 (API + 숨겨진 데이터 조합)
-            date_slots = fetcher.extract_slots_from_data(api_data, hidden_data, date_str)
-            
-            # 시간 필터링 적용
-            if exclude_past_slots:
-                filtered_slots = {}
-                filtered_count = 0
-                
-                for slot_key, slot_status in date_slots.items():
-                    try:
-                        # 슬롯 시간 파싱
-                        slot_datetime = dt.datetime.strptime(slot_key, "%Y-%m-%d %H:%M:%S")
-                        
-                        # 현재 시간보다 미래인 슬롯만 포함
-                        if slot_datetime > now:
-                            filtered_slots[slot_key] = slot_status
-                        else:
-                            filtered_count += 1
-                            logger.debug(f"과거 슬롯 제외: {slot_key}")
-                            
-                    except ValueError as e:
-                        logger.warning(f"슬롯 시간 파싱 실패: {slot_key}, 오류: {e}")
-                        # 파싱 실패시 포함 (안전장치)
-                        filtered_slots[slot_key] = slot_status
-                
-                if filtered_count > 0:
-                    logger.info(f"날짜 {date_str}: {filtered_count}개 과거 슬롯 제외됨")
-                
-                all_slots.update(filtered_slots)
-            else:
-                all_slots.update(date_slots)
-        else:
+        if date_slots is None:
             logger.warning(f"날짜 {date_str}의 데이터를 가져올 수 없습니다")
+            date_results[date_str] = None
+            continue
         
-        current_date += dt.timedelta(days=1)
+        if exclude_past_slots:
+            # 시간 필터링 적용
+            date_slots = _filter_past_slots(date_str, date_slots, now_epoch)
+        date_results[date_str] = date_slots
+    
+    return date_results
+
+
+def merge_date_slots(date_results: Dict[str, Optional[List[Slot]]]) -> List[Slot]:
+    """날짜별 결과를 슬롯 리스트 하나로 합치기 (수집 실패한 날짜는 제외)"""
+    all_slots: List[Slot] = []
+    for date_slots in date_results.values():
+        if date_slots is not None:
+            all_slots.extend(date_slots)
+    return all_slots
+
+
+def get_theme_slots(exclude_past_slots: bool = True,
+                    fetcher: Optional[AsyncZeroworldFetcher] = None) -> ThemeSlots:
+    """
+    날짜 범위 내 감시 대상 테마(THEME_NAMES) 전체의 슬롯 상태 반환 (숨겨진 데이터 포함)
+    
+    모든 날짜를 FETCH_CONCURRENCY 상한 내에서 동시에 가져오고,
+    날짜별 API 응답 하나에서 모든 테마를 한 번에 추출함
     
-    total_slots = len(all_slots)
-    available_slots = len([s for s in all_slots.values() if s == "예약가능"])
+    Args:
+        exclude_past_slots: True면 현재 시간보다 과거인 슬롯 제외
+        fetcher: 재사용할 장기 실행 fetcher (없으면 일회용 세션 사용)
+    
+    Returns:
+        dict: {"층간소음": {"2025-01-29 18:30:00": "예약가능", ...}, ...}
+    """
+    theme_names = fetcher.theme_names if fetcher is not None else THEME_NAMES
+    date_results = get_slots_by_date(exclude_past_slots=exclude_past_slots, fetcher=fetcher)
+    all_slots = to_theme_map(merge_date_slots(date_results), theme_names)
     
-    logger.info(f"총 {total_slots}개 슬롯 정보 수집 완료 (예약가능: {available_slots}개)")
+    for theme_name, slots in all_slots.items():
+        available_slots = len([s for s in slots.values() if s == "예약가능"])
+        logger.info(f"'{theme_name}' 총 {len(slots)}개 슬롯 정보 수집 완료 (예약가능: {available_slots}개)")
     if exclude_past_slots:
         logger.info("⏰ 과거 슬롯 제외 필터링 적용됨")
     
     return all_slots
 
 
+def get_slots(exclude_past_slots: bool = True,
+              fetcher: Optional[AsyncZeroworldFetcher] = None) -> Dict[str, str]:
+    """
+    날짜 범위 내 첫 번째 감시 대상 테마의 모든 슬롯 상태 반환 (숨겨진 데이터 포함)
+    
+    Args:
+        exclude_past_slots: True면 현재 시간보다 과거인 슬롯 제외
+        fetcher: 재사용할 장기 실행 fetcher (없으면 일회용 세션 사용)
+    
+    Returns:
+        dict: {"2025-01-29 18:30": "예약가능", ...}
+    """
+    theme_slots = get_theme_slots(exclude_past_slots, fetcher)
+    return next(iter(theme_slots.values()), {})
+
+
 if __name__ == "__main__":
     # 테스트 실행
     logger.info("제로월드 예약 정보 스크래핑 테스트 시작 (숨겨진 데이터 포함)")
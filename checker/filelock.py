@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 파일 잠금 모듈
+
+같은 호스트에서 체커 프로세스 여러 개(테마별 워커, 데몬 옆의 --once 등)가
+상태 파일을 함께 쓸 때 기록 구간이 겹치지 않도록 잠금 파일에 권고 잠금을 건다.
+POSIX는 fcntl.flock, Windows는 msvcrt.locking을 사용.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class FileLockTimeout(Exception):
+    """정해진 시간 안에 파일 잠금을 얻지 못함"""
+
+
+class FileLock:
+    """
+    잠금 파일 기반 배타적 권고 잠금 (with 문으로 사용)
+
+    같은 프로세스 안의 스레드끼리는 보호하지 않으므로 호출자가 threading 잠금과 함께 써야 함.
+    잠금 파일은 지우지 않고 재사용함 (지우면 다른 프로세스가 다른 파일을 잠글 수 있음).
+    """
+
+    def __init__(self, path: Path, timeout: float = 30.0, poll_interval: float = 0.01):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+        # 통계 (누적)
+        self.stats = {'acquired': 0, 'contended': 0, 'wait_total': 0.0}
+
+    @property
+    def supported(self) -> bool:
+        return fcntl is not None or msvcrt is not None
+
+    def _try_lock(self, fd: int) -> bool:
+        """잠금을 한 번 시도 (얻으면 True)"""
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        """잠금을 얻을 때까지 대기 (timeout을 넘기면 FileLockTimeout)"""
+        if not self.supported:
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        started = time.monotonic()
+        contended = False
+        while not self._try_lock(fd):
+            contended = True
+            if time.monotonic() - started >= self.timeout:
+                os.close(fd)
+                raise FileLockTimeout(f"{self.timeout:.0f}초 안에 잠금을 얻지 못함: {self.path}")
+            time.sleep(self.poll_interval)
+
+        self._fd = fd
+        self.stats['acquired'] += 1
+        if contended:
+            waited = time.monotonic() - started
+            self.stats['contended'] += 1
+            self.stats['wait_total'] += waited
+            logger.debug(f"🔒 파일 잠금 대기 {waited * 1000:.0f}ms: {self.path}")
+
+    def release(self):
+        """잠금 해제"""
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 자식 프로세스가 잠금을 1초 잡고 있는 동안 부모가 기다리는지 확인
+    import tempfile
+    import multiprocessing
+
+    def hold(path: str):
+        with FileLock(Path(path)):
+            time.sleep(1)
+
+    lock_path = Path(tempfile.gettempdir()) / 'zeroworld-filelock-test.lock'
+    child = multiprocessing.Process(target=hold, args=(str(lock_path),))
+    child.start()
+    time.sleep(0.2)
+
+    lock = FileLock(lock_path)
+    started = time.monotonic()
+    with lock:
+        print(f"잠금 획득까지 {time.monotonic() - started:.2f}초 대기 (약 0.8초 예상), 통계: {lock.stats}")
+    child.join()
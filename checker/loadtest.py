@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+종단간 부하 테스트 모듈
+
+지점(N) x 테마(M) x 날짜(D) 규모의 예약 데이터를 만들어 내는 로컬 스텁 사이트를 띄우고,
+실제 ZeroworldChecker.check_slots 사이클을 그 스텁에 대해 반복 실행해
+사이클 소요 시간, 사이클당 요청 수, CPU 시간, RSS, 놓친 체크 주기 수를 표로 출력한다.
+
+스텁은 별도 프로세스에서 실행되므로 CPU/RSS는 체커 프로세스만의 값이다.
+체커는 한 사이트(BASE_URL)만 감시하므로 지점은 같은 테마 API 응답 안의
+"N호점 테마M" 테마로 표현한다 (지점이 늘면 감시 테마와 응답 크기가 함께 늘어남).
+
+사용법:
+    python -m checker.loadtest --stores 1 2 --themes 4 8 --dates 7 30 --cycles 5 --interval 10
+    python -m checker.loadtest --dates 60 --latency 0.3 --jitter 0.1 --payload-kb 120 --output v1.json
+"""
+
+import os
+import sys
+import json
+import html
+import time
+import random
+import socket
+import asyncio
+import argparse
+import itertools
+import tempfile
+import datetime as dt
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from aiohttp import web
+from loguru import logger
+
+STUB_CSRF_TOKEN = "LoadTestCsrfToken0123456789abcdefghijklmn"
+
+
+# --- 스텁 사이트 ---
+
+class StubSite:
+    """
+    지점 x 테마 x 날짜 규모의 합성 예약 사이트
+
+    날짜별로 열린 슬롯 집합을 들고 있고, API 요청마다 churn 비율만큼 슬롯 상태를 뒤집어
+    매 사이클 일부 날짜가 바뀌도록 함 (페이지의 숨겨진 데이터도 같은 상태로 생성)
+    """
+
+    def __init__(self, stores: int, themes: int, dates: List[str], slots: int = 10,
+                 latency: float = 0.1, jitter: float = 0.0, payload_kb: int = 60,
+                 churn: float = 0.02, seed: Optional[int] = None):
+        self.titles = [f"{s}호점 테마{t}" for s in range(1, stores + 1) for t in range(1, themes + 1)]
+        self.dates = set(dates)
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_kb = payload_kb
+        self.churn = churn
+        self._random = random.Random(seed)
+
+        # 09:00부터 하루에 들어가도록 간격을 맞춘 시각 목록
+        step = min(75, (15 * 60) // max(slots, 1))
+        self.times = [f"{(540 + i * step) // 60:02d}:{(540 + i * step) % 60:02d}:00" for i in range(slots)]
+
+        # 날짜별 열린 슬롯 {(PK, 시각 인덱스)} (초기에는 4개 중 1개꼴로 열림)
+        self._open = {
+            date: {
+                (pk, i) for pk in range(1, len(self.titles) + 1) for i in range(slots)
+                if (pk + i + index) % 4 == 0
+            }
+            for index, date in enumerate(sorted(self.dates))
+        }
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/reservation', self.handle_page)
+        app.router.add_post('/reservation/theme', self.handle_theme_api)
+        return app
+
+    async def _delay(self):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _churn(self, date: str):
+        """churn 비율만큼 슬롯 열림/닫힘 뒤집기"""
+        opened = self._open.get(date)
+        if opened is None or not self.churn:
+            return
+        for pk in range(1, len(self.titles) + 1):
+            for i in range(len(self.times)):
+                if self._random.random() < self.churn:
+                    opened.symmetric_difference_update({(pk, i)})
+
+    def _reserved_epochs(self, date: str) -> Dict[str, Dict[str, int]]:
+        opened = self._open.get(date, set())
+        year, month, day = map(int, date.split('-'))
+        other = {}
+        for pk in range(1, len(self.titles) + 1):
+            reserved = {}
+            for i, time_str in enumerate(self.times):
+                if (pk, i) not in opened:
+                    hours, minutes, _ = map(int, time_str.split(':'))
+                    epoch = int(time.mktime((year, month, day, hours, minutes, 0, 0, 0, -1)))
+                    reserved[str(epoch)] = 1
+            other[str(pk)] = reserved
+        return {'other': other}
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        await self._delay()
+        date = request.query.get('date') or min(self.dates)
+        hidden = html.escape(json.dumps(self._reserved_epochs(date)))
+        head = (
+            '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+            f'<meta name="csrf-token" content="{STUB_CSRF_TOKEN}"><title>부하 테스트 스텁</title></head><body>'
+        )
+        tail = f'<div id="reservationHiddenData" style="display:none">{hidden}</div></body></html>'
+        # 실제 페이지 크기에 맞춰 본문 채우기
+        padding = max(0, self.payload_kb * 1024 - len(head) - len(tail))
+        filler = '<p class="notice">예약 안내</p>' * (padding // 40)
+        return web.Response(text=head + filler + tail, content_type='text/html')
+
+    async def handle_theme_api(self, request: web.Request) -> web.Response:
+        await self._delay()
+        form = await request.post()
+        if request.headers.get('X-CSRF-TOKEN') != STUB_CSRF_TOKEN:
+            return web.Response(status=419, text="CSRF token mismatch")
+
+        date = form.get('reservationDate')
+        if date not in self.dates:
+            return web.json_response({'data': [], 'times': {}})
+
+        self._churn(date)
+        opened = self._open[date]
+        payload = {
+            'data': [{'PK': pk, 'title': title} for pk, title in enumerate(self.titles, 1)],
+            'times': {
+                str(pk): [
+                    {'time': time_str, 'reservation': (pk, i) not in opened}
+                    for i, time_str in enumerate(self.times)
+                ]
+                for pk in range(1, len(self.titles) + 1)
+            }
+        }
+        return web.json_response(payload)
+
+
+def run_stub(host: str, port: int, options: Dict[str, Any]):
+    """스텁 사이트 실행 (별도 프로세스 진입점)"""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    site = StubSite(**options)
+    web.run_app(site.build_app(), host=host, port=port, print=None, handle_signals=True)
+
+
+def _wait_for_port(host: str, port: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"스텁 사이트가 시작되지 않았습니다: {host}:{port}")
+
+
+# --- 측정 ---
+
+def _rss_mib() -> float:
+    """현재 프로세스 RSS (MiB, /proc이 없으면 최대 RSS)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KiB 단위
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def run_scenario(stores: int, themes: int, dates: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    시나리오 하나 실행: 스텁 기동 → 체커 생성 → check_slots 사이클 반복
+
+    사이클은 interval 간격의 고정 틱에 맞춰 시작하고, 한 사이클이 다음 틱을 넘기면
+    넘긴 틱 수만큼 놓친 주기로 셈 (APScheduler coalesce와 같은 동작)
+    """
+    from . import fetch, state
+    from . import main as checker_main
+
+    today = dt.date.today()
+    date_list = [(today + dt.timedelta(days=d)).strftime("%Y-%m-%d") for d in range(dates)]
+    theme_names = [f"{s}호점 테마{t}" for s in range(1, stores + 1) for t in range(1, themes + 1)]
+
+    stub = multiprocessing.get_context('spawn').Process(
+        target=run_stub,
+        args=(args.host, args.port, {
+            'stores': stores, 'themes': themes, 'dates': date_list, 'slots': args.slots,
+            'latency': args.latency, 'jitter': args.jitter, 'payload_kb': args.payload_kb,
+            'churn': args.churn, 'seed': args.seed
+        }),
+        daemon=True
+    )
+    stub.start()
+    temp_dir = tempfile.TemporaryDirectory()
+    checker = None
+    try:
+        _wait_for_port(args.host, args.port)
+
+        fetch.DATE_START, fetch.DATE_END = date_list[0], date_list[-1]
+        state._state_manager = state.StateManager(Path(temp_dir.name) / 'state.json')
+
+        checker = checker_main.ZeroworldChecker()
+        checker.fetcher = fetch.AsyncZeroworldFetcher(theme_names=theme_names)
+        # 운영 시간과 무관하게 측정
+        checker._should_run_now = lambda: True
+
+        # ZeroworldChecker가 로거를 다시 설정하므로 생성 후 경고 이상만 집계
+        warnings = {'count': 0}
+
+        def count_warnings(message):
+            if message.record['name'].startswith('checker.'):
+                warnings['count'] += 1
+
+        logger.remove()
+        logger.add(count_warnings, level="WARNING")
+        if args.verbose:
+            logger.add(sys.stderr, level="INFO")
+
+        durations, requests, cpu = [], [], []
+        rss_peak = _rss_mib()
+        missed = 0
+        next_tick = time.monotonic()
+
+        for _ in range(args.cycles):
+            now = time.monotonic()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+
+            requests_before = checker.fetcher.get_stats()['requests']
+            cpu_before = time.process_time()
+            started = time.monotonic()
+
+            checker.check_slots()
+
+            ended = time.monotonic()
+            durations.append(ended - started)
+            cpu.append(time.process_time() - cpu_before)
+            requests.append(checker.fetcher.get_stats()['requests'] - requests_before)
+            rss_peak = max(rss_peak, _rss_mib())
+
+            ticks = int((ended - next_tick) // args.interval) + 1
+            missed += ticks - 1
+            next_tick += ticks * args.interval
+
+        total_slots = len(theme_names) * dates * args.slots
+        return {
+            'stores': stores,
+            'themes': len(theme_names),
+            'dates': dates,
+            'slots': total_slots,
+            'first s': durations[0],
+            'mean s': sum(durations) / len(durations),
+            'p95 s': _percentile(durations, 0.95),
+            'max s': max(durations),
+            'req/cycle': sum(requests) / len(requests),
+            'cpu ms/cycle': sum(cpu) / len(cpu) * 1000,
+            'rss MiB': rss_peak,
+            'missed': missed,
+            'warnings': warnings['count']
+        }
+    finally:
+        if checker is not None:
+            checker.fetcher.shutdown()
+            checker.state_manager.flush()
+        stub.terminate()
+        stub.join(timeout=5)
+        temp_dir.cleanup()
+
+
+def main():
+    """부하 테스트 실행"""
+    parser = argparse.ArgumentParser(description='제로월드 체커 종단간 부하 테스트')
+    parser.add_argument('--stores', type=int, nargs='+', default=[1], help='지점 수 (여러 값이면 조합별 실행)')
+    parser.add_argument('--themes', type=int, nargs='+', default=[4], help='지점당 테마 수')
+    parser.add_argument('--dates', type=int, nargs='+', default=[14], help='확인할 날짜 수')
+    parser.add_argument('--slots', type=int, default=10, help='테마당 하루 슬롯 수')
+    parser.add_argument('--cycles', type=int, default=5, help='시나리오별 체크 사이클 수')
+    parser.add_argument('--interval', type=float, default=10, help='체크 간격 (초, 놓친 주기 계산용)')
+    parser.add_argument('--latency', type=float, default=0.1, help='스텁 응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='스텁 추가 무작위 지연 상한 (초)')
+    parser.add_argument('--payload-kb', type=int, default=60, help='예약 페이지 크기 (KiB)')
+    parser.add_argument('--churn', type=float, default=0.02, help='API 요청마다 상태가 뒤집히는 슬롯 비율')
+    parser.add_argument('--seed', type=int, default=None, help='스텁 지연/상태 변화 난수 시드')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--output', help='결과를 JSON으로 저장 (버전 간 비교용)')
+    parser.add_argument('--verbose', action='store_true', help='체커 INFO 로그 출력')
+    args = parser.parse_args()
+
+    # 체커 모듈을 불러오기 전에 스텁 주소 지정
+    os.environ['ZEROWORLD_BASE_URL'] = f"http://{args.host}:{args.port}"
+    os.environ.pop('CAPTURE_DIR', None)
+
+    from . import main as checker_main
+    from .bench import print_table
+
+    # 측정 중 실제 텔레그램 전송 방지 (전송 건수만 집계)
+    sent = {'count': 0}
+
+    def count_notification(new_slots, theme_name=None, reminder=False) -> bool:
+        sent['count'] += 1
+        return True
+
+    checker_main.send_notification = count_notification
+
+    rows = []
+    for stores, themes, dates in itertools.product(sorted(args.stores), sorted(args.themes), sorted(args.dates)):
+        sent['count'] = 0
+        row = run_scenario(stores, themes, dates, args)
+        row['alerts'] = sent['count']
+        rows.append(row)
+        print(f"✅ 지점 {stores} x 테마 {themes} x 날짜 {dates}: 평균 {row['mean s']:.2f}초", file=sys.stderr)
+
+    print_table(
+        f"부하 테스트 ({args.cycles}사이클, 간격 {args.interval}초, 지연 {args.latency}+{args.jitter}초, "
+        f"페이지 {args.payload_kb} KiB, churn {args.churn})",
+        rows
+    )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'rows': rows}, f, indent=2, ensure_ascii=False)
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,24 +8,33 @@
 
 import sys
 import signal
+import math
 import time
 import zoneinfo
 import asyncio
 import threading
+from collections import deque
 from datetime import datetime, timedelta
+from typing import List, Optional
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
 from loguru import logger
 
 from .config import (
-    RUN_HOURS, TIMEZONE, CHECK_INTERVAL_MINUTES,
+    RUN_HOURS, TIMEZONE, CHECK_INTERVAL_SECONDS, CHECK_INTERVAL_JITTER_SECONDS,
+    ADAPTIVE_INTERVAL_RATIO, MAX_CHECK_INTERVAL_SECONDS, CADENCE_WINDOW,
     LOG_FILE, LOG_ROTATION, LOG_RETENTION, LOG_LEVEL,
-    DATE_START, DATE_END, THEME_NAME
+    DATE_START, DATE_END, THEME_NAMES, POLL_MODE, PRIORITY_TICK_SECONDS, BURST_INTERVAL_SECONDS
+)
+from .fetch import get_theme_slots, get_slots_by_date, get_date_range, merge_date_slots, AsyncZeroworldFetcher
+from .models import to_theme_map
+from .scheduler import DatePollScheduler
+from .state import get_state_manager, update_theme_slots
+from .notifier import (
+    send_notification, send_error_notification, test_telegram_connection, get_bot_handler, test_bot_polling,
+    shutdown_notifier
 )
-from .fetch import get_slots
-from .state import get_state_manager, find_new_available_slots, update_slots
-from .notifier import send_notification, send_error_notification, test_telegram_connection, get_bot_handler, test_bot_polling
 
 
 class ZeroworldChecker:
@@ -34,12 +43,22 @@ class ZeroworldChecker:
     def __init__(self):
         self.scheduler = BlockingScheduler(timezone=TIMEZONE)
         self.state_manager = get_state_manager()
+        # 사이클 간 연결 풀/쿠키/CSRF 토큰을 재사용하는 장기 실행 fetcher
+        self.fetcher = AsyncZeroworldFetcher()
+        # 날짜별 다음 확인 시각과 분당 요청 예산 관리 (POLL_MODE="priority")
+        self.poll_scheduler = DatePollScheduler()
+        # 전체 확인과 버스트 확인이 동시에 상태를 고치지 않도록 직렬화
+        self._check_lock = threading.Lock()
         self.running = False
         self.check_count = 0
         self.last_success_time = None
         self.error_count = 0
         self.start_time = None  # 모니터링 시작 시간
         
+        # 현재 적용 중인 체크 간격 (사이클이 길어지면 자동으로 늘어남)
+        self.check_interval = CHECK_INTERVAL_SECONDS
+        self._cycle_starts = deque(maxlen=CADENCE_WINDOW)
+        
         # 텔레그램 봇 핸들러 설정
         self.bot_handler = get_bot_handler()
         if self.bot_handler:
@@ -119,8 +138,14 @@ class ZeroworldChecker:
         
         return True
     
-    def check_slots(self):
-        """슬롯 체크 및 알림 메인 로직"""
+    def check_slots(self, dates: Optional[List[str]] = None, burst: bool = False):
+        """
+        슬롯 체크 및 알림 메인 로직
+        
+        Args:
+            dates: 확인할 날짜 목록 (없으면 모니터링 기간 전체)
+            burst: 전체 확인 모드의 버스트 재확인이면 True (요청 수를 버스트 예산에 기록)
+        """
         try:
             self.check_count += 1
             logger.info(f"=== 슬롯 체크 시작 ({self.check_count}회차) ===")
@@ -130,42 +155,90 @@ class ZeroworldChecker:
                 logger.info("운영 시간이 아니므로 체크를 건너뜁니다")
                 return
             
-            # 1. 현재 슬롯 상태 가져오기
-            logger.info(f"'{THEME_NAME}' 슬롯 정보 수집 중...")
-            current_slots = get_slots()
+            # 1. 현재 슬롯 상태 가져오기 (감시 대상 테마 전체를 한 번에)
+            logger.info(f"{', '.join(THEME_NAMES)} 슬롯 정보 수집 중...")
+            requests_before = self.fetcher.get_stats()['requests']
+            # 재시도 대기는 다음 체크 전에 끝나도록 체크 간격 안에서만 허용
+            date_results = get_slots_by_date(
+                dates, fetcher=self.fetcher, deadline=self.check_interval * ADAPTIVE_INTERVAL_RATIO
+            )
+            fetched = {date: slots for date, slots in date_results.items() if slots is not None}
+            self.poll_scheduler.record_cost(
+                self.fetcher.get_stats()['requests'] - requests_before, len(date_results), burst=burst
+            )
+            
+            # 수집 실패한 날짜는 다음 확인 시각만 다시 잡고, 상태는 마지막으로 알던 슬롯 유지
+            failed_dates = [date for date in date_results if date not in fetched]
+            for date in failed_dates:
+                self.poll_scheduler.record_result(date, changed=False)
             
-            if not current_slots:
+            if not fetched:
                 logger.warning("슬롯 정보를 가져올 수 없습니다")
+                update_theme_slots({}, dates=[], failed_dates=failed_dates)
                 return
+            if failed_dates:
+                logger.warning(f"수집 실패 {len(failed_dates)}개 날짜는 이전 상태 유지: {', '.join(failed_dates)}")
             
-            logger.info(f"총 {len(current_slots)}개 슬롯 정보 수집 완료")
-            
-            # 2. 예약 가능한 슬롯 개수 확인
-            available_count = len([s for s in current_slots.values() if s == "예약가능"])
-            reserved_count = len(current_slots) - available_count
+            theme_names = self.fetcher.theme_names
+            current_slots = merge_date_slots(fetched)
             
-            logger.info(f"예약 가능: {available_count}개, 매진: {reserved_count}개")
+            slots_by_theme = [[] for _ in theme_names]
+            for slot in current_slots:
+                slots_by_theme[slot.theme_id].append(slot)
             
-            # 3. 현재 예약 가능한 모든 슬롯 찾기 (항상 알림)
-            available_slots = [slot for slot, status in current_slots.items() if status == "예약가능"]
+            # 2. 상태 파일 형식(문자열 키)으로는 여기서 한 번만 변환
+            date_theme_slots = {date: to_theme_map(slots, theme_names) for date, slots in fetched.items()}
+            current_theme_slots = {theme_name: {} for theme_name in theme_names}
+            for theme_map in date_theme_slots.values():
+                for theme_name, slots in theme_map.items():
+                    current_theme_slots[theme_name].update(slots)
             
-            # 4. 예약 가능한 슬롯이 있으면 알림 전송
-            if available_slots:
-                logger.info(f"🎉 예약 가능한 슬롯 {len(available_slots)}개 발견!")
+            for theme_name, theme_slots in zip(theme_names, slots_by_theme):
+                # 3. 예약 가능한 슬롯 개수 확인
+                available_slots = [slot for slot in theme_slots if slot.available]
+                reserved_count = len(theme_slots) - len(available_slots)
                 
-                for slot in available_slots:
-                    logger.info(f"  - {slot}")
+                logger.info(f"'{theme_name}' 예약 가능: {len(available_slots)}개, 매진: {reserved_count}개")
                 
-                # 텔레그램 알림 전송 (매번 전송)
-                if send_notification(available_slots):
-                    logger.info("✅ 텔레그램 알림 전송 성공")
-                else:
-                    logger.error("❌ 텔레그램 알림 전송 실패")
-            else:
-                logger.info("현재 예약 가능한 슬롯이 없습니다")
+                # 4. 새로 예약 가능해진 슬롯만 알림 (같은 슬롯은 쿨타임 동안 다시 알리지 않고 지나면 알림,
+                #    리마인더를 켜면 계속 열려 있는 슬롯도 간격마다 다시 알림) - 상태 저장 전에 비교,
+                #    알림 시각은 발신 대기열에 넣은 뒤에만 기록 (실패하면 다음 체크에서 다시 알림)
+                #    열린 슬롯이 없는 테마도 지난 알림 기록 정리를 위해 호출
+                opened, reminders = self.state_manager.select_alert_slots(current_theme_slots[theme_name], theme_name)
+                if not available_slots:
+                    logger.info(f"'{theme_name}' 현재 예약 가능한 슬롯이 없습니다")
+                    continue
+                slots_by_key = {slot.key: slot for slot in available_slots}
+                
+                if opened:
+                    logger.info(f"🎉 '{theme_name}' 새로 예약 가능해진 슬롯 {len(opened)}개 발견!")
+                    for slot_key in opened:
+                        logger.info(f"  - {slot_key}")
+                    
+                    # 텔레그램 알림 전송 (발신 대기열에 넣고 바로 다음 단계로)
+                    if send_notification([slots_by_key[key] for key in opened], theme_name):
+                        self.state_manager.mark_alerted(opened, theme_name)
+                        logger.info("📬 텔레그램 알림 발신 대기열에 추가")
+                    else:
+                        logger.error("❌ 텔레그램 알림 발신 대기열 추가 실패")
+                
+                if reminders:
+                    logger.info(f"🔁 '{theme_name}' 계속 예약 가능한 슬롯 {len(reminders)}개 리마인더")
+                    if send_notification([slots_by_key[key] for key in reminders], theme_name, reminder=True):
+                        self.state_manager.mark_alerted(reminders, theme_name)
+                    else:
+                        logger.error("❌ 텔레그램 리마인더 발신 대기열 추가 실패")
             
-            # 5. 현재 상태 저장
-            if update_slots(current_slots):
+            # 5. 날짜별 변화 반영 후 현재 상태 저장 (수집한 날짜만 교체)
+            changed_dates = set(self.state_manager.find_changed_dates(date_theme_slots))
+            for date in fetched:
+                self.poll_scheduler.record_result(date, changed=date in changed_dates)
+            
+            # 슬롯이 새로 열린 날짜는 같은 날짜의 연쇄 취소를 잡기 위해 버스트로 재확인
+            for date in self.state_manager.find_opened_dates(date_theme_slots):
+                self.poll_scheduler.start_burst(date)
+            
+            if update_theme_slots(current_theme_slots, dates=list(fetched), failed_dates=failed_dates):
                 logger.debug("상태 저장 완료")
             else:
                 logger.warning("상태 저장 실패")
@@ -173,6 +246,8 @@ class ZeroworldChecker:
             # 6. 통계 정보 출력
             stats = self.state_manager.get_stats()
             logger.info(f"📊 통계 - 전체: {stats['total_slots']}개, 예약가능: {stats['available_slots']}개")
+            if stats['stale_dates']:
+                logger.info(f"⏳ 이전 상태 유지 중인 날짜: {', '.join(stats['stale_dates'])}")
             
             logger.info("=== 슬롯 체크 완료 ===")
             
@@ -185,6 +260,84 @@ class ZeroworldChecker:
             if "network" in str(e).lower() or "connection" in str(e).lower():
                 send_error_notification(f"네트워크 오류: {e}")
     
+    def run_sweep(self):
+        """전체 날짜 체크 실행 후 감지 주기 기록 및 체크 간격 자동 조정"""
+        started = time.monotonic()
+        self._cycle_starts.append(started)
+        
+        with self._check_lock:
+            self.check_slots()
+        
+        duration = time.monotonic() - started
+        self._log_cadence(duration)
+        self._adapt_interval(duration)
+    
+    def _log_cadence(self, duration: float):
+        """최근 사이클 시작 간격으로 실제 감지 주기 로그"""
+        if len(self._cycle_starts) < 2:
+            return
+        
+        starts = list(self._cycle_starts)
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        logger.info(
+            f"🎯 감지 주기: 평균 {sum(gaps) / len(gaps):.1f}초, 최대 {max(gaps):.1f}초 "
+            f"(최근 {len(gaps)}회, 설정 {self.check_interval}초, 이번 사이클 {duration:.1f}초)"
+        )
+    
+    def _adapt_interval(self, duration: float):
+        """사이클 소요 시간이 체크 간격에 가까워지면 간격을 늘리고, 여유가 생기면 원래대로 복귀"""
+        if duration > self.check_interval * ADAPTIVE_INTERVAL_RATIO:
+            new_interval = min(MAX_CHECK_INTERVAL_SECONDS, math.ceil(duration / ADAPTIVE_INTERVAL_RATIO))
+        elif (self.check_interval > CHECK_INTERVAL_SECONDS
+              and duration < CHECK_INTERVAL_SECONDS * ADAPTIVE_INTERVAL_RATIO / 2):
+            # 한 번에 되돌리지 않고 절반씩 복귀 (간격이 출렁이지 않도록)
+            new_interval = max(CHECK_INTERVAL_SECONDS, (self.check_interval + CHECK_INTERVAL_SECONDS) // 2)
+        else:
+            return
+        
+        if new_interval == self.check_interval:
+            return
+        
+        if new_interval > self.check_interval:
+            logger.warning(f"⚠️ 사이클 소요 {duration:.1f}초 - 체크 간격 {self.check_interval}초 → {new_interval}초로 늘림")
+        else:
+            logger.info(f"체크 간격 복귀: {self.check_interval}초 → {new_interval}초 (사이클 소요 {duration:.1f}초)")
+        self.check_interval = new_interval
+        
+        if self.scheduler.running and self.scheduler.get_job('slot_checker'):
+            self.scheduler.reschedule_job(
+                'slot_checker', trigger='interval',
+                seconds=new_interval, jitter=CHECK_INTERVAL_JITTER_SECONDS
+            )
+    
+    def check_due_dates(self):
+        """우선순위 모드: 확인 시각이 된 날짜만 골라서 체크"""
+        self.poll_scheduler.sync_dates(get_date_range())
+        due_dates = self.poll_scheduler.pop_due()
+        if not due_dates:
+            return
+        
+        logger.info(
+            f"⏱️ 우선순위 폴링: {len(due_dates)}개 날짜 ({', '.join(due_dates)}) - "
+            f"요청 예산 {self.poll_scheduler.budget.used()}/{self.poll_scheduler.budget.per_minute}"
+        )
+        with self._check_lock:
+            self.check_slots(due_dates)
+    
+    def check_burst_dates(self):
+        """전체 확인 모드: 버스트 중인 날짜만 전체 확인 사이 사이에 재확인"""
+        due_dates = self.poll_scheduler.pop_due(burst_only=True)
+        if not due_dates:
+            return
+        
+        burst_budget = self.poll_scheduler.burst_budget
+        logger.info(
+            f"⚡ 버스트 재확인: {', '.join(due_dates)} - "
+            f"버스트 요청 예산 {burst_budget.used()}/{burst_budget.per_minute}"
+        )
+        with self._check_lock:
+            self.check_slots(due_dates, burst=True)
+    
     def send_status_message(self):
         """정각마다 모니터링 상태 메시지 전송"""
         try:
@@ -215,9 +368,9 @@ class ZeroworldChecker:
             # 텔레그램 알림 전송 (상태 메시지용 함수 사용)
             from .notifier import send_status_notification
             if send_status_notification(status_msg):
-                logger.info("✅ 상태 메시지 전송 성공")
+                logger.info("📬 상태 메시지 발신 대기열에 추가")
             else:
-                logger.warning("❌ 상태 메시지 전송 실패")
+                logger.warning("❌ 상태 메시지 발신 대기열 추가 실패")
                 
         except Exception as e:
             logger.error(f"상태 메시지 전송 중 오류: {e}")
@@ -281,16 +434,17 @@ class ZeroworldChecker:
             
             # 2. API 연결 테스트
             logger.info("2. 제로월드 API 연결 테스트...")
-            test_slots = get_slots()
-            if not test_slots:
+            test_theme_slots = get_theme_slots(fetcher=self.fetcher)
+            if not any(test_theme_slots.values()):
                 logger.error("❌ API 연결 실패")
                 return False
-            logger.info(f"✅ API 연결 성공 ({len(test_slots)}개 슬롯)")
+            logger.info(f"✅ API 연결 성공 ({sum(len(s) for s in test_theme_slots.values())}개 슬롯)")
             
-            # 3. 상태 관리 테스트
+            # 3. 상태 관리 테스트 (가져온 슬롯은 저장하지 않음 - 저장하면 첫 체크에서 열린 슬롯을 알리지 못함)
             logger.info("3. 상태 관리 테스트...")
-            if not update_slots(test_slots):
-                logger.error("❌ 상태 저장 실패")
+            self.state_manager.load()
+            if not self.state_manager.flush():
+                logger.error("❌ 상태 파일 기록 실패")
                 return False
             logger.info("✅ 상태 관리 성공")
             
@@ -307,9 +461,16 @@ class ZeroworldChecker:
         
         logger.info("🚀 제로월드 예약 모니터링 시스템 시작")
         logger.info(f"📅 모니터링 기간: {DATE_START} ~ {DATE_END}")
-        logger.info(f"🎯 대상 테마: {THEME_NAME}")
+        logger.info(f"🎯 대상 테마: {', '.join(THEME_NAMES)}")
         logger.info(f"⏰ 운영 시간: 24시간 무제한 모니터링")
-        logger.info(f"🔄 체크 간격: {CHECK_INTERVAL_MINUTES}분")
+        if POLL_MODE == "priority":
+            logger.info(
+                f"🔄 우선순위 폴링: 오늘/내일 {self.poll_scheduler.hot_interval:.0f}초 ~ "
+                f"먼 날짜 {self.poll_scheduler.cold_interval:.0f}초, "
+                f"분당 요청 예산 {self.poll_scheduler.budget.per_minute}회"
+            )
+        else:
+            logger.info(f"🔄 체크 간격: {CHECK_INTERVAL_SECONDS}초 (지터 0~{CHECK_INTERVAL_JITTER_SECONDS:g}초)")
         logger.info(f"📱 정각마다 상태 메시지 전송")
         logger.info(f"🤖 텔레그램 봇 명령어: /status (현재 상태), /help (도움말)")
         
@@ -321,20 +482,46 @@ class ZeroworldChecker:
         # 즉시 한 번 실행
         logger.info("초기 슬롯 체크 실행...")
         try:
-            self.check_slots()
+            self.run_sweep()
         except Exception as e:
             logger.warning(f"초기 체크 실패: {e}")
         
         # 스케줄러에 작업 추가
-        self.scheduler.add_job(
-            func=self.check_slots,
-            trigger='interval',
-            minutes=CHECK_INTERVAL_MINUTES,
-            id='slot_checker',
-            name='제로월드 슬롯 체크',
-            misfire_grace_time=30,  # 30초까지 지연 허용
-            max_instances=1  # 동시 실행 방지
-        )
+        if POLL_MODE == "priority":
+            # 짧은 주기로 확인 시각이 된 날짜만 골라서 체크
+            self.scheduler.add_job(
+                func=self.check_due_dates,
+                trigger='interval',
+                seconds=PRIORITY_TICK_SECONDS,
+                id='slot_checker',
+                name='제로월드 날짜별 우선순위 체크',
+                misfire_grace_time=PRIORITY_TICK_SECONDS,
+                max_instances=1,  # 동시 실행 방지
+                coalesce=True
+            )
+        else:
+            self.scheduler.add_job(
+                func=self.run_sweep,
+                trigger='interval',
+                seconds=self.check_interval,
+                jitter=CHECK_INTERVAL_JITTER_SECONDS,  # 요청 시각이 일정한 패턴이 되지 않도록
+                id='slot_checker',
+                name='제로월드 슬롯 체크',
+                misfire_grace_time=30,  # 30초까지 지연 허용
+                max_instances=1,  # 동시 실행 방지
+                coalesce=True
+            )
+            # 슬롯이 새로 열린 날짜는 전체 확인을 기다리지 않고 짧은 주기로 재확인
+            self.scheduler.add_job(
+                func=self.check_burst_dates,
+                trigger='interval',
+                seconds=BURST_INTERVAL_SECONDS,
+                id='burst_checker',
+                name='제로월드 버스트 재확인',
+                misfire_grace_time=BURST_INTERVAL_SECONDS,
+                max_instances=1,
+                coalesce=True
+            )
         
         # 정각마다 상태 메시지 전송 작업 추가
         self.scheduler.add_job(
@@ -377,6 +564,16 @@ class ZeroworldChecker:
             if self.scheduler.running:
                 self.scheduler.shutdown(wait=False)
             
+            # fetcher 세션 및 백그라운드 루프 종료
+            self.fetcher.shutdown()
+            
+            # 발신 대기열에 남은 메시지 전송 후 텔레그램 연결 풀 및 이벤트 루프 종료
+            shutdown_notifier()
+            
+            # 지연 기록 중인 상태를 파일에 반영
+            if not self.state_manager.flush():
+                logger.error("종료 전 상태 파일 기록 실패")
+            
             # 최종 통계
             logger.info(f"📊 최종 통계:")
             logger.info(f"  - 총 체크 횟수: {self.check_count}")
@@ -391,6 +588,8 @@ class ZeroworldChecker:
         
         if not self.test_system():
             logger.error("시스템 테스트 실패")
+            self.fetcher.shutdown()
+            shutdown_notifier()
             return False
         
         try:
@@ -399,6 +598,10 @@ class ZeroworldChecker:
         except Exception as e:
             logger.error(f"실행 실패: {e}")
             return False
+        finally:
+            self.fetcher.shutdown()
+            shutdown_notifier()
+            self.state_manager.flush()
 
 
 def main():
@@ -423,7 +626,7 @@ def main():
         print(f"봇 토큰: {'설정됨' if BOT_TOKEN != 'YOUR_BOT_TOKEN_HERE' else '❌ 미설정'}")
         print(f"채팅 ID: {'설정됨' if CHAT_ID != 0 else '❌ 미설정'}")
         print(f"모니터링 기간: {DATE_START} ~ {DATE_END}")
-        print(f"대상 테마: {THEME_NAME}")
+        print(f"대상 테마: {', '.join(THEME_NAMES)}")
         print(f"운영 시간: {RUN_HOURS.start:02d}:00 ~ {RUN_HOURS.stop-1:02d}:59")
         
     elif args.bot_test:
@@ -449,7 +652,10 @@ def main():
             
     elif args.test:
         # 시스템 테스트만
-        if checker.test_system():
+        passed = checker.test_system()
+        checker.fetcher.shutdown()
+        shutdown_notifier()
+        if passed:
             logger.info("🎉 모든 테스트 통과!")
             sys.exit(0)
         else:
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+슬롯 데이터 모델 모듈
+
+수집 → 비교 → 알림 파이프라인 안에서는 슬롯을 (epoch 초, 테마 번호, 상태 코드)의
+작은 객체로 다루고, "YYYY-MM-DD HH:MM:SS" / "예약가능" 같은 문자열은
+상태 파일(JSON)과 텔레그램 메시지를 만들 때만 생성한다.
+"""
+
+import time
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+SLOT_KEY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SlotStatus(IntEnum):
+    """슬롯 예약 상태"""
+    RESERVED = 0
+    AVAILABLE = 1
+
+    @property
+    def label(self) -> str:
+        """상태 파일/알림에 쓰는 한글 표기"""
+        return _STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> "SlotStatus":
+        return cls.AVAILABLE if label == "예약가능" else cls.RESERVED
+
+
+_STATUS_LABELS = {SlotStatus.RESERVED: "매진", SlotStatus.AVAILABLE: "예약가능"}
+
+
+class Slot:
+    """
+    슬롯 하나 (테마 + 시작 시각 + 상태)
+
+    Attributes:
+        epoch: 슬롯 시작 시각 (로컬 시간 기준 epoch 초)
+        theme_id: 감시 대상 테마 목록(THEME_NAMES)에서의 인덱스
+        status: 예약 상태
+    """
+
+    __slots__ = ('epoch', 'theme_id', 'status')
+
+    def __init__(self, epoch: int, theme_id: int, status: SlotStatus):
+        self.epoch = epoch
+        self.theme_id = theme_id
+        self.status = status
+
+    @property
+    def available(self) -> bool:
+        return self.status is SlotStatus.AVAILABLE
+
+    @property
+    def key(self) -> str:
+        """상태 파일 키 형식 "YYYY-MM-DD HH:MM:SS" """
+        return format_slot_key(self.epoch)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Slot):
+            return NotImplemented
+        return (self.epoch, self.theme_id, self.status) == (other.epoch, other.theme_id, other.status)
+
+    def __hash__(self) -> int:
+        return hash((self.epoch, self.theme_id, self.status))
+
+    def __repr__(self) -> str:
+        return f"Slot({self.key}, theme={self.theme_id}, {self.status.label})"
+
+
+@lru_cache(maxsize=512)
+def _parse_date(date_str: str) -> Tuple[int, int, int]:
+    year, month, day = map(int, date_str.split('-'))
+    return year, month, day
+
+
+@lru_cache(maxsize=1024)
+def _parse_time(time_str: str) -> Tuple[int, int, int]:
+    parts = time_str.split(':')
+    if len(parts) not in (2, 3):
+        raise ValueError(f"잘못된 시간 형식: {time_str}")
+    return int(parts[0]), int(parts[1]), int(parts[2]) if len(parts) == 3 else 0
+
+
+@lru_cache(maxsize=4096)
+def slot_epoch(date_str: str, time_str: str) -> int:
+    """날짜 "YYYY-MM-DD"와 시각 "HH:MM:SS"를 로컬 시간 기준 epoch 초로 변환 (결과는 캐시됨)"""
+    year, month, day = _parse_date(date_str)
+    hours, minutes, seconds = _parse_time(time_str)
+    return int(time.mktime((year, month, day, hours, minutes, seconds, 0, 0, -1)))
+
+
+def format_slot_key(epoch: int) -> str:
+    """epoch 초를 상태 파일 키 형식으로 변환"""
+    return time.strftime(SLOT_KEY_FORMAT, time.localtime(epoch))
+
+
+def parse_slot_key(slot_key: str) -> int:
+    """상태 파일 키를 epoch 초로 변환"""
+    date_str, time_str = slot_key.split(' ', 1)
+    return slot_epoch(date_str, time_str)
+
+
+def to_theme_map(slots: Iterable[Slot], theme_names: List[str]) -> Dict[str, Dict[str, str]]:
+    """슬롯 목록을 상태 파일 형식 {"층간소음": {"2025-01-29 18:30:00": "예약가능"}}으로 변환"""
+    theme_map: Dict[str, Dict[str, str]] = {theme_name: {} for theme_name in theme_names}
+    maps = [theme_map[theme_name] for theme_name in theme_names]
+    for slot in slots:
+        maps[slot.theme_id][format_slot_key(slot.epoch)] = _STATUS_LABELS[slot.status]
+    return theme_map
+
+
+def from_theme_map(theme_map: Dict[str, Dict[str, str]], theme_names: List[str]) -> List[Slot]:
+    """상태 파일 형식을 슬롯 목록으로 변환 (감시 대상이 아닌 테마는 무시)"""
+    slots = []
+    for theme_id, theme_name in enumerate(theme_names):
+        for slot_key, label in theme_map.get(theme_name, {}).items():
+            slots.append(Slot(parse_slot_key(slot_key), theme_id, SlotStatus.from_label(label)))
+    return slots
@@ -7,7 +7,9 @@
 
 import asyncio
 import time
-from typing import Dict, List, Optional
+import threading
+import concurrent.futures
+from typing import Any, Coroutine, Dict, List, Optional, Union
 from datetime import datetime
 from loguru import logger
 
@@ -20,17 +22,38 @@ except ImportError:
     logger.warning("python-telegram-bot가 설치되지 않았습니다. 텔레그램 알림이 비활성화됩니다.")
     TELEGRAM_AVAILABLE = False
 
-from .config import BOT_TOKEN, CHAT_ID, MAX_NOTIFICATION_SLOTS, NOTIFICATION_COOLDOWN
+from .config import (
+    BOT_TOKEN, CHAT_ID, MAX_NOTIFICATION_SLOTS, THEME_NAME, THEME_NAMES,
+    TELEGRAM_API_URL, TELEGRAM_CONNECTION_POOL_SIZE, TELEGRAM_KEEPALIVE_SECONDS, TELEGRAM_SEND_TIMEOUT,
+    OUTBOUND_DRAIN_TIMEOUT
+)
+from .aio import BackgroundLoop
+from .outbound import OutboundMessage, OutboundQueue
+from .models import Slot
+
+
+def _slot_sort_key(slot: Union[Slot, str]):
+    """Slot은 epoch 순, 문자열은 사전순 (같은 형식이면 시간순)"""
+    return (0, slot.epoch, "") if isinstance(slot, Slot) else (1, 0, slot)
 
 
 class TelegramNotifier:
-    """텔레그램 알림 전송 클래스"""
+    """
+    텔레그램 알림 전송 클래스
+    
+    Bot의 HTTPX 연결 풀은 처음 사용한 이벤트 루프에 묶이므로 한 인스턴스는 한 루프에서만 사용.
+    프로세스 전체에서는 get_notifier()의 공유 인스턴스를 알림 전용 루프에서 사용함 (아래 동기 함수들).
+    """
     
-    def __init__(self, bot_token: str = BOT_TOKEN, chat_id: int = CHAT_ID):
+    def __init__(self, bot_token: str = BOT_TOKEN, chat_id: int = CHAT_ID, base_url: str = TELEGRAM_API_URL):
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self.base_url = base_url
         self.bot = None
-        self.last_notification_time = 0
+        
+        # 전송 통계 (누적, 지연 시간은 send_message 호출부터 응답까지)
+        self.stats = {'sent': 0, 'failed': 0, 'latency_total_ms': 0.0, 'latency_max_ms': 0.0}
+        
         self._initialize_bot()
     
     def _initialize_bot(self):
@@ -51,13 +74,22 @@ class TelegramNotifier:
                 return
             
             # Bot 객체에 timeout 설정
+            # (유휴 연결을 오래 유지해 다음 알림이 연결/TLS 핸드셰이크 없이 바로 나가도록 함)
+            # httpx_kwargs는 python-telegram-bot 21.6부터 지원 (requirements.txt 참고)
+            import httpx
             from telegram.request import HTTPXRequest
             request = HTTPXRequest(
+                connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE,
                 read_timeout=10,
                 write_timeout=10,
-                connect_timeout=10
+                connect_timeout=10,
+                httpx_kwargs={'limits': httpx.Limits(
+                    max_connections=TELEGRAM_CONNECTION_POOL_SIZE,
+                    max_keepalive_connections=TELEGRAM_CONNECTION_POOL_SIZE,
+                    keepalive_expiry=TELEGRAM_KEEPALIVE_SECONDS
+                )}
             )
-            self.bot = Bot(token=self.bot_token, request=request)
+            self.bot = Bot(token=self.bot_token, base_url=self.base_url, request=request)
             logger.info("텔레그램 봇 초기화 완료")
             
         except Exception as e:
@@ -77,11 +109,7 @@ class TelegramNotifier:
             
             # 테스트 메시지 전송
             test_message = "🔧 제로월드 예약 모니터링 시스템\n연결 테스트가 성공했습니다!"
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=test_message,
-                parse_mode='HTML'
-            )
+            await self._send_message(test_message, parse_mode='HTML')
             logger.info(f"테스트 메시지 전송 완료 (채팅 ID: {self.chat_id})")
             return True
             
@@ -97,17 +125,44 @@ class TelegramNotifier:
             logger.error(f"연결 테스트 중 예상치 못한 오류: {e}")
             return False
     
-    def _should_send_notification(self) -> bool:
-        """알림 전송 가능 여부 확인 (쿨타임 체크)"""
-        current_time = time.time()
-        if current_time - self.last_notification_time < NOTIFICATION_COOLDOWN:
-            remaining = NOTIFICATION_COOLDOWN - (current_time - self.last_notification_time)
-            logger.info(f"알림 쿨타임 중입니다. {remaining:.0f}초 후 재시도 가능")
-            return False
-        return True
+    async def _send_message(self, text: str, **kwargs):
+        """메시지 전송 후 지연 시간/성공 여부를 통계에 기록 (오류는 그대로 전달)"""
+        started = time.perf_counter()
+        try:
+            message = await self.bot.send_message(chat_id=self.chat_id, text=text, **kwargs)
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.stats['sent'] += 1
+        self.stats['latency_total_ms'] += latency_ms
+        self.stats['latency_max_ms'] = max(self.stats['latency_max_ms'], latency_ms)
+        logger.debug(f"📨 텔레그램 전송 {latency_ms:.0f}ms")
+        return message
+    
+    def get_stats(self) -> Dict[str, float]:
+        """누적 전송 통계 (평균 지연 포함)"""
+        stats = dict(self.stats)
+        stats['latency_avg_ms'] = stats['latency_total_ms'] / stats['sent'] if stats['sent'] else 0.0
+        return stats
     
-    def _format_slots_message(self, new_slots: List[str]) -> str:
-        """슬롯 정보를 메시지 형식으로 포맷팅"""
+    async def send_queued(self, message: OutboundMessage):
+        """발신 대기열 디스패처용 전송 (오류는 재시도 판단을 위해 그대로 전달)"""
+        await self._send_message(message.text, **message.options)
+    
+    async def close(self):
+        """연결 풀 닫기 (인스턴스를 사용한 루프에서 호출)"""
+        if self.bot:
+            await self.bot.request.shutdown()
+    
+    def _format_slots_message(self, new_slots: List[Union[Slot, str]], theme_name: str = THEME_NAME,
+                              reminder: bool = False) -> str:
+        """
+        슬롯 정보를 메시지 형식으로 포맷팅 (Slot 또는 "YYYY-MM-DD HH:MM:SS" 문자열)
+        
+        reminder=True면 계속 예약 가능한 슬롯을 다시 알리는 메시지 (첫 줄에 안내 추가)
+        """
         if not new_slots:
             return ""
         
@@ -116,8 +171,17 @@ class TelegramNotifier:
         
         # 각 슬롯별로 개별 라인 생성
         message_lines = []
-        
-        for slot in sorted(slots_to_show):
+        if reminder:
+            message_lines.append(f"🔁 아직 예약 가능 ({theme_name})")
+        
+        for slot in sorted(slots_to_show, key=_slot_sort_key):
+            if isinstance(slot, Slot):
+                # 날짜/시간 포맷팅: epoch -> 7월30일, 14:00
+                slot_time = time.localtime(slot.epoch)
+                line = f"예약가능확인! {theme_name} {slot_time.tm_mon}월{slot_time.tm_mday}일, {slot_time.tm_hour:02d}:{slot_time.tm_min:02d}"
+                message_lines.append(line)
+                continue
+            
             try:
                 date_part, time_part = slot.split(' ', 1)
                 
@@ -131,12 +195,12 @@ class TelegramNotifier:
                 time_formatted = time_part[:5] if len(time_part) >= 5 else time_part
                 
                 # 메시지 라인 생성: "예약가능확인! 층간소음 7월30일, 14:00"
-                line = f"예약가능확인! 층간소음 {date_korean}, {time_formatted}"
+                line = f"예약가능확인! {theme_name} {date_korean}, {time_formatted}"
                 message_lines.append(line)
                 
             except (ValueError, IndexError) as e:
                 # 파싱 오류시 원본 그대로 사용
-                message_lines.append(f"예약가능확인! 층간소음 {slot}")
+                message_lines.append(f"예약가능확인! {theme_name} {slot}")
         
         # 더 많은 슬롯이 있는 경우 안내 추가
         if len(new_slots) > MAX_NOTIFICATION_SLOTS:
@@ -148,8 +212,17 @@ class TelegramNotifier:
         # 줄바꿈으로 연결하여 반환
         return "\n".join(message_lines)
     
-    async def send_notification(self, new_slots: List[str]) -> bool:
-        """새로 예약 가능해진 슬롯 알림 전송"""
+    def _format_error_message(self, error_message: str) -> str:
+        """에러 알림 메시지 (발생 시각 포함)"""
+        return f"⚠️ <b>제로월드 모니터링 오류</b>\n\n{error_message}\n\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    
+    async def send_notification(self, new_slots: List[Union[Slot, str]], theme_name: str = THEME_NAME,
+                                reminder: bool = False) -> bool:
+        """
+        예약 가능 슬롯 알림 전송 (reminder=True면 계속 열려 있는 슬롯 리마인더)
+        
+        어떤 슬롯을 알릴지(상태 변화, 슬롯별 쿨타임)는 호출자가 StateManager.select_alert_slots로 고름
+        """
         if not self.bot:
             logger.error("텔레그램 봇이 초기화되지 않았습니다")
             return False
@@ -158,21 +231,12 @@ class TelegramNotifier:
             logger.info("알림할 새로운 슬롯이 없습니다")
             return True
         
-        if not self._should_send_notification():
-            return False
-        
         try:
-            message = self._format_slots_message(new_slots)
+            message = self._format_slots_message(new_slots, theme_name, reminder)
             
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML',
-                disable_web_page_preview=True
-            )
+            await self._send_message(message, parse_mode='HTML', disable_web_page_preview=True)
             
-            self.last_notification_time = time.time()
-            logger.info(f"알림 전송 완료: {len(new_slots)}개 새로운 슬롯")
+            logger.info(f"알림 전송 완료: '{theme_name}' {len(new_slots)}개 새로운 슬롯")
             return True
             
         except RetryAfter as e:
@@ -194,13 +258,9 @@ class TelegramNotifier:
             return False
         
         try:
-            message = f"⚠️ <b>제로월드 모니터링 오류</b>\n\n{error_message}\n\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            message = self._format_error_message(error_message)
             
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
+            await self._send_message(message, parse_mode='HTML')
             
             logger.info("에러 알림 전송 완료")
             return True
@@ -215,11 +275,7 @@ class TelegramNotifier:
             return False
         
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=status_message,
-                parse_mode='HTML'
-            )
+            await self._send_message(status_message, parse_mode='HTML')
             
             logger.info("상태 메시지 전송 완료")
             return True
@@ -295,6 +351,39 @@ class TelegramBotHandler:
             else:
                 runtime_str = "시작 시간 미설정"
             
+            # 요청 속도 제한 대기 통계
+            rate_stats = self.monitor_instance.fetcher.rate_limiter.get_stats()
+            if rate_stats['rate'] > 0:
+                rate_str = (
+                    f"초당 {rate_stats['rate']:g}회 / 대기 {rate_stats['waited']}회 "
+                    f"(평균 {rate_stats['wait_avg']:.2f}초, 최대 {rate_stats['wait_max']:.2f}초)"
+                )
+            else:
+                rate_str = "제한 없음"
+            
+            # 서킷 브레이커 상태
+            breaker = self.monitor_instance.fetcher.breaker
+            breaker_stats = breaker.get_stats()
+            breaker_str = f"{breaker.state.label}, 연속 실패 {breaker_stats['consecutive_failures']}회"
+            if breaker_stats['retry_in']:
+                breaker_str += f", {breaker_stats['retry_in']:.0f}초 후 시험 요청"
+            breaker_str += f" (누적 차단 {breaker_stats['trips']}회)"
+            
+            # 텔레그램 알림 전송 통계
+            send_stats = get_notifier().get_stats()
+            send_str = (
+                f"{send_stats['sent']}회 (평균 {send_stats['latency_avg_ms']:.0f}ms, "
+                f"최대 {send_stats['latency_max_ms']:.0f}ms), 실패 {send_stats['failed']}회"
+            )
+            
+            # 발신 대기열 (대기 중 메시지 수, 넣은 때부터 전송까지 지연)
+            queue_stats = get_outbound_queue().get_stats()
+            queue_str = (
+                f"대기 {queue_stats['depth']}개 (최대 {queue_stats['depth_max']}개), "
+                f"지연 평균 {queue_stats['latency_avg_ms']:.0f}ms / 최대 {queue_stats['latency_max_ms']:.0f}ms, "
+                f"재시도 {queue_stats['retries']}회, 실패 {queue_stats['failed']}회, 버림 {queue_stats['dropped']}개"
+            )
+            
             # 상태 메시지 생성
             status_msg = (
                 f"🤖 <b>제로월드 모니터링 상태</b>\n\n"
@@ -302,7 +391,11 @@ class TelegramBotHandler:
                 f"📊 <b>총 체크 횟수:</b> {self.monitor_instance.check_count}\n"
                 f"✅ <b>마지막 성공:</b> {self.monitor_instance.last_success_time.strftime('%H:%M:%S') if self.monitor_instance.last_success_time else '없음'}\n"
                 f"❌ <b>에러 횟수:</b> {self.monitor_instance.error_count}\n"
-                f"🔄 <b>모니터링 상태:</b> {'실행 중' if self.monitor_instance.running else '중지됨'}\n\n"
+                f"🔄 <b>모니터링 상태:</b> {'실행 중' if self.monitor_instance.running else '중지됨'}\n"
+                f"🚦 <b>요청 속도 제한:</b> {rate_str}\n"
+                f"🧯 <b>서킷 브레이커:</b> {breaker_str}\n"
+                f"📨 <b>알림 전송:</b> {send_str}\n"
+                f"📬 <b>발신 대기열:</b> {queue_str}\n\n"
                 f"⏰ <b>현재 시간:</b> {now.strftime('%Y-%m-%d %H:%M:%S')}"
             )
             
@@ -346,7 +439,7 @@ class TelegramBotHandler:
         """
         welcome_msg = (
             f"🎉 <b>제로월드 예약 모니터링 봇에 오신 것을 환영합니다!</b>\n\n"
-            f"🎯 <b>현재 모니터링 중:</b> 층간소음 테마\n"
+            f"🎯 <b>현재 모니터링 중:</b> {', '.join(THEME_NAMES)} 테마\n"
             f"⏰ <b>운영 시간:</b> 24시간 무제한\n"
             f"🔄 <b>체크 간격:</b> 1분마다\n\n"
             f"📱 사용 가능한 명령어를 보려면 /help를 입력하세요."
@@ -539,23 +632,113 @@ def get_bot_handler() -> Optional[TelegramBotHandler]:
     return _bot_handler
 
 
+# 전역 notifier 인스턴스, 알림 전용 이벤트 루프, 발신 대기열
+# (호출마다 Bot/연결 풀/이벤트 루프를 새로 만들지 않고 프로세스 전체가 재사용)
+_notifier: Optional[TelegramNotifier] = None
+_notifier_runtime: Optional[BackgroundLoop] = None
+_outbound: Optional[OutboundQueue] = None
+_notifier_lock = threading.Lock()
+
+def get_notifier() -> TelegramNotifier:
+    """공유 notifier 인스턴스 반환 (전송은 _run으로 알림 전용 루프에서 실행해야 함)"""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = TelegramNotifier()
+        return _notifier
+
+
+def _get_runtime() -> BackgroundLoop:
+    """알림 전용 이벤트 루프 반환"""
+    global _notifier_runtime
+    with _notifier_lock:
+        if _notifier_runtime is None:
+            _notifier_runtime = BackgroundLoop(name="telegram-notifier")
+        return _notifier_runtime
+
+
+def get_outbound_queue() -> OutboundQueue:
+    """공유 발신 대기열 반환 (디스패처는 알림 전용 루프에서 공유 notifier로 전송)"""
+    global _outbound
+    notifier = get_notifier()
+    runtime = _get_runtime()
+    with _notifier_lock:
+        if _outbound is None:
+            _outbound = OutboundQueue(runtime, notifier.send_queued)
+        return _outbound
+
+
+def _run(coro: Coroutine, timeout: float = TELEGRAM_SEND_TIMEOUT) -> Any:
+    """알림 전용 루프에서 코루틴을 실행하고 결과 대기 (timeout을 넘기면 취소 후 False)"""
+    future = _get_runtime().submit(coro)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        logger.error(f"텔레그램 전송이 {timeout}초 안에 끝나지 않아 취소했습니다")
+        return False
+
+
+def _enqueue(kind: str, text: str, **options) -> bool:
+    """봇이 준비되어 있으면 발신 대기열에 메시지 추가"""
+    if not get_notifier().bot:
+        logger.error("텔레그램 봇이 초기화되지 않았습니다")
+        return False
+    return get_outbound_queue().put(kind, text, **options)
+
+
+def shutdown_notifier(drain_timeout: float = OUTBOUND_DRAIN_TIMEOUT):
+    """
+    남은 메시지 전송을 drain_timeout까지 기다린 뒤 연결 풀을 닫고 알림 루프 중지
+    (이후 전송하면 새로 만들어짐)
+    """
+    global _notifier, _notifier_runtime, _outbound
+    with _notifier_lock:
+        notifier, runtime, outbound = _notifier, _notifier_runtime, _outbound
+        _notifier = _notifier_runtime = _outbound = None
+    
+    if runtime is None or not runtime.running:
+        return
+    
+    if outbound:
+        if not outbound.drain(drain_timeout):
+            logger.warning(f"📬 발신 대기열에 남은 메시지 {outbound.depth}개를 보내지 못하고 종료합니다")
+        try:
+            runtime.run(outbound.stop(), timeout=5)
+        except Exception as e:
+            logger.error(f"발신 대기열 종료 실패: {e}")
+        logger.info(f"📬 발신 대기열 종료 - 누적 통계: {outbound.get_stats()}")
+    
+    if notifier:
+        try:
+            runtime.run(notifier.close(), timeout=5)
+        except Exception as e:
+            logger.error(f"텔레그램 연결 풀 종료 실패: {e}")
+        logger.info(f"📨 텔레그램 notifier 종료 - 누적 통계: {notifier.get_stats()}")
+    
+    runtime.stop()
+
+
 # 동기 함수들 (기존 호환성 유지)
-def send_notification(new_slots: List[str]) -> bool:
-    """동기 알림 전송 함수"""
-    notifier = TelegramNotifier()
-    return asyncio.run(notifier.send_notification(new_slots))
+# 알림/에러/상태 메시지는 발신 대기열에 넣고 바로 반환 (True는 "전송 예약됨", 전송 결과는 디스패처 로그/통계)
+def send_notification(new_slots: List[Union[Slot, str]], theme_name: str = THEME_NAME,
+                      reminder: bool = False) -> bool:
+    """동기 알림 전송 함수 (알릴 슬롯은 호출자가 StateManager.select_alert_slots로 고름)"""
+    if not new_slots:
+        logger.info("알림할 새로운 슬롯이 없습니다")
+        return True
+    message = get_notifier()._format_slots_message(new_slots, theme_name, reminder)
+    return _enqueue('alert', message, parse_mode='HTML', disable_web_page_preview=True)
 
 
 def send_error_notification(error_message: str) -> bool:
     """동기 에러 알림 전송 함수"""
-    notifier = TelegramNotifier()
-    return asyncio.run(notifier.send_error_notification(error_message))
+    return _enqueue('error', get_notifier()._format_error_message(error_message), parse_mode='HTML')
 
 
 def test_telegram_connection() -> bool:
-    """동기 텔레그램 연결 테스트 함수"""
-    notifier = TelegramNotifier()
-    return asyncio.run(notifier.test_connection())
+    """동기 텔레그램 연결 테스트 함수 (결과를 기다림, 공유 연결 풀도 이때 미리 연결됨)"""
+    return _run(get_notifier().test_connection())
 
 
 def test_bot_polling() -> bool:
@@ -634,11 +817,16 @@ if __name__ == "__main__":
         "2025-01-31 14:20:00"
     ]
     
-    if send_notification(test_slots):
+    # 알림은 발신 대기열에 들어가므로 디스패처가 보낼 때까지 기다린 뒤 결과 확인
+    queued = send_notification(test_slots)
+    if queued and get_outbound_queue().drain(OUTBOUND_DRAIN_TIMEOUT) and get_outbound_queue().stats['sent']:
         print("✅ 테스트 알림 전송 성공!")
     else:
         print("❌ 테스트 알림 전송 실패")
     
+    print(f"전송 통계: {get_notifier().get_stats()}")
+    print(f"발신 대기열 통계: {get_outbound_queue().get_stats()}")
+    shutdown_notifier()
     print("\n=== 테스트 완료 ===")
 
 
@@ -650,24 +838,17 @@ def send_status_notification(status_message: str) -> bool:
         status_message: 상태 메시지 텍스트
         
     Returns:
-        bool: 전송 성공 여부
+        bool: 발신 대기열 추가 여부
     """
     try:
-        notifier = TelegramNotifier()
+        notifier = get_notifier()
         
         if not notifier.bot:
             logger.error("텔레그램 봇 초기화 실패로 상태 메시지를 보낼 수 없습니다")
             return False
         
-        # 비동기 함수를 동기적으로 실행
-        result = asyncio.run(notifier._send_status_message_async(status_message))
-        
-        if result:
-            logger.debug("상태 메시지 전송 성공")
-            return True
-        else:
-            logger.warning("상태 메시지 전송 실패")
-            return False
+        # 발신 대기열에 넣고 바로 반환 (전송은 디스패처가 담당)
+        return _enqueue('status', status_message, parse_mode='HTML')
             
     except Exception as e:
         logger.error(f"상태 메시지 전송 중 오류: {e}")
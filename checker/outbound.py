@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+텔레그램 발신 대기열 모듈
+
+슬롯 체크 같은 동기 작업은 메시지를 대기열에 넣고 바로 돌아가고,
+알림 전용 이벤트 루프의 디스패처 하나가 넣은 순서대로 전송한다.
+전송이 실패하면 같은 메시지를 재시도한 다음에 다음 메시지로 넘어가므로 순서가 바뀌지 않는다.
+- RetryAfter (속도 제한): 텔레그램이 알려준 시간만큼 기다린 뒤 재시도
+- 네트워크 오류/타임아웃: 지수 백오프(+지터)로 OUTBOUND_MAX_ATTEMPTS회까지 시도
+- 잘못된 요청/권한 없음 등: 다시 보내도 같으므로 버림
+"""
+
+import time
+import asyncio
+import threading
+import datetime as dt
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, NamedTuple, Optional
+from loguru import logger
+
+try:
+    from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+    TELEGRAM_AVAILABLE = True
+except ImportError:
+    TELEGRAM_AVAILABLE = False
+
+from .aio import BackgroundLoop
+from .config import (
+    OUTBOUND_QUEUE_MAX_SIZE, OUTBOUND_MAX_ATTEMPTS, OUTBOUND_BACKOFF_BASE_SECONDS, OUTBOUND_BACKOFF_MAX_SECONDS
+)
+from .retry import backoff_delay
+
+# 로그/통계 표시용 메시지 종류 이름
+KIND_LABELS = {'alert': '예약 알림', 'error': '에러 알림', 'status': '상태 메시지'}
+
+
+class OutboundMessage(NamedTuple):
+    """대기열에 들어가는 메시지 (본문은 넣을 때 완성해 둠)"""
+    kind: str  # 'alert' / 'error' / 'status'
+    text: str
+    options: Dict[str, Any]  # send_message에 그대로 넘길 추가 인자 (parse_mode 등)
+    enqueued_at: float  # time.monotonic()
+
+
+def _retry_after_seconds(error: "RetryAfter") -> float:
+    """RetryAfter 대기 시간 (python-telegram-bot 버전에 따라 int 또는 timedelta)"""
+    retry_after = error.retry_after
+    if isinstance(retry_after, dt.timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class OutboundQueue:
+    """
+    FIFO 발신 대기열 + 디스패처 (put은 어느 스레드에서나 호출 가능, 블로킹하지 않음)
+
+    대기열 자체는 이벤트 루프 스레드에서만 건드리고, put은 call_soon_threadsafe로 넘긴다.
+    max_size를 넘으면 가장 오래된 메시지를 버림 (오래 밀린 알림보다 최신 알림이 중요).
+    """
+
+    def __init__(self, runtime: BackgroundLoop, send: Callable[[OutboundMessage], Awaitable[Any]],
+                 max_size: int = OUTBOUND_QUEUE_MAX_SIZE, max_attempts: int = OUTBOUND_MAX_ATTEMPTS):
+        self.runtime = runtime
+        self.send = send
+        self.max_size = max(1, max_size)
+        self.max_attempts = max(1, max_attempts)
+
+        self._pending: Deque[OutboundMessage] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 아직 끝나지 않은 메시지 수 (대기 중 + 전송 중, drain에서 사용)
+        self._unfinished = 0
+        self._done = threading.Condition()
+
+        # 통계 (누적, 지연 시간은 대기열에 넣은 때부터 전송 완료까지)
+        self.stats = {
+            'enqueued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'retries': 0, 'depth_max': 0,
+            'latency_total_ms': 0.0, 'latency_max_ms': 0.0
+        }
+
+    @property
+    def depth(self) -> int:
+        """대기 중 + 전송 중인 메시지 수"""
+        return self._unfinished
+
+    def put(self, kind: str, text: str, **options) -> bool:
+        """메시지를 대기열에 넣고 바로 반환"""
+        message = OutboundMessage(kind, text, options, time.monotonic())
+        with self._done:
+            self._unfinished += 1
+            self.stats['enqueued'] += 1
+            self.stats['depth_max'] = max(self.stats['depth_max'], self._unfinished)
+
+        try:
+            self.runtime.start()
+            self.runtime.loop.call_soon_threadsafe(self._put, message)
+        except Exception as e:
+            logger.error(f"발신 대기열 추가 실패: {e}")
+            self._task_done()
+            return False
+        return True
+
+    def _put(self, message: OutboundMessage):
+        """이벤트 루프 스레드에서 대기열에 추가하고 디스패처 깨우기"""
+        self._pending.append(message)
+        if len(self._pending) > self.max_size:
+            dropped = self._pending.popleft()
+            self.stats['dropped'] += 1
+            self._task_done()
+            logger.warning(f"📬 발신 대기열이 가득 차 가장 오래된 {KIND_LABELS.get(dropped.kind, dropped.kind)}을 버림")
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._dispatch())
+        self._wakeup.set()
+
+    async def _dispatch(self):
+        """대기열이 빌 때까지 순서대로 전송하고, 비면 다음 메시지를 기다림"""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message = self._pending.popleft()
+            try:
+                await self._deliver(message)
+            finally:
+                self._task_done()
+
+    async def _deliver(self, message: OutboundMessage):
+        """메시지 하나 전송 (재시도 포함, 실패해도 예외를 올리지 않음)"""
+        label = KIND_LABELS.get(message.kind, message.kind)
+        for attempt in range(self.max_attempts):
+            try:
+                await self.send(message)
+            except RetryAfter as e:
+                delay = _retry_after_seconds(e)
+                reason = f"텔레그램 속도 제한 ({delay:.0f}초 대기)"
+            except (BadRequest, Forbidden) as e:
+                self.stats['failed'] += 1
+                logger.error(f"{label} 전송 실패 (재시도하지 않음): {e}")
+                return
+            except NetworkError as e:
+                delay = backoff_delay(attempt, OUTBOUND_BACKOFF_BASE_SECONDS, OUTBOUND_BACKOFF_MAX_SECONDS)
+                reason = f"네트워크 오류: {e}"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"{label} 전송 중 예상치 못한 오류: {e}")
+                return
+            else:
+                latency_ms = (time.monotonic() - message.enqueued_at) * 1000
+                self.stats['sent'] += 1
+                self.stats['latency_total_ms'] += latency_ms
+                self.stats['latency_max_ms'] = max(self.stats['latency_max_ms'], latency_ms)
+                logger.info(f"{label} 전송 완료 (대기열 지연 {latency_ms:.0f}ms)")
+                return
+
+            if attempt + 1 >= self.max_attempts:
+                break
+            self.stats['retries'] += 1
+            logger.warning(f"{label} 전송 재시도 {attempt + 1}/{self.max_attempts - 1}: {reason}")
+            await asyncio.sleep(delay)
+
+        self.stats['failed'] += 1
+        logger.error(f"{label} 전송 실패 ({self.max_attempts}회 시도): {reason}")
+
+    def _task_done(self):
+        with self._done:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._done.notify_all()
+
+    def drain(self, timeout: float) -> bool:
+        """남은 메시지가 모두 처리될 때까지 대기 (timeout 안에 끝나면 True)"""
+        with self._done:
+            return self._done.wait_for(lambda: self._unfinished <= 0, timeout)
+
+    async def stop(self):
+        """디스패처 중지 (남은 메시지는 버림, 이벤트 루프에서 호출)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._pending.clear()
+        with self._done:
+            self._unfinished = 0
+            self._done.notify_all()
+
+    def get_stats(self) -> Dict[str, float]:
+        """누적 통계 + 현재 대기열 길이와 평균 지연"""
+        stats = dict(self.stats)
+        stats['depth'] = self.depth
+        stats['latency_avg_ms'] = stats['latency_total_ms'] / stats['sent'] if stats['sent'] else 0.0
+        return stats
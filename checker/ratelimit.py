@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+요청 속도 제한 모듈
+
+사이트로 나가는 모든 요청(예약 페이지 GET, 테마 API POST, CSRF 재발급)이
+하나의 토큰 버킷을 거치도록 해서, 동시 수집이나 짧은 체크 간격에서도
+지속 요청 속도(RATE_LIMIT_PER_SECOND)와 순간 허용량(RATE_LIMIT_BURST)을 넘지 않게 한다.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Any, Dict
+from loguru import logger
+
+from .config import RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷
+
+    요청마다 토큰 1개를 예약하고, 토큰이 모자라면 채워질 때까지 기다린다.
+    예약은 잠금 안에서 순서대로 이루어지므로 기다리는 요청은 도착 순서대로 나간다.
+    동기 코드는 acquire(), 이벤트 루프 안에서는 acquire_async()를 사용.
+    rate가 0 이하면 제한 없이 통과시키고 통계만 집계함.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 대기 통계 (누적)
+        self.stats = {
+            'acquired': 0,
+            'waited': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _reserve(self) -> float:
+        """토큰 1개를 예약하고 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            self.stats['acquired'] += 1
+            if not self.enabled:
+                return 0.0
+
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 토큰이 음수가 되면 앞선 예약들이 다 나간 뒤의 차례를 뜻함
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            if wait > 0:
+                self.stats['waited'] += 1
+                self.stats['wait_total'] += wait
+                self.stats['wait_max'] = max(self.stats['wait_max'], wait)
+            return wait
+
+    def acquire(self) -> float:
+        """토큰을 얻을 때까지 블로킹 (기다린 시간 반환)"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """토큰을 얻을 때까지 대기 (이벤트 루프는 막지 않음, 기다린 시간 반환)"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """누적 대기 통계와 현재 설정"""
+        with self._lock:
+            stats = dict(self.stats)
+            if self.enabled:
+                elapsed = time.monotonic() - self._updated
+                stats['tokens'] = round(min(self.burst, self._tokens + elapsed * self.rate), 2)
+        stats['rate'] = self.rate
+        stats['burst'] = self.burst
+        stats['wait_avg'] = stats['wait_total'] / stats['waited'] if stats['waited'] else 0.0
+        return stats
+
+
+# 전역 속도 제한기 (동기/비동기 fetcher가 함께 사용)
+_rate_limiter = None
+
+
+def get_rate_limiter() -> TokenBucket:
+    """전역 속도 제한기 반환"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = TokenBucket()
+        if _rate_limiter.enabled:
+            logger.info(f"🚦 요청 속도 제한: 초당 {_rate_limiter.rate}회, 순간 최대 {_rate_limiter.burst}회")
+        else:
+            logger.info("🚦 요청 속도 제한 없음 (RATE_LIMIT_PER_SECOND=0)")
+    return _rate_limiter
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 초당 5회, 순간 3회로 10개 요청 → 처음 3개는 즉시, 이후 0.2초 간격
+    bucket = TokenBucket(rate=5, burst=3)
+    started = time.monotonic()
+    for i in range(10):
+        waited = bucket.acquire()
+        print(f"요청 {i + 1}: {time.monotonic() - started:.2f}초 (대기 {waited:.2f}초)")
+    print(f"통계: {bucket.get_stats()}")
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+사이트 응답 캡처 및 재생 모듈
+
+CAPTURE_DIR을 설정하면 fetcher가 받은 예약 페이지/API 응답을 헤더, 소요 시간과 함께
+압축된 내용 주소(content-addressed) 아카이브에 저장한다.
+저장한 아카이브는 로컬 재생 서버로 /reservation, /reservation/theme 경로에 그대로 돌려줄 수 있어,
+ZEROWORLD_BASE_URL을 재생 서버로 지정하면 실제 사이트 없이 전체 파이프라인을 실행할 수 있다.
+
+아카이브 구조:
+    <root>/index.jsonl            요청 1건당 JSON 한 줄 (메서드, 경로, 날짜, 상태, 헤더, 소요 시간, blob)
+    <root>/blobs/ab/abcdef....gz  응답 본문 (sha256 이름, gzip 압축, 같은 본문은 한 번만 저장)
+
+사용법:
+    CAPTURE_DIR=captures python -m checker.main --once      # 캡처
+    python -m checker.replay info captures                   # 아카이브 요약
+    python -m checker.replay serve captures --port 8765 --latency 0.2 --error-rate 0.05
+    ZEROWORLD_BASE_URL=http://127.0.0.1:8765 python -m checker.main --once
+"""
+
+import sys
+import gzip
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from aiohttp import web
+from loguru import logger
+
+# 본문을 디코딩된 상태로 저장하므로 재생 시 의미가 달라지는 헤더와 쿠키는 기록하지 않음
+_SKIPPED_HEADERS = {
+    'content-length', 'content-encoding', 'transfer-encoding', 'connection',
+    'keep-alive', 'set-cookie', 'date', 'server'
+}
+
+
+class CaptureArchive:
+    """압축된 내용 주소 방식의 응답 아카이브"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.index_file = self.root / 'index.jsonl'
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def write_blob(self, body: bytes) -> str:
+        """본문 저장 후 sha256 다이제스트 반환 (이미 있으면 저장 생략)"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = path.with_suffix('.tmp')
+            temp_file.write_bytes(gzip.compress(body, compresslevel=6))
+            temp_file.replace(path)
+        return digest
+
+    def read_blob(self, digest: str) -> bytes:
+        return gzip.decompress(self._blob_path(digest).read_bytes())
+
+    def record(self, method: str, url: str, form: Optional[Mapping[str, Any]], status: int,
+               headers: Mapping[str, str], body: bytes, elapsed: float):
+        """
+        응답 한 건 기록
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL (쿼리 포함)
+            form: POST 폼 데이터 (reservationDate로 날짜 판별)
+            status: HTTP 상태 코드
+            headers: 응답 헤더
+            body: 디코딩된 응답 본문
+            elapsed: 요청 소요 시간 (초)
+        """
+        parts = urlsplit(url)
+        date = (form or {}).get('reservationDate') or parse_qs(parts.query).get('date', [None])[0]
+
+        entry = {
+            'ts': round(time.time(), 3),
+            'method': method.upper(),
+            'path': parts.path or '/',
+            'date': date,
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in _SKIPPED_HEADERS},
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'size': len(body),
+            'blob': self.write_blob(body)
+        }
+
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """기록된 순서대로 전체 인덱스"""
+        if not self.index_file.exists():
+            return []
+
+        entries = []
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"캡처 인덱스 {line_no}번째 줄 손상 - 건너뜀")
+        return entries
+
+
+# --- 재생 서버 ---
+
+class ReplayServer:
+    """
+    아카이브 응답을 /reservation, /reservation/theme 경로로 재생하는 로컬 HTTP 서버
+
+    같은 (경로, 날짜)에 캡처가 여러 개면 기본은 가장 마지막 캡처를 돌려주고,
+    sequence=True면 요청마다 기록 순서대로 다음 캡처를 돌려줌 (마지막에서 멈춤)
+    """
+
+    def __init__(self, archive: CaptureArchive, latency: float = 0.0, jitter: float = 0.0,
+                 recorded_timing: bool = False, error_rate: float = 0.0, error_status: int = 500,
+                 csrf_reject_rate: float = 0.0, sequence: bool = False, seed: Optional[int] = None):
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_timing = recorded_timing
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.csrf_reject_rate = csrf_reject_rate
+        self.sequence = sequence
+        self._random = random.Random(seed)
+
+        self._captures: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+        for entry in archive.entries():
+            if entry.get('status') == 200:
+                self._captures.setdefault((entry['path'], entry.get('date')), []).append(entry)
+        self._positions: Dict[Tuple[str, Optional[str]], int] = {}
+        self.stats = {'requests': 0, 'served': 0, 'not_modified': 0, 'injected_errors': 0, 'missing': 0}
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/reservation', self.handle_page)
+        app.router.add_post('/reservation/theme', self.handle_theme_api)
+        return app
+
+    def _pick(self, path: str, date: Optional[str]) -> Optional[Dict[str, Any]]:
+        """(경로, 날짜)에 해당하는 캡처 선택 (날짜 없는 페이지 요청은 아무 페이지 캡처로 대체)"""
+        key = (path, date)
+        captures = self._captures.get(key)
+        if not captures and date is None:
+            captures = next((c for (p, _), c in self._captures.items() if p == path), None)
+        if not captures:
+            return None
+
+        if not self.sequence:
+            return captures[-1]
+
+        position = self._positions.get(key, 0)
+        self._positions[key] = min(position + 1, len(captures) - 1)
+        return captures[position]
+
+    async def _delay(self, entry: Optional[Dict[str, Any]]):
+        delay = self.latency
+        if self.recorded_timing and entry:
+            delay = entry.get('elapsed_ms', 0) / 1000
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _respond(self, request: web.Request, path: str, date: Optional[str]) -> web.Response:
+        self.stats['requests'] += 1
+        entry = self._pick(path, date)
+        await self._delay(entry)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats['injected_errors'] += 1
+            return web.Response(status=self.error_status, text="injected error")
+
+        if entry is None:
+            self.stats['missing'] += 1
+            logger.warning(f"재생할 캡처 없음: {path} date={date}")
+            return web.Response(status=404, text="no capture")
+
+        headers = dict(entry.get('headers', {}))
+        etag = headers.get('ETag') or headers.get('Etag')
+        if etag and request.headers.get('If-None-Match') == etag:
+            self.stats['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+
+        self.stats['served'] += 1
+        return web.Response(status=200, body=self.archive.read_blob(entry['blob']), headers=headers)
+
+    async def handle_page(self, request: web.Request) -> web.Response:
+        return await self._respond(request, '/reservation', request.query.get('date'))
+
+    async def handle_theme_api(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if self.csrf_reject_rate and self._random.random() < self.csrf_reject_rate:
+            self.stats['injected_errors'] += 1
+            return web.Response(status=419, text="CSRF token mismatch")
+        return await self._respond(request, '/reservation/theme', form.get('reservationDate'))
+
+
+def print_info(archive: CaptureArchive):
+    """아카이브 요약 출력"""
+    entries = archive.entries()
+    if not entries:
+        print(f"캡처 없음: {archive.root}")
+        return
+
+    blobs = {entry['blob'] for entry in entries}
+    stored = sum(p.stat().st_size for p in archive.blob_dir.rglob('*.gz'))
+    raw = sum(entry['size'] for entry in entries)
+    dates = sorted({entry['date'] for entry in entries if entry.get('date')})
+    elapsed = sorted(entry['elapsed_ms'] for entry in entries)
+
+    print(f"아카이브: {archive.root}")
+    print(f"  요청 {len(entries)}건, 고유 본문 {len(blobs)}개")
+    print(f"  본문 합계 {raw / 1024:.1f} KB -> 저장 {stored / 1024:.1f} KB")
+    print(f"  날짜 {len(dates)}개 ({dates[0] if dates else '-'} ~ {dates[-1] if dates else '-'})")
+    print(f"  소요 시간 중앙값 {elapsed[len(elapsed) // 2]:.1f}ms, 최대 {elapsed[-1]:.1f}ms")
+
+
+def main():
+    """캡처 아카이브 조회 및 재생 서버 실행"""
+    parser = argparse.ArgumentParser(description='제로월드 응답 캡처 재생')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help='아카이브 요약')
+    info_parser.add_argument('archive')
+
+    serve_parser = subparsers.add_parser('serve', help='아카이브 재생 서버 실행')
+    serve_parser.add_argument('archive')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (초)')
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help='추가 무작위 지연 상한 (초)')
+    serve_parser.add_argument('--recorded-timing', action='store_true', help='캡처 당시 소요 시간으로 지연')
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율 (0~1)')
+    serve_parser.add_argument('--error-status', type=int, default=500)
+    serve_parser.add_argument('--csrf-reject-rate', type=float, default=0.0, help='API 419 응답 비율 (0~1)')
+    serve_parser.add_argument('--sequence', action='store_true', help='같은 날짜의 캡처를 기록 순서대로 재생')
+    serve_parser.add_argument('--seed', type=int, default=None, help='지연/오류 난수 시드 (재현용)')
+
+    args = parser.parse_args()
+    archive = CaptureArchive(Path(args.archive))
+
+    if args.command == 'info':
+        print_info(archive)
+        return
+
+    server = ReplayServer(
+        archive, latency=args.latency, jitter=args.jitter, recorded_timing=args.recorded_timing,
+        error_rate=args.error_rate, error_status=args.error_status,
+        csrf_reject_rate=args.csrf_reject_rate, sequence=args.sequence, seed=args.seed
+    )
+    if not server._captures:
+        logger.error(f"재생할 캡처가 없습니다: {archive.root}")
+        sys.exit(1)
+
+    logger.info(f"🎞️ 재생 서버 시작: http://{args.host}:{args.port} ({len(server._captures)}개 경로/날짜)")
+    try:
+        web.run_app(server.build_app(), host=args.host, port=args.port, print=None)
+    finally:
+        logger.info(f"재생 서버 종료 - 통계: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
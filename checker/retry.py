@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+요청 재시도 및 서킷 브레이커 모듈
+
+일시적인 네트워크 오류/5xx/429 응답은 지수 백오프(+지터)로 몇 번 더 시도하고,
+연속 실패가 쌓이면 서킷 브레이커를 열어 한동안 사이트에 요청을 보내지 않는다.
+RESET 시간이 지나면 요청 하나만 시험(half-open)으로 보내고, 성공하면 다시 닫는다.
+"""
+
+import time
+import random
+import threading
+from enum import Enum
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from .config import (
+    RETRY_BACKOFF_BASE_SECONDS, RETRY_BACKOFF_MAX_SECONDS,
+    BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+)
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BACKOFF_BASE_SECONDS,
+                  cap: float = RETRY_BACKOFF_MAX_SECONDS) -> float:
+    """
+    attempt번째 재시도 전 대기 시간 (0부터 시작, full jitter)
+
+    상한 min(cap, base * 2^attempt) 안에서 균등 분포로 골라
+    여러 날짜가 동시에 실패해도 재시도가 한꺼번에 몰리지 않게 함
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+class BreakerState(Enum):
+    """서킷 브레이커 상태"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    @property
+    def label(self) -> str:
+        """/status 표시용 한글 이름"""
+        return _STATE_LABELS[self]
+
+
+_STATE_LABELS = {
+    BreakerState.CLOSED: "닫힘 (정상)",
+    BreakerState.OPEN: "열림 (요청 차단)",
+    BreakerState.HALF_OPEN: "반열림 (시험 요청 중)"
+}
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커 (스레드 안전)
+
+    - 닫힘: 모든 요청 허용, 연속 실패가 failure_threshold에 닿으면 열림
+    - 열림: reset_seconds 동안 모든 요청 차단
+    - 반열림: 시험 요청 하나만 허용, 성공하면 닫힘 / 실패하면 다시 열림
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        # 누적 통계
+        self.stats = {'trips': 0, 'rejected': 0}
+
+    def allow_request(self) -> bool:
+        """지금 요청을 보내도 되는지 확인 (반열림이면 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self.state is BreakerState.CLOSED:
+                return True
+
+            if self.state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = BreakerState.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("🧯 서킷 브레이커 반열림 - 시험 요청 1회 전송")
+
+            if self.state is BreakerState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        """요청 성공 (사이트가 응답함)"""
+        with self._lock:
+            if self.state is not BreakerState.CLOSED:
+                logger.info("🧯 서킷 브레이커 닫힘 - 사이트 응답 회복")
+            self.state = BreakerState.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """요청 실패 (네트워크 오류, 5xx, 429)"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if self.state is BreakerState.HALF_OPEN or (
+                self.state is BreakerState.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = BreakerState.OPEN
+                self._opened_at = time.monotonic()
+                self.stats['trips'] += 1
+                logger.warning(
+                    f"🧯 서킷 브레이커 열림 - 연속 실패 {self.consecutive_failures}회, "
+                    f"{self.reset_seconds:.0f}초 동안 요청 중단"
+                )
+
+    def release(self):
+        """결과를 판단할 수 없이 끝난 시험 요청 반납 (취소 등)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        """열림 상태에서 시험 요청까지 남은 시간 (초)"""
+        with self._lock:
+            if self.state is not BreakerState.OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """현재 상태와 누적 통계"""
+        stats = dict(self.stats)
+        stats['state'] = self.state.value
+        stats['consecutive_failures'] = self.consecutive_failures
+        stats['retry_in'] = round(self.retry_in(), 1)
+        return stats
+
+
+# 전역 서킷 브레이커 (동기/비동기 fetcher가 함께 사용)
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """전역 서킷 브레이커 반환"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 3회 연속 실패로 열림 → 1초 후 반열림 → 시험 요청 성공으로 닫힘
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=1)
+    for _ in range(3):
+        breaker.allow_request()
+        breaker.record_failure()
+    print(f"실패 3회 후: {breaker.get_stats()}")
+    print(f"열림 중 요청 허용: {breaker.allow_request()}")
+
+    time.sleep(1.1)
+    print(f"시험 요청 허용: {breaker.allow_request()}, 두 번째 요청 허용: {breaker.allow_request()}")
+    breaker.record_success()
+    print(f"시험 요청 성공 후: {breaker.get_stats()}")
+
+    print("백오프 상한 (0.5초 기준):", [round(min(8, 0.5 * 2 ** a), 1) for a in range(6)])
+    print("백오프 예시:", [round(backoff_delay(a), 2) for a in range(6)])
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+날짜별 우선순위 폴링 스케줄러 모듈
+
+모든 날짜를 같은 주기로 훑는 대신, 날짜마다 다음 확인 시각을 따로 두고
+가까운 날짜와 최근에 변화가 있었던 날짜를 더 자주 확인한다.
+전체 요청량은 분당 요청 예산(RequestBudget)을 넘지 않도록 제한한다.
+"""
+
+import time
+import heapq
+import threading
+import datetime as dt
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from loguru import logger
+
+from .config import (
+    REQUEST_BUDGET_PER_MINUTE, PRIORITY_HOT_INTERVAL_SECONDS, PRIORITY_COLD_INTERVAL_SECONDS,
+    PRIORITY_HORIZON_DAYS, PRIORITY_RECENT_CHANGE_SECONDS, BURST_INTERVAL_SECONDS, BURST_WINDOW_SECONDS,
+    BURST_BUDGET_PER_MINUTE
+)
+
+
+class RequestBudget:
+    """최근 60초 동안의 요청 수로 관리하는 전역 요청 예산 (슬라이딩 윈도우, 여러 스레드에서 호출 가능)"""
+
+    WINDOW_SECONDS = 60
+
+    def __init__(self, per_minute: int = REQUEST_BUDGET_PER_MINUTE):
+        self.per_minute = per_minute
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._events and self._events[0][0] <= now - self.WINDOW_SECONDS:
+            _, count = self._events.popleft()
+            self._used -= count
+
+    def used(self, now: Optional[float] = None) -> int:
+        """최근 60초 동안 사용한 요청 수"""
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+            return self._used
+
+    def available(self, now: Optional[float] = None) -> int:
+        """지금 더 쓸 수 있는 요청 수"""
+        return max(0, self.per_minute - self.used(now))
+
+    def record(self, count: int, now: Optional[float] = None):
+        """실제로 보낸 요청 수 기록"""
+        if count <= 0:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            self._events.append((now, count))
+            self._used += count
+
+
+class DatePollScheduler:
+    """
+    날짜별 다음 확인 시각을 우선순위 큐로 관리하는 스케줄러
+
+    - 오늘/내일은 PRIORITY_HOT_INTERVAL_SECONDS 주기
+    - 그 이후는 PRIORITY_HORIZON_DAYS까지 PRIORITY_COLD_INTERVAL_SECONDS로 선형 증가
+    - 최근 PRIORITY_RECENT_CHANGE_SECONDS 안에 변화가 있었던 날짜는 주기 절반
+    - 슬롯이 새로 열린 날짜는 버스트: BURST_WINDOW_SECONDS 동안 BURST_INTERVAL_SECONDS 주기,
+      이후 같은 시간에 걸쳐 평소 주기로 선형 복귀
+
+    전체 확인 모드의 버스트 재확인(pop_due(burst_only=True))은 burst_budget을 따로 씀.
+    한 번에 모든 날짜를 훑는 전체 확인 요청이 같은 예산을 다 써 버리면 버스트가 필요한 바로 그때 밀리기 때문.
+
+    전체 확인 작업과 버스트 재확인 작업이 서로 다른 스케줄러 스레드에서 호출하므로
+    예정 시각/버스트 정보는 모두 _lock 안에서만 읽고 고친다.
+    """
+
+    def __init__(self, budget: Optional[RequestBudget] = None,
+                 burst_budget: Optional[RequestBudget] = None,
+                 hot_interval: float = PRIORITY_HOT_INTERVAL_SECONDS,
+                 cold_interval: float = PRIORITY_COLD_INTERVAL_SECONDS,
+                 horizon_days: int = PRIORITY_HORIZON_DAYS,
+                 recent_change_seconds: float = PRIORITY_RECENT_CHANGE_SECONDS,
+                 burst_interval: float = BURST_INTERVAL_SECONDS,
+                 burst_window: float = BURST_WINDOW_SECONDS):
+        self.budget = budget or RequestBudget()
+        self.burst_budget = burst_budget or RequestBudget(BURST_BUDGET_PER_MINUTE)
+        self.hot_interval = hot_interval
+        self.cold_interval = max(cold_interval, hot_interval)
+        self.horizon_days = max(1, horizon_days)
+        self.recent_change_seconds = recent_change_seconds
+        self.burst_interval = burst_interval
+        self.burst_window = burst_window
+
+        self._heap: List[Tuple[float, str]] = []
+        self._next_due: Dict[str, float] = {}
+        self._last_change: Dict[str, float] = {}
+        self._burst_started: Dict[str, float] = {}
+        # 날짜 하나를 확인하는 데 드는 요청 수 추정치 (지연 HTML 요청이면 1~2)
+        self.cost_per_date = 2.0
+        # 공개 메서드끼리 서로 호출하므로 재진입 가능한 잠금
+        self._lock = threading.RLock()
+
+    def _push(self, date: str, due: float):
+        """예정 시각 설정 (호출자가 _lock을 잡고 있어야 함)"""
+        self._next_due[date] = due
+        heapq.heappush(self._heap, (due, date))
+
+        # 재스케줄로 무효가 된 항목이 쌓이면 현재 예정 시각으로 힙 재구성
+        if len(self._heap) > 4 * len(self._next_due) + 16:
+            self._heap = [(due, date) for date, due in self._next_due.items()]
+            heapq.heapify(self._heap)
+
+    def sync_dates(self, dates: List[str], now: Optional[float] = None):
+        """감시 날짜 목록 반영 (새 날짜는 즉시 확인 대상, 빠진 날짜는 제거)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            wanted = set(dates)
+
+            for date in list(self._next_due):
+                if date not in wanted:
+                    del self._next_due[date]
+                    self._last_change.pop(date, None)
+                    self._burst_started.pop(date, None)
+
+            for date in dates:
+                if date not in self._next_due:
+                    self._push(date, now)
+
+    def interval_for(self, date: str, now: Optional[float] = None) -> float:
+        """날짜의 확인 주기 (초)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            today = dt.date.fromtimestamp(now)
+            days_ahead = (dt.date.fromisoformat(date) - today).days
+
+            # 오늘/내일은 가장 짧은 주기, 이후 horizon까지 선형으로 늘어남
+            ratio = min(max(days_ahead - 1, 0) / self.horizon_days, 1.0)
+            interval = self.hot_interval + (self.cold_interval - self.hot_interval) * ratio
+
+            last_change = self._last_change.get(date)
+            if last_change is not None and now - last_change < self.recent_change_seconds:
+                interval = max(self.hot_interval, interval / 2)
+
+            burst_started = self._burst_started.get(date)
+            if burst_started is not None:
+                elapsed = now - burst_started
+                if elapsed < self.burst_window:
+                    return min(interval, self.burst_interval)
+                if elapsed < self.burst_window * 2:
+                    # 버스트 종료 후 평소 주기로 선형 복귀
+                    ratio = (elapsed - self.burst_window) / self.burst_window
+                    return min(interval, self.burst_interval + (interval - self.burst_interval) * ratio)
+                del self._burst_started[date]
+
+            return interval
+
+    def is_bursting(self, date: str, now: Optional[float] = None) -> bool:
+        """버스트(또는 복귀 구간) 중인 날짜인지 확인"""
+        now = time.time() if now is None else now
+        with self._lock:
+            burst_started = self._burst_started.get(date)
+            return burst_started is not None and now - burst_started < self.burst_window * 2
+
+    def start_burst(self, date: str, now: Optional[float] = None):
+        """슬롯이 새로 열린 날짜를 버스트 주기로 재확인하도록 등록"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self.is_bursting(date, now):
+                logger.info(f"⚡ 버스트 시작: {date} ({self.burst_window:.0f}초 동안 {self.burst_interval:.0f}초 주기)")
+            self._burst_started[date] = now
+
+            due = now + self.burst_interval
+            if self._next_due.get(date, float('inf')) > due:
+                self._push(date, due)
+
+    def pop_due(self, now: Optional[float] = None, burst_only: bool = False) -> List[str]:
+        """
+        확인 시각이 된 날짜를 오래 기다린 순서대로 꺼내기 (요청 예산 안에서만)
+
+        예산이 부족해 꺼내지 못한 날짜는 큐에 남아 다음 틱에 우선 처리됨
+
+        Args:
+            burst_only: True면 버스트 중인 날짜만 burst_budget 안에서 꺼냄 (전체 확인 모드에서 사용)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            budget = self.burst_budget if burst_only else self.budget
+            affordable = int(budget.available(now) // max(self.cost_per_date, 1.0))
+
+            if burst_only:
+                due_dates = sorted(
+                    (date for date, due in self._next_due.items()
+                     if due <= now and self.is_bursting(date, now)),
+                    key=self._next_due.get
+                )
+                if len(due_dates) > affordable:
+                    logger.info(
+                        f"버스트 요청 예산 부족으로 {len(due_dates) - affordable}개 버스트 날짜 확인 연기 "
+                        f"(사용 {budget.used(now)}/{budget.per_minute})"
+                    )
+                    due_dates = due_dates[:affordable]
+                for date in due_dates:
+                    del self._next_due[date]
+                return due_dates
+
+            due_dates = []
+
+            while self._heap and self._heap[0][0] <= now and len(due_dates) < affordable:
+                due, date = heapq.heappop(self._heap)
+                # 재스케줄로 무효가 된 항목은 건너뜀
+                if self._next_due.get(date) != due:
+                    continue
+                due_dates.append(date)
+                del self._next_due[date]
+
+            deferred = sum(1 for due, date in self._heap if due <= now and self._next_due.get(date) == due)
+            if deferred:
+                logger.info(f"요청 예산 부족으로 {deferred}개 날짜 확인 연기 (사용 {self.budget.used(now)}/{self.budget.per_minute})")
+
+            return due_dates
+
+    def record_result(self, date: str, changed: bool, now: Optional[float] = None):
+        """날짜 확인 결과 반영 후 다음 확인 시각 재설정"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if changed:
+                self._last_change[date] = now
+            self._push(date, now + self.interval_for(date, now))
+
+    def record_cost(self, requests: int, dates: int, now: Optional[float] = None, burst: bool = False):
+        """실제 사용한 요청 수를 예산(burst면 버스트 예산)에 기록하고 날짜당 비용 추정치 갱신"""
+        with self._lock:
+            (self.burst_budget if burst else self.budget).record(requests, now)
+            if dates > 0:
+                self.cost_per_date = 0.8 * self.cost_per_date + 0.2 * (requests / dates)
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """다음 확인 예정까지 남은 시간 (초)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._next_due:
+                return None
+            return max(0.0, min(self._next_due.values()) - now)
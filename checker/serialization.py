@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+상태 파일 직렬화 모듈
+
+상태 파일(state.json 스냅샷)을 어떤 형식으로 쓸지 고르는 직렬화기 모음.
+- json-pretty: 예전 형식 (들여쓰기 2칸, 사람이 읽기 쉬움)
+- json: 공백 없는 JSON (orjson이 설치되어 있으면 orjson으로 인코딩/디코딩)
+- binary: 매직 헤더 + 슬롯을 (epoch 정수, 상태 코드) 배열로 저장하는 이진 형식
+
+읽을 때는 형식을 자동으로 판별하므로 STATE_FORMAT을 바꿔도 기존 파일을 그대로 읽는다.
+"""
+
+import json
+import struct
+from abc import ABC, abstractmethod
+import datetime as dt
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from .models import SlotStatus
+
+# 이진 형식 파일 첫 바이트 (JSON은 '{' 또는 공백으로 시작하므로 겹치지 않음)
+BINARY_MAGIC = b"ZWST"
+BINARY_VERSION = 1
+
+_EPOCH_DATE = dt.date(1970, 1, 1)
+_STATUS_CODES = {status.label: int(status) for status in SlotStatus}
+_STATUS_LABELS = {code: label for label, code in _STATUS_CODES.items()}
+
+
+class Serializer(ABC):
+    """상태 직렬화기 기본 클래스 (encode/decode를 모두 구현해야 인스턴스를 만들 수 있음)"""
+
+    name = ""
+
+    @abstractmethod
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        """상태를 파일에 쓸 바이트로 변환"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """파일 내용을 상태로 변환 (손상되면 ValueError)"""
+
+
+class JsonSerializer(Serializer):
+    """표준 라이브러리 json (pretty=True면 예전 state.json 형식)"""
+
+    def __init__(self, pretty: bool = False):
+        self.pretty = pretty
+        self.name = "json-pretty" if pretty else "json"
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        if self.pretty:
+            return json.dumps(state, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(state, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson (공백 없는 UTF-8 JSON, 표준 json과 같은 결과를 더 빠르게)"""
+
+    name = "orjson"
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        return orjson.dumps(state)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return orjson.loads(data)
+
+
+@lru_cache(maxsize=4096)
+def _day_number(date_str: str) -> Optional[int]:
+    """"YYYY-MM-DD"를 1970-01-01부터의 일 수로 변환 (형식이 다르면 None)"""
+    try:
+        day = (dt.date.fromisoformat(date_str) - _EPOCH_DATE).days
+    except ValueError:
+        return None
+    return day if _day_string(day) == date_str else None
+
+
+@lru_cache(maxsize=4096)
+def _day_string(day: int) -> str:
+    """1970-01-01부터의 일 수를 "YYYY-MM-DD"로 변환"""
+    return (_EPOCH_DATE + dt.timedelta(days=day)).isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _time_seconds(time_str: str) -> Optional[int]:
+    """"HH:MM:SS"를 자정부터의 초로 변환 (형식이 다르면 None)"""
+    try:
+        seconds = int(time_str[0:2]) * 3600 + int(time_str[3:5]) * 60 + int(time_str[6:8])
+    except ValueError:
+        return None
+    if not 0 <= seconds < 86400 or _time_string(seconds) != time_str:
+        return None
+    return seconds
+
+
+@lru_cache(maxsize=4096)
+def _time_string(seconds: int) -> str:
+    """자정부터의 초를 "HH:MM:SS"로 변환"""
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def _key_epoch(slot_key: str) -> Optional[int]:
+    """
+    슬롯 키 "YYYY-MM-DD HH:MM:SS"를 시간대와 무관한 epoch 초로 변환
+
+    키를 벽시계 시각 그대로 UTC로 취급하므로 서버 시간대가 달라도 같은 값이 되고,
+    되돌린 문자열이 원래 키와 정확히 같을 때만 변환값을 돌려줌 (아니면 None).
+    날짜/시각 부분은 종류가 많지 않아 캐시로 처리함
+    """
+    if len(slot_key) != 19 or slot_key[10] != ' ':
+        return None
+    day = _day_number(slot_key[:10])
+    seconds = _time_seconds(slot_key[11:])
+    if day is None or seconds is None:
+        return None
+    epoch = day * 86400 + seconds
+    return epoch if 0 <= epoch < 2 ** 32 else None
+
+
+def _epoch_key(epoch: int) -> str:
+    """_key_epoch의 역변환"""
+    day, seconds = divmod(epoch, 86400)
+    return f"{_day_string(day)} {_time_string(seconds)}"
+
+
+class BinarySerializer(Serializer):
+    """
+    이진 형식
+
+    BINARY_MAGIC | 버전(u8) | 메타 길이(u32) + 메타 JSON | 테마 수(u16) |
+    테마마다: 이름 길이(u16) + 이름 | 슬롯 수(u32) | epoch(u32) 배열 | 상태 코드(u8) 배열
+
+    메타 JSON에는 themes를 뺀 나머지 키(dates, last_updated 등)와
+    배열로 나타낼 수 없는 슬롯(형식이 다른 키, 알 수 없는 상태)이 "_extra"로 들어감.
+    정수는 모두 리틀 엔디언.
+    """
+
+    name = "binary"
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        meta = {key: value for key, value in state.items() if key not in ('themes', 'slots')}
+        themes = state.get('themes')
+        if themes is None and 'slots' in state:
+            # 단일 테마 시절 형식은 그대로 보존
+            meta['slots'] = state['slots']
+            themes = {}
+
+        extra: Dict[str, Dict[str, str]] = {}
+        parts: List[bytes] = []
+        for theme, slots in (themes or {}).items():
+            epochs, codes = [], []
+            for slot_key, status in slots.items():
+                epoch = _key_epoch(slot_key)
+                code = _STATUS_CODES.get(status)
+                if epoch is None or code is None:
+                    extra.setdefault(theme, {})[slot_key] = status
+                    continue
+                epochs.append(epoch)
+                codes.append(code)
+
+            name = theme.encode('utf-8')
+            parts.append(struct.pack('<H', len(name)))
+            parts.append(name)
+            parts.append(struct.pack(f'<I{len(epochs)}I', len(epochs), *epochs))
+            parts.append(bytes(codes))
+        if extra:
+            meta['_extra'] = extra
+
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        header = BINARY_MAGIC + struct.pack('<BI', BINARY_VERSION, len(meta_bytes)) + meta_bytes
+        return header + struct.pack('<H', len(themes or {})) + b''.join(parts)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        if not data.startswith(BINARY_MAGIC):
+            raise ValueError("이진 상태 파일 헤더가 아님")
+        try:
+            offset = len(BINARY_MAGIC)
+            version, meta_length = struct.unpack_from('<BI', data, offset)
+            if version != BINARY_VERSION:
+                raise ValueError(f"지원하지 않는 이진 상태 파일 버전: {version}")
+            offset += 5
+            meta = json.loads(data[offset:offset + meta_length])
+            offset += meta_length
+
+            extra = meta.pop('_extra', {})
+            (theme_count,) = struct.unpack_from('<H', data, offset)
+            offset += 2
+
+            themes: Dict[str, Dict[str, str]] = {}
+            for _ in range(theme_count):
+                (name_length,) = struct.unpack_from('<H', data, offset)
+                offset += 2
+                theme = data[offset:offset + name_length].decode('utf-8')
+                offset += name_length
+                (count,) = struct.unpack_from('<I', data, offset)
+                offset += 4
+                epochs = struct.unpack_from(f'<{count}I', data, offset)
+                offset += 4 * count
+                codes = data[offset:offset + count]
+                if len(codes) != count:
+                    raise ValueError("이진 상태 파일이 잘림")
+                offset += count
+                themes[theme] = {
+                    _epoch_key(epoch): _STATUS_LABELS[code] for epoch, code in zip(epochs, codes)
+                }
+
+            for theme, slots in extra.items():
+                themes.setdefault(theme, {}).update(slots)
+        except (struct.error, KeyError, UnicodeDecodeError) as e:
+            raise ValueError(f"이진 상태 파일 손상: {e}") from e
+
+        if themes or 'slots' not in meta:
+            meta['themes'] = themes
+        return meta
+
+
+_JSON = OrjsonSerializer() if ORJSON_AVAILABLE else JsonSerializer()
+_SERIALIZERS = {
+    'json': _JSON,
+    'json-pretty': JsonSerializer(pretty=True),
+    'binary': BinarySerializer()
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """이름으로 직렬화기 선택 (json은 orjson이 있으면 orjson, 알 수 없는 이름은 json)"""
+    serializer = _SERIALIZERS.get(name)
+    if serializer is None:
+        logger.warning(f"알 수 없는 STATE_FORMAT '{name}' - json 사용")
+        serializer = _JSON
+    return serializer
+
+
+def detect_format(data: bytes) -> str:
+    """파일 내용으로 형식 판별 ('binary' 또는 'json')"""
+    return 'binary' if data.startswith(BINARY_MAGIC) else 'json'
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """형식을 자동으로 판별해 상태 디코딩 (손상되면 ValueError)"""
+    return _SERIALIZERS[detect_format(data)].decode(data)
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 형식별 왕복 확인 (이상한 키/상태와 단일 테마 형식 포함)
+    sample = {
+        'themes': {
+            "층간소음": {"2025-01-30 18:30:00": "매진", "2025-01-30 20:00:00": "예약가능",
+                     "2025-13-01 10:00:00": "예약가능", "2025-01-31 10:00:00": "확인중"},
+            "사랑하는감?": {"2025-01-30 14:20:00": "예약가능"}
+        },
+        'dates': {"2025-01-31": {"stale_since": "2025-01-29 15:25:00"}},
+        'last_updated': "2025-01-29 15:30:00"
+    }
+    legacy = {'slots': {"2025-01-30 18:30:00": "매진"}, 'last_updated': "2025-01-29 15:30:00"}
+
+    for name, serializer in _SERIALIZERS.items():
+        for label, state in (("다중 테마", sample), ("단일 테마", legacy)):
+            data = serializer.encode(state)
+            ok = decode_state(data) == state
+            print(f"{name:12s} {label}: {len(data):5d}바이트, 왕복 {'✅' if ok else '❌'}")
+    print(f"orjson 사용: {ORJSON_AVAILABLE}")
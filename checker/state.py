@@ -6,86 +6,219 @@
 변경 사항을 감지하는 기능 제공
 """
 
-import json
+import os
 import threading
-from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 
-from .config import STATE_FILE
+from .config import (
+    STATE_BACKEND, STATE_FILE, STATE_FLUSH_DELAY_SECONDS, STATE_FORMAT, STATE_PROCESS_LOCK, THEME_NAME,
+    NOTIFICATION_COOLDOWN, ALERT_REMINDER_INTERVAL_SECONDS
+)
+from .filelock import FileLock, FileLockTimeout
+from .serialization import Serializer, decode_state, get_serializer
 
 
 class StateManager:
-    """상태 관리 클래스"""
+    """
+    상태 관리 클래스
     
-    def __init__(self, state_file: Path = STATE_FILE):
+    상태는 메모리에 있는 값이 기준이고, 파일은 처음 한 번만 읽는다.
+    save()는 메모리 상태만 바꾸고 STATE_FLUSH_DELAY_SECONDS 뒤에 한 번에 파일로 기록하며
+    (그 사이의 변경은 모두 묶임), 종료 시에는 flush()로 남은 변경을 바로 기록한다.
+    
+    여러 프로세스가 같은 파일을 쓰면 (process_safe) 기록은 잠금 파일의 권고 잠금 안에서 하고,
+    마지막으로 읽거나 쓴 뒤 다른 프로세스가 파일을 바꿨으면 그 내용 위에 내 변경만 얹어 기록한 뒤
+    메모리 상태에도 다른 프로세스의 변경을 반영한다 (낙관적 읽기-수정-쓰기).
+    """
+    
+    def __init__(self, state_file: Path = STATE_FILE, flush_delay: float = STATE_FLUSH_DELAY_SECONDS,
+                 serializer: Optional[Serializer] = None, process_safe: bool = STATE_PROCESS_LOCK):
         self.state_file = Path(state_file)
-        self._lock = threading.Lock()
+        self.flush_delay = flush_delay
+        self.process_safe = process_safe
+        self._file_lock = FileLock(Path(f"{self.state_file}.lock"))
+        # 마지막으로 파일에서 읽었거나 파일에 쓴 상태와 그때의 파일 서명 (다른 프로세스 변경 감지 기준)
+        self._persisted: Dict[str, Any] = {}
+        self._persisted_signature: Optional[Tuple[int, int, int]] = None
+        # 다른 프로세스 변경을 병합한 횟수 (누적)
+        self.merges = 0
+        # 스냅샷을 쓸 형식 (읽을 때는 파일 내용으로 형식을 판별)
+        self.serializer = serializer or get_serializer(STATE_FORMAT)
+        # 메모리 상태 접근용 (읽기-수정-쓰기를 한 번에 잡을 수 있도록 재진입 가능)
+        self._lock = threading.RLock()
+        # 파일 기록이 겹치지 않도록 별도 잠금 (기록 중에도 메모리 상태는 읽을 수 있음)
+        self._write_lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         self._ensure_state_file_exists()
     
     def _ensure_state_file_exists(self):
         """상태 파일이 없으면 빈 파일 생성"""
         if not self.state_file.exists():
-            self.save({})
+            self._write_file({})
             logger.info(f"새로운 상태 파일 생성: {self.state_file}")
     
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        """상태 파일 서명 (교체될 때마다 바뀜, 파일이 없으면 None)"""
+        try:
+            stat = self.state_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    def _read_file(self) -> Dict[str, Any]:
+        """상태 파일 읽기 (메모리 상태를 처음 만들 때 호출, 읽은 내용을 다른 프로세스 변경 감지 기준으로 둠)"""
+        data, signature = self._load_snapshot()
+        self._persisted = _copy_state(data)
+        self._persisted_signature = signature
+        return data
+    
+    def _load_snapshot(self) -> Tuple[Dict[str, Any], Optional[Tuple[int, int, int]]]:
+        """상태 파일과 읽기 직전의 파일 서명 (서명을 먼저 보므로 그 사이에 바뀌면 다음 기록 때 다시 병합됨)"""
+        signature = self._signature()
+        try:
+            if signature is None:
+                logger.warning(f"상태 파일이 존재하지 않음: {self.state_file}")
+                return {}, signature
+            
+            data = decode_state(self.state_file.read_bytes())
+            
+            logger.debug(f"상태 파일 로드 완료: {len(data)}개 항목")
+            return data, signature
+            
+        except ValueError as e:
+            logger.error(f"상태 파일 파싱 오류: {e}")
+            # 백업 파일 생성 후 초기화
+            self._backup_corrupted_file()
+            return {}, self._signature()
+        except Exception as e:
+            logger.error(f"상태 파일 로드 오류: {e}")
+            return {}, signature
+    
+    def _write_file(self, state: Dict[str, Any]) -> bool:
+        """
+        상태를 파일에 기록 (기록이 겹치지 않도록 _write_lock 안에서)
+        
+        process_safe면 파일 잠금을 잡고, 다른 프로세스가 파일을 바꿨으면
+        그 내용에 마지막 기록 이후 내 변경만 병합해서 기록함 (_persisted가 병합 결과가 됨)
+        """
+        with self._write_lock:
+            if not self.process_safe:
+                if not self._write_snapshot(state):
+                    return False
+                self._persisted = state
+                return True
+            
+            try:
+                with self._file_lock:
+                    target = state
+                    if self._signature() != self._persisted_signature:
+                        theirs, _ = self._load_snapshot()
+                        target = _merge_state(self._persisted, state, theirs)
+                        self.merges += 1
+                        logger.debug("다른 프로세스가 바꾼 상태 파일에 변경 병합")
+                    
+                    if not self._write_snapshot(target):
+                        return False
+                    self._persisted = target
+                    self._persisted_signature = self._signature()
+                    return True
+            except (FileLockTimeout, OSError) as e:
+                logger.error(f"상태 파일 잠금 오류: {e}")
+                return False
+    
+    def _write_snapshot(self, state: Dict[str, Any]) -> bool:
+        """상태 전체를 파일에 기록 (임시 파일에 먼저 저장 후 원자적 교체, 호출자가 _write_lock을 잡고 있어야 함)"""
+        try:
+            # 잠금 없이 쓰는 프로세스끼리도 임시 파일이 겹치지 않도록 PID를 붙임
+            temp_file = self.state_file.with_suffix(f'.{os.getpid()}.tmp')
+            
+            temp_file.write_bytes(self.serializer.encode(state))
+            
+            # 원자적 교체 (os.replace는 Windows에서도 기존 파일을 덮어쓰므로 상태 파일이 없는 순간이 없음)
+            temp_file.replace(self.state_file)
+            
+            logger.debug(f"상태 파일 저장 완료: {len(state)}개 항목")
+            return True
+            
+        except Exception as e:
+            logger.error(f"상태 파일 저장 오류: {e}")
+            return False
+    
+    def _current(self) -> Dict[str, Any]:
+        """메모리 상태 (호출자가 _lock을 잡고 있어야 함, 처음 한 번만 파일에서 읽음)"""
+        if self._state is None:
+            self._state = self._read_file()
+        return self._state
+    
     def load(self) -> Dict[str, Any]:
         """
-        상태 파일에서 데이터 로드
+        현재 상태 데이터 (메모리 상태의 사본, 파일은 읽지 않음)
         
         Returns:
             dict: 저장된 상태 데이터
         """
         with self._lock:
-            try:
-                if not self.state_file.exists():
-                    logger.warning(f"상태 파일이 존재하지 않음: {self.state_file}")
-                    return {}
-                
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                logger.debug(f"상태 파일 로드 완료: {len(data)}개 항목")
-                return data
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"상태 파일 JSON 파싱 오류: {e}")
-                # 백업 파일 생성 후 초기화
-                self._backup_corrupted_file()
-                return {}
-            except Exception as e:
-                logger.error(f"상태 파일 로드 오류: {e}")
-                return {}
+            return _copy_state(self._current())
     
     def save(self, state: Dict[str, Any]) -> bool:
         """
-        상태 데이터를 파일에 저장
+        상태 데이터 저장 (메모리 상태를 바로 바꾸고 파일 기록은 지연)
         
         Args:
             state: 저장할 상태 데이터
             
         Returns:
-            bool: 저장 성공 여부
+            bool: 저장 성공 여부 (지연 기록이면 항상 True, 즉시 기록이면 파일 기록 결과)
         """
         with self._lock:
-            try:
-                # 임시 파일에 먼저 저장 후 원자적 이동
-                temp_file = self.state_file.with_suffix('.tmp')
-                
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(state, f, indent=2, ensure_ascii=False)
-                
-                # 원자적 이동 (Windows에서는 기존 파일 삭제 후 이동)
-                if self.state_file.exists():
-                    self.state_file.unlink()
-                temp_file.replace(self.state_file)
-                
-                logger.debug(f"상태 파일 저장 완료: {len(state)}개 항목")
+            self._state = _copy_state(state)
+            return self._mark_dirty()
+    
+    def _mark_dirty(self) -> bool:
+        """메모리 상태가 바뀌었음을 표시하고 파일 기록 예약 (호출자가 _lock을 잡고 있어야 함)"""
+        self._dirty = True
+        if self.flush_delay <= 0:
+            return self.flush()
+        
+        # 이미 예약된 기록이 있으면 그때 함께 기록됨
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return True
+    
+    def flush(self) -> bool:
+        """
+        아직 기록하지 않은 변경을 바로 파일에 기록
+        
+        Returns:
+            bool: 기록 성공 여부 (기록할 변경이 없으면 True)
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
                 return True
-                
-            except Exception as e:
-                logger.error(f"상태 파일 저장 오류: {e}")
-                return False
+            snapshot = _copy_state(self._state)
+            self._dirty = False
+        
+        if self._write_file(snapshot):
+            # 기록하면서 다른 프로세스 변경이 병합됐으면 그동안 생긴 메모리 변경을 그 위에 다시 얹음
+            with self._lock:
+                if self._persisted is not snapshot:
+                    self._state = _merge_state(snapshot, self._state, self._persisted)
+            return True
+        
+        # 실패하면 다음 변경 때 다시 기록하도록 표시만 남김
+        with self._lock:
+            self._dirty = True
+        return False
     
     def _backup_corrupted_file(self):
         """손상된 상태 파일 백업"""
@@ -97,42 +230,164 @@ class StateManager:
         except Exception as e:
             logger.error(f"상태 파일 백업 실패: {e}")
     
-    def get_previous_slots(self) -> Dict[str, str]:
+    def _get_themes(self, state: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+        """상태 데이터에서 테마별 슬롯 맵 꺼내기 (단일 테마 시절 'slots' 키도 지원)"""
+        return _theme_map(state)
+    
+    def get_previous_slots(self, theme: str = THEME_NAME) -> Dict[str, str]:
         """
         이전에 저장된 슬롯 상태 가져오기
         
+        Args:
+            theme: 테마 이름
+        
         Returns:
             dict: 이전 슬롯 상태
         """
-        state = self.load()
-        return state.get('slots', {})
+        with self._lock:
+            return dict(self._get_themes(self._current()).get(theme, {}))
     
-    def update_slots(self, new_slots: Dict[str, str]) -> bool:
+    def update_theme_slots(self, theme_slots: Dict[str, Dict[str, str]],
+                           dates: Optional[List[str]] = None,
+                           failed_dates: Optional[List[str]] = None) -> bool:
+        """
+        여러 테마의 슬롯 상태를 한 번에 업데이트
+        
+        Args:
+            theme_slots: 테마별 새로운 슬롯 상태
+            dates: 이번에 확인한 날짜 목록 (지정하면 해당 날짜의 슬롯만 교체하고
+                   나머지 날짜는 이전 상태 유지, 없으면 테마 전체 교체)
+            failed_dates: 이번에 수집에 실패한 날짜 목록 (마지막으로 알던 슬롯을 그대로 두고
+                          state['dates'][날짜]['stale_since']에 처음 실패한 시각 기록)
+            
+        Returns:
+            bool: 업데이트 성공 여부
+        """
+        with self._lock:
+            state = self._current()
+            themes = self._get_themes(state)
+            now = str(pd_timestamp_now())
+            
+            if dates is None:
+                themes.update({theme: dict(slots) for theme, slots in theme_slots.items()})
+            else:
+                date_set = set(dates)
+                for theme in set(themes) | set(theme_slots):
+                    merged = {
+                        slot_key: status
+                        for slot_key, status in themes.get(theme, {}).items()
+                        if slot_key[:10] not in date_set
+                    }
+                    merged.update(theme_slots.get(theme, {}))
+                    themes[theme] = merged
+            
+            date_meta = state.get('dates', {})
+            # 다시 수집된 날짜는 최신 상태이므로 오래된 표시 제거
+            for date in dates or []:
+                date_meta.pop(date, None)
+            for date in failed_dates or []:
+                date_meta.setdefault(date, {}).setdefault('stale_since', now)
+            
+            # 날짜별 병합에서는 지난 날짜의 슬롯이 저절로 빠지지 않으므로 정리
+            if dates is not None:
+                today = now[:10]
+                for theme, slots in themes.items():
+                    if any(slot_key[:10] < today for slot_key in slots):
+                        themes[theme] = {k: v for k, v in slots.items() if k[:10] >= today}
+                date_meta = {date: meta for date, meta in date_meta.items() if date >= today}
+            
+            state.pop('slots', None)
+            state['themes'] = themes
+            state['dates'] = date_meta
+            state['last_updated'] = now
+            return self._mark_dirty()
+    
+    def get_stale_dates(self) -> Dict[str, str]:
+        """수집 실패로 이전 상태를 유지 중인 날짜 {날짜: 처음 실패한 시각}"""
+        with self._lock:
+            return {
+                date: meta['stale_since']
+                for date, meta in self._current().get('dates', {}).items()
+                if 'stale_since' in meta
+            }
+    
+    def update_slots(self, new_slots: Dict[str, str], theme: str = THEME_NAME) -> bool:
         """
         슬롯 상태 업데이트
         
         Args:
             new_slots: 새로운 슬롯 상태
+            theme: 테마 이름
             
         Returns:
             bool: 업데이트 성공 여부
         """
-        state = self.load()
-        state['slots'] = new_slots
-        state['last_updated'] = str(pd_timestamp_now())
-        return self.save(state)
+        return self.update_theme_slots({theme: new_slots})
+    
+    def _previous_by_date(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """이전 상태를 날짜/테마별로 나눈 맵 {"2025-01-30": {"층간소음": {...}}}"""
+        previous: Dict[str, Dict[str, Dict[str, str]]] = {}
+        with self._lock:
+            for theme, slots in self._get_themes(self._current()).items():
+                for slot_key, status in slots.items():
+                    previous.setdefault(slot_key[:10], {}).setdefault(theme, {})[slot_key] = status
+        return previous
+    
+    def find_changed_dates(self, date_theme_slots: Dict[str, Dict[str, Dict[str, str]]]) -> List[str]:
+        """
+        이전 상태와 비교해 슬롯 상태가 달라진 날짜 찾기
+        
+        Args:
+            date_theme_slots: 날짜별 테마 슬롯 상태 {"2025-01-30": {"층간소음": {...}}}
+            
+        Returns:
+            list: 슬롯이 추가/삭제되거나 상태가 바뀐 날짜 리스트
+        """
+        previous = self._previous_by_date()
+        
+        changed = []
+        for date, theme_slots in date_theme_slots.items():
+            previous_date = previous.get(date, {})
+            if any(previous_date.get(theme, {}) != slots for theme, slots in theme_slots.items()):
+                changed.append(date)
+        return changed
+    
+    def find_opened_dates(self, date_theme_slots: Dict[str, Dict[str, Dict[str, str]]]) -> List[str]:
+        """
+        이전에 매진이던 슬롯이 예약 가능으로 바뀐 날짜 찾기 (처음 보는 슬롯은 제외)
+        
+        Args:
+            date_theme_slots: 날짜별 테마 슬롯 상태 {"2025-01-30": {"층간소음": {...}}}
+            
+        Returns:
+            list: 슬롯이 새로 열린 날짜 리스트
+        """
+        previous = self._previous_by_date()
+        
+        opened = []
+        for date, theme_slots in date_theme_slots.items():
+            previous_date = previous.get(date, {})
+            for theme, slots in theme_slots.items():
+                previous_slots = previous_date.get(theme, {})
+                if any(status == "예약가능" and previous_slots.get(slot_key) == "매진"
+                       for slot_key, status in slots.items()):
+                    opened.append(date)
+                    break
+        return opened
     
-    def find_new_available_slots(self, current_slots: Dict[str, str]) -> List[str]:
+    def find_new_available_slots(self, current_slots: Dict[str, str],
+                                 theme: str = THEME_NAME) -> List[str]:
         """
         새로 예약 가능해진 슬롯 찾기
         
         Args:
             current_slots: 현재 슬롯 상태
+            theme: 테마 이름
             
         Returns:
             list: 새로 예약 가능해진 슬롯 시간 리스트
         """
-        previous_slots = self.get_previous_slots()
+        previous_slots = self.get_previous_slots(theme)
         new_available = []
         
         for slot_time, current_status in current_slots.items():
@@ -144,30 +399,249 @@ class StateManager:
                 if previous_status != "예약가능":
                     new_available.append(slot_time)
         
-        logger.info(f"새로 예약 가능한 슬롯: {len(new_available)}개")
+        logger.info(f"'{theme}' 새로 예약 가능한 슬롯: {len(new_available)}개")
         return new_available
     
+    def select_alert_slots(self, current_slots: Dict[str, str], theme: str = THEME_NAME,
+                           cooldown: float = NOTIFICATION_COOLDOWN,
+                           reminder_interval: float = ALERT_REMINDER_INTERVAL_SECONDS,
+                           now: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """
+        이번 체크 결과에서 알림을 보낼 슬롯 고르기 (update_theme_slots로 상태를 바꾸기 전에 호출)
+        
+        - 새로 예약 가능해진 슬롯 (find_new_available_slots): 같은 슬롯의 마지막 알림에서 cooldown이 지났을 때만
+        - 알림 기록이 없는 예약 가능 슬롯: 이전 상태와 상관없이 새로 열린 슬롯으로 알림
+          (첫 체크, 알림 기록 전에 저장된 상태, 발신 대기열 추가에 실패한 슬롯)
+        - 계속 예약 가능한 슬롯: reminder_interval > 0이고 마지막 알림에서 그만큼 지났을 때 리마인더
+        
+        알림 시각은 여기서 기록하지 않음. 알림을 발신 대기열에 넣은 뒤 mark_alerted로 기록해야 쿨타임이 시작됨.
+        쿨타임 중에 다시 열린 슬롯은 state['pending_alerts']에 대기로 남겨 두고, 계속 열려 있으면
+        쿨타임이 지난 뒤 새로 열린 슬롯으로 알림 (대기는 mark_alerted가 지우고, 다시 닫히면 취소).
+        알림 기록은 지난 날짜이거나, 예약 가능하지 않고 cooldown이 지난 슬롯이면 정리.
+        
+        Args:
+            current_slots: 현재 슬롯 상태 (이번에 수집한 날짜만 있어도 됨)
+            theme: 테마 이름
+            cooldown: 같은 슬롯을 다시 알리기까지 최소 간격 (초)
+            reminder_interval: 리마인더 간격 (초, 0이면 리마인더 없음)
+            now: 기준 시각 (테스트용, 없으면 현재 시각)
+            
+        Returns:
+            (새로 예약 가능해진 슬롯 리스트, 리마인더 슬롯 리스트)
+        """
+        now = now or datetime.now()
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+        opened = set(self.find_new_available_slots(current_slots, theme))
+        
+        with self._lock:
+            state = self._current()
+            previous = self._get_themes(state).get(theme, {})
+            recorded = state.get('alerts', {}).get(theme, {})
+            recorded_pending = state.get('pending_alerts', {}).get(theme, {})
+            last_alerts = dict(recorded)
+            pending = dict(recorded_pending)
+            
+            new_alerts, reminders, suppressed = [], [], 0
+            for slot_time, status in current_slots.items():
+                if status != "예약가능":
+                    continue
+                elapsed = _seconds_since(last_alerts.get(slot_time), now)
+                if elapsed is None:
+                    new_alerts.append(slot_time)
+                elif slot_time in opened or slot_time in pending:
+                    if elapsed < cooldown:
+                        # 버리지 않고 대기로 남겨 쿨타임이 지난 뒤 알림
+                        if slot_time not in pending:
+                            pending[slot_time] = now_str
+                            suppressed += 1
+                        continue
+                    new_alerts.append(slot_time)
+                elif 0 < reminder_interval <= elapsed:
+                    reminders.append(slot_time)
+            
+            today = now.strftime('%Y-%m-%d')
+            for slot_time, alerted_at in list(last_alerts.items()):
+                status = current_slots.get(slot_time, previous.get(slot_time))
+                elapsed = _seconds_since(alerted_at, now)
+                if slot_time[:10] < today or (
+                        status != "예약가능" and (elapsed is None or elapsed >= cooldown)):
+                    del last_alerts[slot_time]
+            for slot_time in list(pending):
+                status = current_slots.get(slot_time, previous.get(slot_time))
+                if slot_time[:10] < today or status != "예약가능":
+                    del pending[slot_time]
+            
+            changed = False
+            for key, before, after in (('alerts', recorded, last_alerts),
+                                       ('pending_alerts', recorded_pending, pending)):
+                if after == before:
+                    continue
+                items = state.setdefault(key, {})
+                if after:
+                    items[theme] = after
+                else:
+                    items.pop(theme, None)
+                changed = True
+            if changed:
+                self._mark_dirty()
+        
+        if suppressed:
+            logger.info(f"'{theme}' 쿨타임 중에 다시 열린 슬롯 {suppressed}개는 쿨타임이 지나면 알림")
+        return new_alerts, reminders
+    
+    def mark_alerted(self, slot_times: List[str], theme: str = THEME_NAME,
+                     now: Optional[datetime] = None) -> bool:
+        """
+        알림을 보낸 슬롯의 알림 시각 기록 (select_alert_slots로 고른 슬롯을 발신 대기열에 넣은 뒤 호출)
+        
+        Args:
+            slot_times: 알림을 보낸 슬롯 시간 리스트
+            theme: 테마 이름
+            now: 알림 시각 (테스트용, 없으면 현재 시각)
+            
+        Returns:
+            bool: 저장 성공 여부
+        """
+        if not slot_times:
+            return True
+        
+        now_str = (now or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            state = self._current()
+            theme_alerts = state.setdefault('alerts', {}).setdefault(theme, {})
+            pending = state.get('pending_alerts', {}).get(theme, {})
+            for slot_time in slot_times:
+                theme_alerts[slot_time] = now_str
+                pending.pop(slot_time, None)
+            if not pending:
+                state.get('pending_alerts', {}).pop(theme, None)
+            return self._mark_dirty()
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         상태 파일 통계 정보
         
         Returns:
-            dict: 통계 정보
+            dict: 통계 정보 (전체 합계 + 테마별 'themes')
         """
-        state = self.load()
-        slots = state.get('slots', {})
+        with self._lock:
+            state = self._current()
+            stale_dates = sorted(
+                date for date, meta in state.get('dates', {}).items() if 'stale_since' in meta
+            )
+            
+            theme_stats = {}
+            for theme, slots in self._get_themes(state).items():
+                available = len([s for s in slots.values() if s == "예약가능"])
+                theme_stats[theme] = {
+                    'total_slots': len(slots),
+                    'available_slots': available,
+                    'reserved_slots': len([s for s in slots.values() if s == "매진"])
+                }
+            last_updated = state.get('last_updated', 'N/A')
         
         stats = {
-            'total_slots': len(slots),
-            'available_slots': len([s for s in slots.values() if s == "예약가능"]),
-            'reserved_slots': len([s for s in slots.values() if s == "매진"]),
-            'last_updated': state.get('last_updated', 'N/A'),
+            'total_slots': sum(t['total_slots'] for t in theme_stats.values()),
+            'available_slots': sum(t['available_slots'] for t in theme_stats.values()),
+            'reserved_slots': sum(t['reserved_slots'] for t in theme_stats.values()),
+            'themes': theme_stats,
+            'stale_dates': stale_dates,
+            'last_updated': last_updated,
             'file_size': self.state_file.stat().st_size if self.state_file.exists() else 0
         }
         
         return stats
 
 
+def _copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """상태 사본 (테마별/날짜별 맵까지 복사해 호출자가 바꿔도 메모리 상태에 영향 없음)"""
+    copied = dict(state)
+    for key in ('themes', 'dates', 'alerts', 'pending_alerts'):
+        if isinstance(copied.get(key), dict):
+            copied[key] = {name: dict(value) for name, value in copied[key].items()}
+    if isinstance(copied.get('slots'), dict):
+        copied['slots'] = dict(copied['slots'])
+    return copied
+
+
+def _diff_themes(previous: Dict[str, Dict[str, str]],
+                 current: Dict[str, Dict[str, str]]) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    """
+    두 테마별 슬롯 맵 사이에서 바뀐 슬롯 (저장소가 바뀐 부분만 기록할 때 사용)
+
+    Returns:
+        list: [(테마, 슬롯 시간, 이전 상태, 새 상태), ...]
+              이전 상태가 None이면 새로 생긴 슬롯, 새 상태가 None이면 사라진 슬롯
+    """
+    changes = []
+    for theme in set(previous) | set(current):
+        old_slots = previous.get(theme, {})
+        new_slots = current.get(theme, {})
+        for slot_time, status in new_slots.items():
+            old_status = old_slots.get(slot_time)
+            if old_status != status:
+                changes.append((theme, slot_time, old_status, status))
+        for slot_time in old_slots.keys() - new_slots.keys():
+            changes.append((theme, slot_time, old_slots[slot_time], None))
+    return changes
+
+
+def _merge_state(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    3방향 병합: theirs(다른 프로세스가 쓴 최신 상태) 위에 base → ours 사이의 변경만 적용
+    
+    슬롯은 (테마, 슬롯 시간) 단위, 날짜 메타는 날짜 단위, 알림 기록/대기는 테마 단위로 병합하고
+    둘 다 바꾼 항목은 ours가 이김. last_updated는 더 늦은 쪽.
+    """
+    merged = _copy_state(theirs)
+    theme_map = {theme: dict(slots) for theme, slots in _theme_map(theirs).items()}
+    for theme, slot_time, _, status in _diff_themes(_theme_map(base), _theme_map(ours)):
+        if status is None:
+            theme_map.get(theme, {}).pop(slot_time, None)
+        else:
+            theme_map.setdefault(theme, {})[slot_time] = status
+    merged.pop('slots', None)
+    merged['themes'] = theme_map
+    
+    for key in ('dates', 'alerts', 'pending_alerts'):
+        base_items, our_items = base.get(key, {}), ours.get(key, {})
+        items = merged.get(key, {})
+        for name in set(base_items) | set(our_items):
+            if our_items.get(name) == base_items.get(name):
+                continue
+            if name in our_items:
+                items[name] = dict(our_items[name])
+            else:
+                items.pop(name, None)
+        if items or key in ours:
+            merged[key] = items
+    
+    for key, value in ours.items():
+        if key not in ('themes', 'slots', 'dates', 'alerts', 'pending_alerts') and value != base.get(key):
+            merged[key] = value
+    if 'last_updated' in theirs and 'last_updated' in ours:
+        merged['last_updated'] = max(theirs['last_updated'], ours['last_updated'])
+    return merged
+
+
+def _seconds_since(timestamp: Optional[str], now: datetime) -> Optional[float]:
+    """"YYYY-MM-DD HH:MM:SS" 시각부터 now까지 지난 초 (없거나 형식이 다르면 None)"""
+    if not timestamp:
+        return None
+    try:
+        return (now - datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')).total_seconds()
+    except ValueError:
+        return None
+
+
+def _theme_map(state: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """상태의 테마별 슬롯 맵 (단일 테마 시절 'slots' 키도 지원, 복사하지 않음)"""
+    themes = state.get('themes')
+    if themes is None and 'slots' in state:
+        themes = {THEME_NAME: state['slots']}
+    return themes or {}
+
+
 def pd_timestamp_now():
     """현재 시간 문자열 반환 (datetime 대신 사용)"""
     from datetime import datetime
@@ -179,10 +653,20 @@ _state_manager = None
 
 
 def get_state_manager() -> StateManager:
-    """전역 상태 관리자 반환"""
+    """전역 상태 관리자 반환 (STATE_BACKEND에 따라 JSON, SQLite 또는 저널)"""
     global _state_manager
     if _state_manager is None:
-        _state_manager = StateManager()
+        if STATE_BACKEND == "sqlite":
+            from .state_sqlite import SqliteStateManager
+            _state_manager = SqliteStateManager()
+        elif STATE_BACKEND == "journal":
+            from .state_journal import JournalStateManager
+            _state_manager = JournalStateManager()
+        else:
+            if STATE_BACKEND != "json":
+                logger.warning(f"알 수 없는 STATE_BACKEND '{STATE_BACKEND}' - json 사용")
+            _state_manager = StateManager()
+        logger.info(f"💾 상태 저장소: {_state_manager.state_file}")
     return _state_manager
 
 
@@ -197,19 +681,40 @@ def save_state(state: Dict[str, Any]) -> bool:
     return get_state_manager().save(state)
 
 
-def get_previous_slots() -> Dict[str, str]:
+def get_previous_slots(theme: str = THEME_NAME) -> Dict[str, str]:
     """이전 슬롯 상태 가져오기 (편의 함수)"""
-    return get_state_manager().get_previous_slots()
+    return get_state_manager().get_previous_slots(theme)
 
 
-def update_slots(new_slots: Dict[str, str]) -> bool:
+def update_slots(new_slots: Dict[str, str], theme: str = THEME_NAME) -> bool:
     """슬롯 상태 업데이트 (편의 함수)"""
-    return get_state_manager().update_slots(new_slots)
+    return get_state_manager().update_slots(new_slots, theme)
+
 
+def update_theme_slots(theme_slots: Dict[str, Dict[str, str]], dates: Optional[List[str]] = None,
+                       failed_dates: Optional[List[str]] = None) -> bool:
+    """여러 테마의 슬롯 상태 업데이트 (편의 함수)"""
+    return get_state_manager().update_theme_slots(theme_slots, dates, failed_dates)
 
-def find_new_available_slots(current_slots: Dict[str, str]) -> List[str]:
+
+def find_new_available_slots(current_slots: Dict[str, str], theme: str = THEME_NAME) -> List[str]:
     """새로 예약 가능한 슬롯 찾기 (편의 함수)"""
-    return get_state_manager().find_new_available_slots(current_slots)
+    return get_state_manager().find_new_available_slots(current_slots, theme)
+
+
+def select_alert_slots(current_slots: Dict[str, str], theme: str = THEME_NAME) -> Tuple[List[str], List[str]]:
+    """알림 보낼 슬롯 고르기 (편의 함수)"""
+    return get_state_manager().select_alert_slots(current_slots, theme)
+
+
+def mark_alerted(slot_times: List[str], theme: str = THEME_NAME) -> bool:
+    """알림을 보낸 슬롯의 알림 시각 기록 (편의 함수)"""
+    return get_state_manager().mark_alerted(slot_times, theme)
+
+
+def flush_state() -> bool:
+    """아직 기록하지 않은 상태를 파일에 기록 (편의 함수)"""
+    return get_state_manager().flush()
 
 
 if __name__ == "__main__":
@@ -260,6 +765,33 @@ if __name__ == "__main__":
     else:
         print(f"❌ 새로운 슬롯 감지 오류. 예상: {expected}, 실제: {new_slots}")
     
+    # 알림 대상 고르기 (알림 기록이 없으면 계속 열려 있던 20:00 슬롯도 새로 열린 슬롯으로 알림,
+    # mark_alerted로 기록하기 전에는 같은 결과, 기록하고 상태를 저장한 뒤에는 0개)
+    print("\n=== 알림 대상 슬롯 테스트 ===")
+    checked_at = datetime(2025, 1, 29, 15, 30)  # 테스트 슬롯 날짜 기준 (지난 날짜 기록은 정리되므로)
+    expected_alerts = expected + ["2025-01-30 20:00:00"]
+    opened, _ = manager.select_alert_slots(test_slots_2, now=checked_at)
+    unsent, _ = manager.select_alert_slots(test_slots_2, now=checked_at)
+    manager.mark_alerted(opened, now=checked_at)
+    manager.update_slots(test_slots_2)
+    again, _ = manager.select_alert_slots(test_slots_2, now=checked_at)
+    if set(opened) == set(expected_alerts) and set(unsent) == set(opened) and not again:
+        print(f"✅ 알림 기록 없는 슬롯 {len(opened)}개 알림, 기록 후 다시 확인하면 0개")
+    else:
+        print(f"❌ 알림 대상 오류. 첫 번째: {opened}, 기록 전: {unsent}, 기록 후: {again}")
+    
+    # 쿨타임 중에 닫혔다 다시 열린 슬롯은 버리지 않고 쿨타임이 지난 뒤 알림
+    reopen_slot = "2025-01-30 18:30:00"
+    manager.update_slots({**test_slots_2, reopen_slot: "매진"})
+    reopened, _ = manager.select_alert_slots(test_slots_2, now=checked_at + timedelta(minutes=1))
+    manager.update_slots(test_slots_2)
+    later, _ = manager.select_alert_slots(test_slots_2, now=checked_at + timedelta(seconds=NOTIFICATION_COOLDOWN))
+    manager.mark_alerted(later, now=checked_at + timedelta(seconds=NOTIFICATION_COOLDOWN))
+    if not reopened and later == [reopen_slot] and not manager.load().get('pending_alerts'):
+        print("✅ 쿨타임 중 다시 열린 슬롯은 쿨타임이 지난 뒤 알림")
+    else:
+        print(f"❌ 다시 열린 슬롯 알림 오류. 쿨타임 중: {reopened}, 쿨타임 후: {later}")
+    
     # 6. 두 번째 상태 저장
     print("\n=== 두 번째 상태 저장 ===")
     if manager.update_slots(test_slots_2):
@@ -271,4 +803,8 @@ if __name__ == "__main__":
     for key, value in stats.items():
         print(f"  {key}: {value}")
     
+    # 8. 지연 기록된 상태를 파일에 반영
+    if manager.flush():
+        print("✅ 상태 파일 기록 완료")
+    
     print("\n=== 테스트 완료 ===") 
\ No newline at end of file
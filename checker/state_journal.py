@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+저널 상태 저장소 모듈
+
+StateManager는 기록할 때마다 state.json 전체를 다시 쓴다 (슬롯 수에 비례).
+JournalStateManager는 state.json을 스냅샷으로 두고, 기록마다 바뀐 슬롯만
+한 줄짜리 압축 레코드로 state.journal에 덧붙인다 (바뀐 슬롯 수에 비례).
+시작할 때 스냅샷 위에 저널을 차례로 적용해 상태를 복원하고,
+저널이 STATE_JOURNAL_MAX_BYTES를 넘으면 스냅샷으로 합친 뒤 비운다.
+
+config의 STATE_BACKEND=journal로 선택 (get_state_manager 참고).
+"""
+
+import os
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+from .config import STATE_FILE, STATE_FLUSH_DELAY_SECONDS, STATE_JOURNAL_MAX_BYTES, STATE_PROCESS_LOCK
+from .filelock import FileLockTimeout
+from .state import StateManager, _copy_state, _diff_themes, _merge_state
+
+
+class JournalStateManager(StateManager):
+    """
+    스냅샷 + 추가 전용 저널 기반 상태 관리 클래스
+
+    메모리 상태와 지연 기록 방식은 StateManager와 같고, 파일 기록만 저널 추가로 바뀐다.
+    레코드 한 줄: {"u": 마지막 업데이트, "s": [[테마, 슬롯 시간, 상태 또는 null], ...], "d": 날짜 메타,
+                  "a": 슬롯별 알림 기록, "p": 쿨타임이 지나면 알릴 슬롯}
+    ("s"는 바뀐 슬롯이 있을 때, "d"/"a"/"p"는 날짜 메타/알림 기록/알림 대기가 바뀌었을 때만 통째로 들어감,
+     null은 사라진 슬롯)
+
+    레코드는 모두 "이 값으로 설정"이므로 같은 저널을 여러 번 적용해도 결과가 같다.
+    그래서 압축은 스냅샷을 원자적으로 교체한 다음 저널을 비우고,
+    그 사이에 멈춰도 다음 시작 때 새 스냅샷 위에 남은 저널을 다시 적용하면 같은 상태가 된다.
+
+    process_safe면 추가/압축은 파일 잠금 안에서 하고, 추가하기 전에 다른 프로세스가 덧붙인
+    레코드(또는 압축한 스냅샷)를 먼저 읽어 반영하므로 레코드는 항상 파일 내용 기준의 차이가 된다.
+    """
+
+    def __init__(self, state_file: Path = STATE_FILE, flush_delay: float = STATE_FLUSH_DELAY_SECONDS,
+                 journal_file: Optional[Path] = None, max_journal_bytes: int = STATE_JOURNAL_MAX_BYTES,
+                 process_safe: bool = STATE_PROCESS_LOCK):
+        self.journal_file = Path(journal_file) if journal_file else Path(state_file).with_suffix('.journal')
+        self.max_journal_bytes = max_journal_bytes
+        # 저널에서 이미 반영한 위치 (바이트, 이후에 다른 프로세스가 덧붙인 레코드만 읽음)
+        self._journal_offset = 0
+        # 저널 추가가 실패하면 줄이 잘렸을 수 있으므로 다음 기록은 스냅샷으로 함
+        self._needs_compaction = False
+        super().__init__(state_file, flush_delay, process_safe=process_safe)
+
+    @contextmanager
+    def _locked(self):
+        """저널/스냅샷 기록 구간 (process_safe면 파일 잠금, 호출자가 _write_lock을 잡고 있어야 함)"""
+        if not self.process_safe:
+            yield
+            return
+        with self._file_lock:
+            yield
+
+    def _ensure_state_file_exists(self):
+        """스냅샷이 없으면 만들고, 스냅샷 위에 저널을 적용해 상태 복원"""
+        with self._write_lock, self._locked():
+            if not self.state_file.exists():
+                self._write_snapshot({})
+                logger.info(f"새로운 상태 파일 생성: {self.state_file}")
+
+            state, applied, skipped = self._load_all()
+            self._persisted = state
+            if applied:
+                logger.info(f"📒 상태 저널 {applied}개 레코드 적용: {self.journal_file}")
+            if skipped:
+                # 마지막 기록 중에 멈춰 잘린 줄 등 (이어서 덧붙이지 않도록 바로 압축)
+                logger.warning(f"📒 상태 저널에서 읽을 수 없는 레코드 {skipped}개 건너뜀 - 스냅샷으로 압축")
+                self._compact(state)
+
+    def _load_all(self) -> Tuple[Dict[str, Any], int, int]:
+        """스냅샷 + 저널 전체로 상태 복원 (복원된 상태, 적용한 개수, 건너뛴 개수)"""
+        snapshot, signature = self._load_snapshot()
+        self._persisted_signature = signature
+        state, applied, skipped, self._journal_offset = self._replay(snapshot)
+        return state, applied, skipped
+
+    def _replay(self, state: Dict[str, Any], offset: int = 0) -> Tuple[Dict[str, Any], int, int, int]:
+        """
+        상태에 저널의 offset 이후 레코드를 차례로 적용
+
+        Returns:
+            (적용한 상태, 적용한 개수, 건너뛴 개수, 읽은 끝 위치)
+        """
+        themes = self._get_themes(state)
+        state.pop('slots', None)
+        state['themes'] = themes
+
+        applied = skipped = 0
+        if not self.journal_file.exists():
+            return state, applied, skipped, 0
+
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        skipped += 1
+                        continue
+
+                    for theme, slot_time, status in record.get('s', []):
+                        slots = themes.setdefault(theme, {})
+                        if status is None:
+                            slots.pop(slot_time, None)
+                        else:
+                            slots[slot_time] = status
+                    if 'd' in record:
+                        state['dates'] = record['d']
+                    if 'a' in record:
+                        state['alerts'] = record['a']
+                    if 'p' in record:
+                        state['pending_alerts'] = record['p']
+                    if record.get('u'):
+                        state['last_updated'] = record['u']
+                    applied += 1
+                offset = f.tell()
+        except Exception as e:
+            logger.error(f"상태 저널 읽기 오류: {e}")
+
+        return state, applied, skipped, offset
+
+    def _sync(self) -> Optional[Dict[str, Any]]:
+        """
+        다른 프로세스가 마지막 기록 이후 덧붙인 레코드나 압축한 스냅샷 반영 (잠금 안에서 호출)
+
+        Returns:
+            파일 기준 최신 상태 (바뀐 것이 없으면 None)
+        """
+        if not self.process_safe:
+            return None
+        if self._signature() != self._persisted_signature or self._journal_size() < self._journal_offset:
+            # 다른 프로세스가 압축함 → 처음부터 다시 복원
+            state, _, _ = self._load_all()
+            return state
+        if self._journal_size() > self._journal_offset:
+            state, _, _, self._journal_offset = self._replay(_copy_state(self._persisted), self._journal_offset)
+            return state
+        return None
+
+    def _read_file(self) -> Dict[str, Any]:
+        """메모리 상태를 처음 만들 때 시작 시 복원한 상태 사본 반환"""
+        return _copy_state(self._persisted)
+
+    def _write_file(self, state: Dict[str, Any]) -> bool:
+        """마지막 기록 이후 바뀐 슬롯만 저널에 한 줄로 덧붙이기 (커지면 스냅샷으로 압축)"""
+        with self._write_lock:
+            try:
+                with self._locked():
+                    return self._append(state)
+            except (FileLockTimeout, OSError) as e:
+                logger.error(f"상태 저널 잠금 오류: {e}")
+                return False
+
+    def _append(self, state: Dict[str, Any]) -> bool:
+        """_write_file 본체 (잠금 안에서 호출)"""
+        target, disk = state, self._persisted
+        theirs = self._sync()
+        if theirs is not None:
+            # 다른 프로세스 변경 위에 내 변경만 얹고, 레코드는 파일 내용과의 차이로 씀
+            target = _merge_state(self._persisted, state, theirs)
+            disk = theirs
+            self.merges += 1
+
+        if self._needs_compaction:
+            return self._compact(target)
+
+        record: Dict[str, Any] = {'u': target.get('last_updated')}
+        changes = _diff_themes(self._get_themes(disk), self._get_themes(target))
+        if changes:
+            record['s'] = [[theme, slot_time, status] for theme, slot_time, _, status in changes]
+        if target.get('dates') != disk.get('dates'):
+            record['d'] = target.get('dates', {})
+        if target.get('alerts') != disk.get('alerts'):
+            record['a'] = target.get('alerts', {})
+        if target.get('pending_alerts') != disk.get('pending_alerts'):
+            record['p'] = target.get('pending_alerts', {})
+
+        try:
+            line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"상태 저널 기록 오류: {e}")
+            # 다른 프로세스 변경은 이미 읽었으므로 기준은 파일 내용으로 맞춰 둠
+            self._persisted = disk
+            self._needs_compaction = True
+            return False
+
+        self._persisted = target
+        self._journal_offset = self._journal_size()
+        logger.debug(f"상태 저널 기록 완료: 슬롯 변경 {len(changes)}개, {len(line.encode('utf-8'))}바이트")
+
+        if self._journal_offset > self.max_journal_bytes:
+            self._compact(target)
+        return True
+
+    def _compact(self, state: Dict[str, Any]) -> bool:
+        """상태 전체를 스냅샷으로 쓰고 저널 비우기 (호출자가 _write_lock과 잠금을 잡고 있어야 함)"""
+        journal_size = self._journal_size()
+        if not self._write_snapshot(state):
+            self._needs_compaction = True
+            return False
+
+        self._persisted = state
+        self._persisted_signature = self._signature()
+        try:
+            # 스냅샷 교체가 끝난 뒤에만 비우므로 어느 시점에 멈춰도 상태가 남아 있음
+            with open(self.journal_file, 'w', encoding='utf-8'):
+                pass
+            self._journal_offset = 0
+        except Exception as e:
+            # 남은 저널은 새 스냅샷 위에 다시 적용해도 결과가 같으므로 다음 압축 때 비움
+            logger.error(f"상태 저널 비우기 오류: {e}")
+
+        self._needs_compaction = False
+        logger.info(f"📒 상태 저널 압축 완료: {journal_size / 1024:.1f} KiB → 스냅샷 {self.state_file}")
+        return True
+
+    def _journal_size(self) -> int:
+        """저널 파일 크기 (바이트)"""
+        return self.journal_file.stat().st_size if self.journal_file.exists() else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """상태 통계 정보 (StateManager 통계 + 저널 크기, 파일 크기는 스냅샷 + 저널)"""
+        stats = super().get_stats()
+        stats['journal_size'] = self._journal_size()
+        stats['file_size'] += stats['journal_size']
+        return stats
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 임시 폴더에서 기록 → 다시 열어 복원 확인 → 잘린 줄 복구 → 압축
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_path = Path(temp_dir) / 'state.json'
+        slots = {f"2099-01-30 {hour:02d}:00:00": "매진" for hour in range(10, 22)}
+
+        manager = JournalStateManager(state_path, flush_delay=0)
+        manager.update_slots(slots)
+        for hour in (12, 15, 18):
+            slots[f"2099-01-30 {hour:02d}:00:00"] = "예약가능"
+            manager.update_slots(dict(slots))
+        print(f"저널 {manager._journal_size()}바이트 / 스냅샷 {state_path.stat().st_size}바이트")
+        print(open(manager.journal_file, encoding='utf-8').read())
+
+        reopened = JournalStateManager(state_path, flush_delay=0)
+        print(f"다시 열어 복원: {'✅ 일치' if reopened.load() == manager.load() else '❌ 불일치'}")
+
+        # 기록 중에 멈춰 마지막 줄이 잘린 경우
+        with open(manager.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"u":"2099-01-30 00:00:00","s":[["층간')
+        recovered = JournalStateManager(state_path, flush_delay=0)
+        print(f"잘린 줄 복구: {'✅ 일치' if recovered.load() == manager.load() else '❌ 불일치'}, "
+              f"저널 {recovered._journal_size()}바이트")
+
+        # 압축 기준을 작게 잡아 기록 몇 번 만에 압축
+        small = JournalStateManager(state_path, flush_delay=0, max_journal_bytes=200)
+        for hour in range(10, 14):
+            slots[f"2099-01-30 {hour:02d}:00:00"] = "예약가능"
+            small.update_slots(dict(slots))
+        print(f"통계: {small.get_stats()}")
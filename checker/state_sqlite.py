@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite 상태 저장소 모듈
+
+state.json은 마지막 스냅샷만 남기므로 "취소된 슬롯이 얼마나 오래 열려 있는지",
+"어느 시간대에 취소표가 많이 나오는지"를 알 수 없다.
+SqliteStateManager는 StateManager와 같은 API를 유지하면서 표준 라이브러리 sqlite3(WAL 모드)에
+현재 슬롯(slots)과 슬롯 상태 변화 이력(transitions, 추가만 함)을 함께 기록한다.
+
+config의 STATE_BACKEND=sqlite로 선택 (get_state_manager 참고).
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from .config import STATE_DB_FILE, STATE_FILE, STATE_FLUSH_DELAY_SECONDS, STATE_PROCESS_LOCK
+from .serialization import decode_state
+from .state import StateManager, _copy_state, _diff_themes, _merge_state, pd_timestamp_now
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slots (
+    theme TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (theme, slot_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY,
+    theme TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    old_status TEXT,
+    new_status TEXT,
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_slot ON transitions (theme, slot_time);
+CREATE INDEX IF NOT EXISTS idx_transitions_observed ON transitions (observed_at);
+
+CREATE TABLE IF NOT EXISTS stale_dates (
+    date TEXT PRIMARY KEY,
+    stale_since TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    theme TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    alerted_at TEXT NOT NULL,
+    PRIMARY KEY (theme, slot_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS pending_alerts (
+    theme TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    reopened_at TEXT NOT NULL,
+    PRIMARY KEY (theme, slot_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# 알림 기록/대기 테이블과 시각 컬럼 (상태의 같은 이름 키와 모양이 같음)
+_ALERT_TABLES = (("alerts", "alerted_at"), ("pending_alerts", "reopened_at"))
+
+
+class SqliteStateManager(StateManager):
+    """
+    SQLite 기반 상태 관리 클래스
+
+    메모리 상태와 지연 기록 방식은 StateManager와 같고, 파일 기록만 DB 반영으로 바뀐다.
+    기록할 때 마지막으로 DB에 반영한 상태와 비교해 바뀐 슬롯만 slots에 반영하고
+    transitions에 (이전 상태 → 새 상태, 관측 시각)을 남긴다.
+    이전 상태가 NULL이면 처음 보는 슬롯, 새 상태가 NULL이면 목록에서 사라진 슬롯.
+
+    여러 프로세스가 같은 DB를 쓰면 기록은 BEGIN IMMEDIATE 트랜잭션(SQLite 쓰기 잠금) 안에서 하고,
+    PRAGMA data_version으로 다른 연결의 커밋을 감지하면 DB 내용을 다시 읽어 내 변경만 병합한다.
+    """
+
+    def __init__(self, state_file: Path = STATE_DB_FILE, flush_delay: float = STATE_FLUSH_DELAY_SECONDS,
+                 json_file: Optional[Path] = STATE_FILE, process_safe: bool = STATE_PROCESS_LOCK):
+        self._conn: Optional[sqlite3.Connection] = None
+        # 마지막으로 읽거나 쓴 시점의 data_version (다른 연결이 커밋하면 바뀜)
+        self._data_version: Optional[int] = None
+        self.json_file = Path(json_file) if json_file else None
+        super().__init__(state_file, flush_delay, process_safe=process_safe)
+
+    def _connect(self) -> sqlite3.Connection:
+        """DB 연결 및 스키마 생성 (WAL 모드, 트랜잭션은 직접 시작)"""
+        conn = sqlite3.connect(self.state_file, check_same_thread=False, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _ensure_state_file_exists(self):
+        """DB 열기 (없으면 만들고, 기존 state.json이 있으면 이력 없이 가져옴)"""
+        is_new = not self.state_file.exists()
+        with self._write_lock:
+            try:
+                self._conn = self._connect()
+            except sqlite3.DatabaseError as e:
+                logger.error(f"상태 DB 열기 오류: {e}")
+                self._backup_corrupted_file()
+                is_new = True
+                self._conn = self._connect()
+            self._persisted = self._load_db()
+            self._data_version = self._get_data_version()
+
+        if not is_new:
+            return
+        logger.info(f"새로운 상태 DB 생성: {self.state_file}")
+
+        if self.json_file and self.json_file.exists():
+            try:
+                data = decode_state(self.json_file.read_bytes())
+            except Exception as e:
+                logger.error(f"기존 상태 파일 읽기 오류: {e}")
+                return
+            if self._write_file(data, record_transitions=False):
+                logger.info(f"기존 상태 파일을 상태 DB로 가져옴: {self.json_file}")
+
+    def _load_db(self) -> Dict[str, Any]:
+        """DB 내용을 state.json과 같은 모양의 상태로 읽기 (호출자가 _write_lock을 잡고 있어야 함)"""
+        themes: Dict[str, Dict[str, str]] = {}
+        for theme, slot_time, status in self._conn.execute("SELECT theme, slot_time, status FROM slots"):
+            themes.setdefault(theme, {})[slot_time] = status
+
+        state: Dict[str, Any] = {}
+        if themes:
+            state['themes'] = themes
+        dates = {
+            date: {'stale_since': stale_since}
+            for date, stale_since in self._conn.execute("SELECT date, stale_since FROM stale_dates")
+        }
+        if dates:
+            state['dates'] = dates
+        for table, column in _ALERT_TABLES:
+            alerts: Dict[str, Dict[str, str]] = {}
+            for theme, slot_time, at in self._conn.execute(f"SELECT theme, slot_time, {column} FROM {table}"):
+                alerts.setdefault(theme, {})[slot_time] = at
+            if alerts:
+                state[table] = alerts
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        if row:
+            state['last_updated'] = row[0]
+        return state
+
+    def _get_data_version(self) -> int:
+        """다른 연결이 커밋할 때마다 바뀌는 값 (이 연결의 커밋으로는 바뀌지 않음)"""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _read_file(self) -> Dict[str, Any]:
+        """메모리 상태를 처음 만들 때 DB에서 읽은 상태 사본 반환"""
+        state = _copy_state(self._persisted)
+        logger.debug(f"상태 DB 로드 완료: {sum(len(s) for s in self._get_themes(state).values())}개 슬롯")
+        return state
+
+    def _write_file(self, state: Dict[str, Any], record_transitions: bool = True) -> bool:
+        """마지막 기록 이후 바뀐 슬롯만 DB에 반영하고 상태 변화 이력 추가 (한 트랜잭션)"""
+        with self._write_lock:
+            try:
+                # 쓰기 잠금을 먼저 잡아 읽기-병합-쓰기 사이에 다른 프로세스가 끼어들지 못하게 함
+                self._conn.execute("BEGIN IMMEDIATE")
+                disk = self._persisted
+                if self.process_safe and self._get_data_version() != self._data_version:
+                    disk = self._load_db()
+                    state = _merge_state(self._persisted, state, disk)
+                    self.merges += 1
+                previous = self._get_themes(disk)
+                current = self._get_themes(state)
+                observed_at = state.get('last_updated') or pd_timestamp_now()
+                today = pd_timestamp_now()[:10]
+
+                upserts, deletes, transitions = [], [], []
+                for theme, slot_time, old_status, status in _diff_themes(previous, current):
+                    if status is not None:
+                        upserts.append((theme, slot_time, status, observed_at))
+                    else:
+                        deletes.append((theme, slot_time))
+                        # 지난 날짜 정리로 빠진 슬롯은 상태 변화가 아님
+                        if slot_time[:10] < today:
+                            continue
+                    transitions.append((theme, slot_time, old_status, status, observed_at))
+
+                self._conn.executemany(
+                    "INSERT INTO slots (theme, slot_time, status, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (theme, slot_time) DO UPDATE SET "
+                    "status = excluded.status, updated_at = excluded.updated_at",
+                    upserts
+                )
+                self._conn.executemany("DELETE FROM slots WHERE theme = ? AND slot_time = ?", deletes)
+                if record_transitions:
+                    self._conn.executemany(
+                        "INSERT INTO transitions (theme, slot_time, old_status, new_status, observed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        transitions
+                    )
+                # 오래된 날짜 표시는 몇 개 안 되므로 통째로 교체
+                self._conn.execute("DELETE FROM stale_dates")
+                self._conn.executemany(
+                    "INSERT INTO stale_dates (date, stale_since) VALUES (?, ?)",
+                    [(date, meta['stale_since']) for date, meta in state.get('dates', {}).items()
+                     if 'stale_since' in meta]
+                )
+                # 슬롯별 알림 기록/대기도 알림을 보낸 슬롯 수만큼이라 바뀌었을 때만 통째로 교체
+                for table, column in _ALERT_TABLES:
+                    if state.get(table) == disk.get(table):
+                        continue
+                    self._conn.execute(f"DELETE FROM {table}")
+                    self._conn.executemany(
+                        f"INSERT INTO {table} (theme, slot_time, {column}) VALUES (?, ?, ?)",
+                        [(theme, slot_time, at)
+                         for theme, slots in state.get(table, {}).items()
+                         for slot_time, at in slots.items()]
+                    )
+                if 'last_updated' in state:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                        (state['last_updated'],)
+                    )
+
+                self._conn.execute("COMMIT")
+                self._data_version = self._get_data_version()
+
+                self._persisted = state
+                logger.debug(
+                    f"상태 DB 저장 완료: 슬롯 변경 {len(upserts)}개, 삭제 {len(deletes)}개, "
+                    f"이력 {len(transitions) if record_transitions else 0}개"
+                )
+                return True
+
+            except Exception as e:
+                logger.error(f"상태 DB 저장 오류: {e}")
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return False
+
+    def _backup_corrupted_file(self):
+        """손상된 상태 DB 백업 (WAL/공유 메모리 파일은 버림)"""
+        super()._backup_corrupted_file()
+        for suffix in ('-wal', '-shm'):
+            Path(f"{self.state_file}{suffix}").unlink(missing_ok=True)
+
+    def get_transitions(self, theme: Optional[str] = None, slot_time: Optional[str] = None,
+                        since: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        슬롯 상태 변화 이력 조회 (관측 순)
+
+        Args:
+            theme: 테마 이름 (없으면 전체)
+            slot_time: 슬롯 시간 "2025-01-30 18:30:00" (없으면 전체)
+            since: 이 시각 이후 관측된 것만 "2025-01-29 00:00:00"
+            limit: 최대 개수 (최근 것부터)
+
+        Returns:
+            list: [{'theme', 'slot_time', 'old_status', 'new_status', 'observed_at'}, ...]
+        """
+        conditions, params = [], []
+        if theme is not None:
+            conditions.append("theme = ?")
+            params.append(theme)
+        if slot_time is not None:
+            conditions.append("slot_time = ?")
+            params.append(slot_time)
+        if since is not None:
+            conditions.append("observed_at >= ?")
+            params.append(since)
+
+        query = "SELECT theme, slot_time, old_status, new_status, observed_at FROM transitions"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._write_lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        keys = ('theme', 'slot_time', 'old_status', 'new_status', 'observed_at')
+        return [dict(zip(keys, row)) for row in reversed(rows)]
+
+    def get_open_durations(self, theme: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        취소표(매진 → 예약가능)가 열려 있던 시간
+
+        Args:
+            theme: 테마 이름 (없으면 전체)
+
+        Returns:
+            list: [{'theme', 'slot_time', 'opened_at', 'closed_at', 'seconds'}, ...]
+                  아직 열려 있으면 closed_at/seconds가 None
+        """
+        query = """
+            SELECT theme, slot_time, old_status, new_status, observed_at,
+                   LEAD(observed_at) OVER (PARTITION BY theme, slot_time ORDER BY id) AS closed_at
+            FROM transitions
+        """
+        params = []
+        if theme is not None:
+            query += " WHERE theme = ?"
+            params.append(theme)
+
+        with self._write_lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        durations = []
+        for slot_theme, slot_time, old_status, new_status, opened_at, closed_at in rows:
+            if old_status != "매진" or new_status != "예약가능":
+                continue
+            seconds = None
+            if closed_at:
+                seconds = (datetime.fromisoformat(closed_at) - datetime.fromisoformat(opened_at)).total_seconds()
+            durations.append({
+                'theme': slot_theme,
+                'slot_time': slot_time,
+                'opened_at': opened_at,
+                'closed_at': closed_at,
+                'seconds': seconds
+            })
+        return durations
+
+    def get_reopen_hours(self, theme: Optional[str] = None) -> Dict[int, int]:
+        """
+        취소표(매진 → 예약가능)가 관측된 시간대별 횟수
+
+        Args:
+            theme: 테마 이름 (없으면 전체)
+
+        Returns:
+            dict: {시(0-23): 횟수}
+        """
+        query = (
+            "SELECT CAST(substr(observed_at, 12, 2) AS INTEGER) AS hour, COUNT(*) FROM transitions "
+            "WHERE old_status = '매진' AND new_status = '예약가능'"
+        )
+        params = []
+        if theme is not None:
+            query += " AND theme = ?"
+            params.append(theme)
+        query += " GROUP BY hour ORDER BY hour"
+
+        with self._write_lock:
+            return dict(self._conn.execute(query, params).fetchall())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """상태 통계 정보 (StateManager 통계 + 이력 개수, 파일 크기는 WAL 포함)"""
+        stats = super().get_stats()
+        with self._write_lock:
+            stats['transitions'] = self._conn.execute("SELECT COUNT(*) FROM transitions").fetchone()[0]
+        wal_file = Path(f"{self.state_file}-wal")
+        if wal_file.exists():
+            stats['file_size'] += wal_file.stat().st_size
+        return stats
+
+    def close(self):
+        """남은 변경을 기록하고 DB 연결 닫기"""
+        self.flush()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+if __name__ == "__main__":
+    # 테스트 실행: 임시 DB에 세 번 기록 → 이력/취소표 열린 시간/시간대별 횟수 확인
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = SqliteStateManager(Path(temp_dir) / 'state.db', flush_delay=0, json_file=None)
+
+        manager.update_slots({"2099-01-30 18:30:00": "매진", "2099-01-30 20:00:00": "예약가능"})
+        new_slots = manager.find_new_available_slots({"2099-01-30 18:30:00": "예약가능",
+                                                      "2099-01-30 20:00:00": "예약가능"})
+        print(f"새로 예약 가능한 슬롯: {new_slots}")
+        manager.update_slots({"2099-01-30 18:30:00": "예약가능", "2099-01-30 20:00:00": "예약가능"})
+        manager.update_slots({"2099-01-30 18:30:00": "매진"})
+
+        print("\n=== 상태 변화 이력 ===")
+        for transition in manager.get_transitions():
+            print(f"  {transition}")
+        print(f"\n취소표 열린 시간: {manager.get_open_durations()}")
+        print(f"시간대별 취소표: {manager.get_reopen_hours()}")
+        print(f"\n통계: {manager.get_stats()}")
+
+        # 다시 열어도 같은 상태인지 확인
+        manager.close()
+        reopened = SqliteStateManager(Path(temp_dir) / 'state.db', flush_delay=0, json_file=None)
+        print(f"다시 연 상태: {reopened.load()}")
+        reopened.close()